@@ -0,0 +1,62 @@
+"""
+NerModel.compute_metrics (all tag subsets, token & chunk level) on large arrays of tag ids
+"""
+from os.path import join
+
+import numpy as np
+
+from synthetic import TAG_LIST, get_sentences, get_model_predict, measure
+
+
+def run(
+    model_directory, log_directory, num_sentences=(500, 5000), length=126, repeat=3
+):
+    """
+    :param model_directory: [str] see create_tiny_bert()
+    :param log_directory:   [str]
+    :param num_sentences:   [tuple] of [int] number of (padded) sentences, i.e. array sizes
+    :param length:          [int] number of words per sentence
+    :param repeat:          [int] number of measurements
+    :return: results: [dict] w/ keys = 'tokens=*' & values = [dict] w/ keys 'median_sec', .., 'tokens_per_sec'
+    """
+    from nerblackbox.modules.ner_training.logging.default_logger import DefaultLogger
+    from nerblackbox.modules.ner_training.metrics.logged_metrics import LoggedMetrics
+
+    model = get_model_predict(model_directory, max_seq_length=length + 2)
+    model.logged_metrics = LoggedMetrics()
+    model.default_logger = DefaultLogger(
+        __file__, log_file=join(log_directory, "benchmark.log"), level="warning"
+    )  # not created for inference
+
+    rng = np.random.RandomState(42)
+    results = dict()
+    for _num_sentences in num_sentences:
+        tag_ids = _get_tag_ids(_num_sentences, length)
+        pred_ids = np.where(
+            rng.rand(*tag_ids.shape) < 0.1,
+            rng.randint(3, len(TAG_LIST), size=tag_ids.shape),
+            tag_ids,
+        )  # 10% errors
+        np_dict = {"loss": 0.1, "tag_ids": tag_ids, "pred_ids": pred_ids}
+
+        timings = measure(lambda: model.compute_metrics("val", np_dict), repeat)
+        timings["tokens_per_sec"] = tag_ids.size / timings["median_sec"]
+        results[f"tokens={tag_ids.size}"] = timings
+    return results
+
+
+def _get_tag_ids(num_sentences, length):
+    """
+    :param num_sentences: [int]
+    :param length:        [int] maximum number of words per sentence
+    :return: tag_ids: [np array] of shape [num_sentences, length + 2] w/ [CLS], [SEP] & [PAD] like in training
+    """
+    tag2id = {tag: i for i, tag in enumerate(TAG_LIST)}
+    tag_ids = np.zeros((num_sentences, length + 2), dtype=np.int64)
+    rng = np.random.RandomState(0)
+    for i, (_, tags) in enumerate(get_sentences(num_sentences, length)):
+        tags = tags[: rng.randint(length // 4, length + 1)]
+        tag_ids[i, : len(tags) + 2] = (
+            [tag2id["[CLS]"]] + [tag2id[tag] for tag in tags] + [tag2id["[SEP]"]]
+        )
+    return tag_ids
@@ -0,0 +1,34 @@
+"""
+latency & throughput of NerModelPredict.predict for different numbers of examples (batch sizes) & sentence lengths
+"""
+from synthetic import get_sentences, get_model_predict, measure
+
+
+def run(
+    model_directory,
+    batch_sizes=(1, 8, 32),
+    lengths=(8, 32, 96),
+    max_seq_length=128,
+    repeat=3,
+):
+    """
+    :param model_directory: [str] see create_tiny_bert()
+    :param batch_sizes:     [tuple] of [int] number of examples per predict() call
+    :param lengths:         [tuple] of [int] number of words per example
+    :param max_seq_length:  [int] fixed for all cases, needs to be > max(lengths) + 1
+    :param repeat:          [int] number of measurements
+    :return: results: [dict] w/ keys = 'batch_size=*, length=*' & values = [dict] w/ keys 'median_sec', ..
+    """
+    model = get_model_predict(model_directory, max_seq_length=max_seq_length)
+
+    results = dict()
+    for length in lengths:
+        for batch_size in batch_sizes:
+            examples = [
+                " ".join(words) for words, _ in get_sentences(batch_size, length)
+            ]
+            model.predict(examples[:1])  # warm up
+            timings = measure(lambda: model.predict(examples), repeat)
+            timings["examples_per_sec"] = batch_size / timings["median_sec"]
+            results[f"batch_size={batch_size}, length={length}"] = timings
+    return results
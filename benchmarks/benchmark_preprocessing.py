@@ -0,0 +1,42 @@
+"""
+throughput of InputExampleToTensors (input example -> feature tensors) for different sentence lengths
+"""
+from synthetic import TAG_LIST, get_sentences, measure
+
+
+def run(model_directory, num_examples=2000, lengths=(8, 32, 96), repeat=3):
+    """
+    :param model_directory: [str] see create_tiny_bert()
+    :param num_examples:    [int] number of input examples per measurement
+    :param lengths:         [tuple] of [int] number of words per example
+    :param repeat:          [int] number of measurements
+    :return: results: [dict] w/ keys = 'length=*' & values = [dict] w/ keys 'median_sec', .., 'examples_per_sec'
+    """
+    from nerblackbox.modules.ner_training.pretrained_cache import PretrainedCache
+    from nerblackbox.modules.ner_training.data_preprocessing.tools.input_example import (
+        InputExample,
+    )
+    from nerblackbox.modules.ner_training.data_preprocessing.tools.input_example_to_tensors import (
+        InputExampleToTensors,
+    )
+
+    tokenizer = PretrainedCache.get_tokenizer(model_directory)
+
+    results = dict()
+    for length in lengths:
+        input_example_to_tensors = InputExampleToTensors(
+            tokenizer, max_seq_length=length + 2, tag_tuple=tuple(TAG_LIST)
+        )
+        input_examples = [
+            InputExample(guid="", text_a=" ".join(words), tags_a=" ".join(tags))
+            for words, tags in get_sentences(num_examples, length)
+        ]
+
+        def transform_all():
+            for input_example in input_examples:
+                input_example_to_tensors(input_example)
+
+        timings = measure(transform_all, repeat)
+        timings["examples_per_sec"] = num_examples / timings["median_sec"]
+        results[f"length={length}"] = timings
+    return results
@@ -0,0 +1,71 @@
+"""
+NerBlackBoxMain._parse_and_create_dataframe (single & average run tables) on many fake run records
+"""
+import random
+
+from synthetic import measure
+
+
+def run(num_runs=(100, 2000), runs_per_name=5, repeat=3):
+    """
+    :param num_runs:      [tuple] of [int] number of fake runs of one experiment
+    :param runs_per_name: [int] number of runs w/ the same run name (e.g. runA-1, runA-2, ..)
+    :param repeat:        [int] number of measurements
+    :return: results: [dict] w/ keys = 'runs=*' & values = [dict] w/ keys 'median_sec', 'min_sec'
+    """
+    from nerblackbox.modules.main import NerBlackBoxMain
+
+    results = dict()
+    for _num_runs in num_runs:
+        records = get_records(_num_runs, runs_per_name)
+        results[f"runs={_num_runs}"] = measure(
+            lambda: NerBlackBoxMain._parse_and_create_dataframe(records), repeat
+        )
+    return results
+
+
+def get_records(num_runs, runs_per_name, seed=42):
+    """
+    :param num_runs:      [int]
+    :param runs_per_name: [int]
+    :param seed:          [int]
+    :return: records: [list] of [dict] like ResultsIndex.run_to_record(), incl. one experiment record w/o metrics
+    """
+    rng = random.Random(seed)
+    records = [
+        {
+            "run_id": "experiment",
+            "run_name_nr": "exp",
+            "start_time": 0,
+            "params": {"max_epochs": "20", "batch_size": "16"},
+            "metrics": dict(),
+        }
+    ]
+    for i in range(num_runs):
+        metrics = {
+            "epoch_best": rng.randint(0, 9),
+            "epoch_stopped": rng.randint(9, 19),
+        }
+        metrics.update(
+            {
+                f"epoch_{epoch}_{phase}_{level}_f1_micro": rng.random()
+                for epoch in ["best", "stopped"]
+                for phase in ["val", "test"]
+                for level in ["all", "fil", "chk"]
+            }
+        )
+        metrics.update({f"val_metric_{j}": rng.random() for j in range(50)})
+        records.append(
+            {
+                "run_id": f"run{i}",
+                "run_name_nr": f"run{i // runs_per_name}-{i % runs_per_name + 1}",
+                "start_time": i,
+                "params": {
+                    "lr_max": str(rng.choice([1e-5, 2e-5, 5e-5])),
+                    "batch_size": str(rng.choice([16, 32])),
+                    "max_epochs": "20",
+                },
+                "metrics": metrics,
+            }
+        )
+    return records
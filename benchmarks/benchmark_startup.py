@@ -0,0 +1,69 @@
+"""
+measure startup time of a fresh interpreter for cli/api entry points, e.g.
+python benchmark_startup.py --repeat 5 --max_seconds 1.5
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+STATEMENTS = {
+    "cli": "import nerblackbox.cli",
+    "cli --help": "from nerblackbox.cli import nerbb; nerbb(['--help'])",
+    "api": "from nerblackbox import NerBlackBox",
+    "main": "from nerblackbox.modules.main import NerBlackBoxMain",
+}
+
+
+def run(repeat=5):
+    """
+    :param repeat: [int] number of interpreter starts per entry point
+    :return: results: [dict] w/ keys = entry point [str] & values = [dict] w/ keys 'median_sec', 'min_sec'
+    """
+    results = dict()
+    for name, statement in STATEMENTS.items():
+        timings = list()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run(
+                [sys.executable, "-c", statement],
+                check=False,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            timings.append(time.perf_counter() - start)
+        results[name] = {
+            "median_sec": statistics.median(timings),
+            "min_sec": min(timings),
+        }
+    return results
+
+
+def main(args):
+    failed = False
+    for name, timings in run(args.repeat).items():
+        status = "ok"
+        if args.max_seconds is not None and timings["median_sec"] > args.max_seconds:
+            status = "REGRESSION"
+            failed = True
+        print(
+            f"{name:<12} median = {timings['median_sec']:.3f}s  min = {timings['min_sec']:.3f}s  [{status}]"
+        )
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--max_seconds",
+        type=float,
+        default=None,
+        help="fail if the median startup time of an entry point exceeds this value",
+    )
+    _args = parser.parse_args()
+
+    main(_args)
@@ -0,0 +1,171 @@
+"""
+run the benchmark suite offline (tiny randomly initialized BERT, synthetic data) & write the results to json, e.g.
+python run_benchmarks.py --output results.json
+python run_benchmarks.py --output results_new.json --baseline results.json --tolerance 0.25
+python run_benchmarks.py --benchmarks metrics results --quick
+"""
+import sys
+import json
+import argparse
+import platform
+import tempfile
+import subprocess
+from os.path import join, dirname, abspath
+from datetime import datetime
+
+from synthetic import set_up_environment, create_tiny_bert
+
+BENCHMARKS = ["predict", "preprocessing", "metrics", "results", "startup"]
+
+
+def main(args):
+    with tempfile.TemporaryDirectory() as directory:
+        set_up_environment(directory)
+        model_directory = (
+            create_tiny_bert(join(directory, "tiny-bert"))
+            if set(args.benchmarks) & {"predict", "preprocessing", "metrics"}
+            else None
+        )
+        results = {
+            "info": get_info(),
+            "benchmarks": run_benchmarks(
+                args.benchmarks, model_directory, directory, args.repeat, args.quick
+            ),
+        }
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"> results written to {args.output}")
+
+    if args.baseline is not None:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = compare(
+            results["benchmarks"], baseline["benchmarks"], args.tolerance
+        )
+        if len(regressions):
+            sys.exit(1)
+
+
+def run_benchmarks(benchmarks, model_directory, directory, repeat, quick):
+    """
+    :param benchmarks:      [list] of [str], e.g. ['predict', 'metrics']
+    :param model_directory: [str] tiny BERT, see create_tiny_bert()
+    :param directory:       [str] temporary directory
+    :param repeat:          [int] number of measurements per case
+    :param quick:           [bool] if True, use small sizes only (smoke test)
+    :return: results: [dict] w/ keys = benchmark [str] & values = [dict] w/ keys = case [str] & values = [dict]
+    """
+    results = dict()
+    for benchmark in benchmarks:
+        print(f"> benchmark: {benchmark}")
+        if benchmark == "predict":
+            import benchmark_predict
+
+            kwargs = {"batch_sizes": (1, 8), "lengths": (8, 32)} if quick else {}
+            results[benchmark] = benchmark_predict.run(
+                model_directory, repeat=repeat, **kwargs
+            )
+        elif benchmark == "preprocessing":
+            import benchmark_preprocessing
+
+            kwargs = {"num_examples": 200, "lengths": (8, 32)} if quick else {}
+            results[benchmark] = benchmark_preprocessing.run(
+                model_directory, repeat=repeat, **kwargs
+            )
+        elif benchmark == "metrics":
+            import benchmark_metrics
+
+            kwargs = {"num_sentences": (200,)} if quick else {}
+            results[benchmark] = benchmark_metrics.run(
+                model_directory, directory, repeat=repeat, **kwargs
+            )
+        elif benchmark == "results":
+            import benchmark_results
+
+            kwargs = {"num_runs": (100,)} if quick else {}
+            results[benchmark] = benchmark_results.run(repeat=repeat, **kwargs)
+        elif benchmark == "startup":
+            import benchmark_startup
+
+            results[benchmark] = benchmark_startup.run(repeat=repeat)
+        else:
+            raise Exception(f"benchmark = {benchmark} unknown, use one of {BENCHMARKS}")
+
+        for case, timings in results[benchmark].items():
+            print(f"  {case:<28} median = {timings['median_sec']:.4f}s")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    :param results:   [dict] see run_benchmarks()
+    :param baseline:  [dict] see run_benchmarks()
+    :param tolerance: [float] e.g. 0.25, relative increase of the median time that counts as regression
+    :return: regressions: [list] of [str], e.g. ['metrics / tokens=640000']
+    """
+    regressions = list()
+    for benchmark, cases in results.items():
+        for case, timings in cases.items():
+            if case not in baseline.get(benchmark, dict()):
+                continue
+            ratio = timings["median_sec"] / baseline[benchmark][case]["median_sec"]
+            status = "ok"
+            if ratio > 1 + tolerance:
+                status = "REGRESSION"
+                regressions.append(f"{benchmark} / {case}")
+            print(f"{benchmark} / {case:<28} {ratio:.2f}x baseline  [{status}]")
+    return regressions
+
+
+def get_info():
+    """
+    :return: info: [dict] w/ time, git commit & versions, to identify the results
+    """
+    import torch
+    import transformers
+
+    try:
+        commit = (
+            subprocess.check_output(
+                ["git", "rev-parse", "HEAD"],
+                cwd=dirname(abspath(__file__)),
+                stderr=subprocess.DEVNULL,
+            )
+            .decode()
+            .strip()
+        )
+    except (subprocess.CalledProcessError, OSError):
+        commit = None
+
+    return {
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "torch": torch.__version__,
+        "transformers": transformers.__version__,
+        "num_threads": torch.get_num_threads(),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--benchmarks", nargs="+", choices=BENCHMARKS, default=BENCHMARKS
+    )
+    parser.add_argument("--output", type=str, default="benchmark_results.json")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--quick", action="store_true", help="small sizes only (smoke test)"
+    )
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        default=None,
+        help="json file w/ previous results, fail if a case is slower by more than --tolerance",
+    )
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    _args = parser.parse_args()
+
+    main(_args)
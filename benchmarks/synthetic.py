@@ -0,0 +1,127 @@
+"""
+offline fixtures for the benchmarks: environment, tiny randomly initialized BERT & synthetic CoNLL-style data
+"""
+import os
+import time
+import random
+import statistics
+from os.path import join
+from argparse import Namespace
+
+TAGS = ["PER", "ORG", "LOC", "MISC"]
+TAG_LIST = ["[PAD]", "[CLS]", "[SEP]", "O"] + [
+    f"{prefix}-{tag}" for tag in TAGS for prefix in ["B", "I"]
+]
+SPECIAL_TOKENS = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+
+
+def set_up_environment(directory):
+    """
+    point nerblackbox to an empty directory (needs to be called before nerblackbox modules are imported)
+    ---------------------------------------------------------------------------------------------------------
+    :param directory: [str] e.g. temporary directory
+    :return: -
+    """
+    os.environ["BASE_DIR"] = directory
+    os.environ["DATA_DIR"] = join(directory, "data")
+    os.makedirs(join(directory, "data", "results"), exist_ok=True)
+
+
+def get_vocabulary(size=2000):
+    """
+    :param size: [int] number of (synthetic) words
+    :return: words: [list] of [str], e.g. ['w0', 'w1', ..]
+    """
+    return [f"w{i}" for i in range(size)]
+
+
+def create_tiny_bert(directory, num_layers=2, hidden_size=64):
+    """
+    save a tiny randomly initialized BERT (model & tokenizer w/ synthetic vocabulary) to directory
+    -----------------------------------------------------------------------------------------------
+    :param directory:   [str] needs to contain 'bert' (name based model type resolution of older transformers)
+    :param num_layers:  [int]
+    :param hidden_size: [int]
+    :return: directory: [str]
+    """
+    from transformers import BertConfig, BertForTokenClassification, BertTokenizer
+
+    os.makedirs(directory, exist_ok=True)
+    vocab_file = join(directory, "vocab.txt")
+    with open(vocab_file, "w") as f:
+        f.write("\n".join(SPECIAL_TOKENS + get_vocabulary()) + "\n")
+
+    config = BertConfig(
+        vocab_size=len(SPECIAL_TOKENS) + len(get_vocabulary()),
+        hidden_size=hidden_size,
+        num_hidden_layers=num_layers,
+        num_attention_heads=2,
+        intermediate_size=2 * hidden_size,
+        num_labels=len(TAG_LIST),
+    )
+    BertForTokenClassification(config).save_pretrained(directory)
+    BertTokenizer(vocab_file, do_lower_case=False).save_pretrained(directory)
+    return directory
+
+
+def get_sentences(num_sentences, length, seed=42):
+    """
+    synthetic CoNLL-style sentences w/ BIO tags
+    --------------------------------------------
+    :param num_sentences: [int]
+    :param length:        [int] number of words per sentence
+    :param seed:          [int]
+    :return: sentences:   [list] of [tuple] (words, tags) w/ words & tags = [list] of [str]
+    """
+    rng = random.Random(seed)
+    vocabulary = get_vocabulary()
+    sentences = list()
+    for _ in range(num_sentences):
+        words = [rng.choice(vocabulary) for _ in range(length)]
+        tags = list()
+        while len(tags) < length:
+            if rng.random() < 0.2:
+                tag = rng.choice(TAGS)
+                chunk_length = min(rng.randint(1, 3), length - len(tags))
+                tags += [f"B-{tag}"] + [f"I-{tag}"] * (chunk_length - 1)
+            else:
+                tags.append("O")
+        sentences.append((words, tags))
+    return sentences
+
+
+def get_model_predict(model_directory, max_seq_length):
+    """
+    :param model_directory: [str] see create_tiny_bert()
+    :param max_seq_length:  [int]
+    :return: model: [NerModelPredict] in inference mode
+    """
+    import json
+    from nerblackbox.modules.ner_training.ner_model_predict import NerModelPredict
+
+    hparams = Namespace(
+        pretrained_model_name=model_directory,
+        uncased=False,
+        dataset_tags="bio",
+        max_seq_length=max_seq_length,
+        tag_list=json.dumps(TAG_LIST),
+    )
+    model = NerModelPredict(hparams)
+    model.freeze()
+    return model
+
+
+def measure(function, repeat, number=1):
+    """
+    :param function: [callable] w/o arguments
+    :param repeat:   [int] number of measurements
+    :param number:   [int] number of calls per measurement
+    :return: timings: [dict] w/ keys 'median_sec', 'min_sec' (per call)
+    """
+    timings = list()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - start) / number)
+    return {"median_sec": statistics.median(timings), "min_sec": min(timings)}
@@ -1,6 +1,31 @@
 r"""This is the nerblackbox package docstring."""
+import sys
 from nerblackbox import __about__
-from nerblackbox.api import NerBlackBox
-from nerblackbox.modules.experiment_results import ExperimentResults
-from nerblackbox.modules.experiments_results import ExperimentsResults
-from nerblackbox.modules.ner_training.ner_model_predict import NerModelPredict
+
+# main python classes are imported on first access (PEP 562),
+# such that e.g. the CLI does not import torch & co. unless needed
+_lazy_imports = {
+    "NerBlackBox": "nerblackbox.api",
+    "ExperimentResults": "nerblackbox.modules.experiment_results",
+    "ExperimentsResults": "nerblackbox.modules.experiments_results",
+    "NerModelPredict": "nerblackbox.modules.ner_training.ner_model_predict",
+    "PredictStats": "nerblackbox.modules.ner_training.predict_stats",
+}
+
+__all__ = list(_lazy_imports.keys())
+
+
+def __getattr__(name):
+    if name in _lazy_imports:
+        import importlib
+
+        return getattr(importlib.import_module(_lazy_imports[name]), name)
+    raise AttributeError(f"module {__name__} has no attribute {name}")
+
+
+if sys.version_info < (3, 7):  # no module __getattr__ (PEP 562)
+    from nerblackbox.api import NerBlackBox
+    from nerblackbox.modules.experiment_results import ExperimentResults
+    from nerblackbox.modules.experiments_results import ExperimentsResults
+    from nerblackbox.modules.ner_training.ner_model_predict import NerModelPredict
+    from nerblackbox.modules.ner_training.predict_stats import PredictStats
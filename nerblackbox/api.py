@@ -44,7 +44,7 @@ class NerBlackBox:
 
         Args:
             dataset_name: e.g. "swedish_ner_corpus".
-            kwargs_optional: with optional key-value pairs {"verbose": [bool]}.
+            kwargs_optional: with optional key-value pairs {"verbose": [bool], "in_process": [bool]}.
         """
 
         kwargs = self._process_kwargs_optional(kwargs_optional)
@@ -53,6 +53,17 @@ class NerBlackBox:
         nerbb = NerBlackBoxMain("analyze_data", **kwargs)
         nerbb.main()
 
+    @staticmethod
+    def clear_cache():
+        """free the tokenizers & pretrained models that are kept in memory by run_experiment(in_process=True)
+        to be reused by subsequent runs & experiments in the same process.
+        """
+        from nerblackbox.modules.ner_training.pretrained_cache import (
+            PretrainedCache,
+        )  # import on use -> fast startup
+
+        PretrainedCache.clear()
+
     def download(self):
         """download & prepare built-in datasets, prepare experiment configuration.
         needs to be called exactly once before any other CLI/API commands of the package are executed
@@ -97,7 +108,8 @@ class NerBlackBox:
 
         Args:
             kwargs_optional: with optional key-value pairs \
-            {"ids": [tuple of int], "as_df": [bool]}
+            {"ids": [tuple of int], "as_df": [bool], "refresh": [bool], "num_threads": [int]} \
+            with num_threads = number of experiments that are processed concurrently (default: 1)
 
         Returns:
             experiments_results: w/ keys = "best_single_runs", "best_average_runs" \
@@ -139,7 +151,8 @@ class NerBlackBox:
         Args:
             experiment_name: e.g. "exp0"
             kwargs_optional: with optional key-value pairs \
-            {"run_name": [str], "device": [torch device], "fp16": [bool]}
+            {"run_name": [str], "device": [torch device], "fp16": [bool], "resume": [bool], \
+            "in_process": [bool]}
         """
 
         kwargs = self._process_kwargs_optional(kwargs_optional)
@@ -154,7 +167,9 @@ class NerBlackBox:
         Args:
             dataset_name: e.g. "swedish_ner_corpus"
             kwargs_optional: with optional key-value pairs \
-            {"modify": [bool], "val_fraction": [float], "verbose": [bool]}
+            {"modify": [bool], "val_fraction": [float], "num_workers": [int], "verbose": [bool], \
+            "in_process": [bool]} \
+            with num_workers = number of worker processes the original files are sharded across (default: 1)
         """
 
         kwargs = self._process_kwargs_optional(kwargs_optional)
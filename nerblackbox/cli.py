@@ -5,7 +5,6 @@ import subprocess
 from os.path import join
 import click
 from typing import Dict, Any
-from nerblackbox.modules.main import NerBlackBoxMain
 
 
 ########################################################################################################################
@@ -21,13 +20,42 @@ from nerblackbox.modules.main import NerBlackBoxMain
 @click.option(
     "--val_fraction", default=None, type=float, help="[float] if flag=set_up_dataset"
 )
+@click.option(
+    "--num_workers",
+    default=None,
+    type=int,
+    help="[int] if flag=set_up_dataset, number of worker processes (default: 1)",
+)
+@click.option(
+    "--num_threads",
+    default=None,
+    type=int,
+    help="[int] if flag=get_experiments_results, number of worker threads (default: 1)",
+)
 @click.option(
     "--verbose/--no-verbose", default=False, help="[bool] if flag=set_up_dataset"
 )
 @click.option("--run_name", default=None, type=str, help="[str] if flag=run_experiment")
 @click.option("--device", default=None, type=str, help="[str] if flag=run_experiment")
-@click.option("--fp16/--no-fp16", default=False, help="[bool] if flag=run_experiment")
+@click.option(
+    "--fp16/--no-fp16",
+    default=False,
+    help="[bool] if flag=run_experiment, mixed precision (gpu: float16, cpu: bfloat16)",
+)
+@click.option(
+    "--resume/--no-resume", default=False, help="[bool] if flag=run_experiment"
+)
 @click.option("--results/--no-results", default=False, help="[bool] if flag=clear_data")
+@click.option(
+    "--refresh/--no-refresh",
+    default=False,
+    help="[bool] if flag=get_experiment_results, get_experiments_results",
+)
+@click.option(
+    "--in_process/--no-in_process",
+    default=False,
+    help="[bool] if flag=analyze_data, set_up_dataset, run_experiment",
+)
 @click.pass_context
 def nerbb(ctx, **kwargs_optional):
     ctx.ensure_object(dict)
@@ -55,6 +83,10 @@ def _run_nerblackbox_main(_ctx_obj: Dict[str, Any], _kwargs: Dict[str, str]) ->
     given context (_ctx_obj) and all relevant arguments (_kwargs), invoke NerBlackBoxMain
     is used by every nerbb command
     """
+    from nerblackbox.modules.main import (
+        NerBlackBoxMain,
+    )  # import on use -> fast startup
+
     kwargs = dict(**_ctx_obj, **_kwargs)
 
     nerblackbox_main = NerBlackBoxMain(**kwargs)
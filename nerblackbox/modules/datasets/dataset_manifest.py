@@ -0,0 +1,92 @@
+import os
+import json
+from os.path import join, isfile
+
+
+class DatasetManifest:
+    """
+    json file in the dataset directory that keeps track of
+    - fetched files & their checksums
+    - cached dataset statistics
+    """
+
+    file_name = "manifest.json"
+
+    def __init__(self, dataset_path):
+        """
+        :param dataset_path: [str] path to dataset directory
+        """
+        self.dataset_path = dataset_path
+        self.path = join(dataset_path, self.file_name)
+        self.content = self._load()
+
+    ####################################################################################################################
+    # FILES
+    ####################################################################################################################
+    def get_file(self, file_name):
+        """
+        :param file_name: [str] e.g. 'eng.train'
+        :return: file_entry: [dict] w/ keys = 'sha256', 'size', 'source' or None if file is unknown
+        """
+        return self.content["files"].get(file_name)
+
+    def set_file(self, file_name, sha256, size, source):
+        """
+        :param file_name: [str] e.g. 'eng.train'
+        :param sha256:    [str] hex digest of file content
+        :param size:      [int] file size in bytes
+        :param source:    [str] url or path the file was fetched from
+        :return: -
+        """
+        self.content["files"][file_name] = {
+            "sha256": sha256,
+            "size": size,
+            "source": source,
+        }
+        self._save()
+
+    ####################################################################################################################
+    # STATS
+    ####################################################################################################################
+    def get_stats(self, fingerprint):
+        """
+        :param fingerprint: [dict] that identifies the state of the files the stats were computed from
+        :return: stats: [dict] cached stats or None if no stats for fingerprint are cached
+        """
+        cached = self.content["stats"]
+        if cached is not None and cached["fingerprint"] == fingerprint:
+            return cached["stats"]
+        else:
+            return None
+
+    def set_stats(self, fingerprint, stats):
+        """
+        :param fingerprint: [dict] that identifies the state of the files the stats were computed from
+        :param stats:       [dict] stats to cache
+        :return: -
+        """
+        self.content["stats"] = {"fingerprint": fingerprint, "stats": stats}
+        self._save()
+
+    ####################################################################################################################
+    # HELPER
+    ####################################################################################################################
+    def _load(self):
+        """
+        :return: content: [dict] w/ keys = 'files', 'stats'
+        """
+        content = {"files": dict(), "stats": None}
+        if isfile(self.path):
+            try:
+                with open(self.path, "r") as f:
+                    content.update(json.load(f))
+            except json.JSONDecodeError:
+                print(f"ATTENTION! could not read {self.path} -> ignore")
+        return content
+
+    def _save(self):
+        os.makedirs(self.dataset_path, exist_ok=True)
+        path_tmp = f"{self.path}.tmp"
+        with open(path_tmp, "w") as f:
+            json.dump(self.content, f, indent=2)
+        os.replace(path_tmp, self.path)
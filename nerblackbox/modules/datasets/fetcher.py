@@ -0,0 +1,162 @@
+import os
+import shutil
+import hashlib
+import requests
+from os.path import join, isfile
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+from nerblackbox.modules.datasets.dataset_manifest import DatasetManifest
+
+
+class Fetcher:
+    """
+    fetches original files of a dataset
+    - from a local mirror if environment variable NERBLACKBOX_DATASET_MIRROR is set
+      (directory or file:// url, containing <ner_dataset>/<file_name>), or
+    - from the original url, streamed to disk in chunks (interrupted downloads are resumed)
+
+    fetched files are verified using sha256 checksums that are kept in the dataset manifest.
+    if no checksum is known, the checksum of the first fetch is recorded and used from then on.
+    """
+
+    env_variable_mirror = "NERBLACKBOX_DATASET_MIRROR"
+    chunk_size = 1024 * 1024
+    timeout = 60
+
+    def __init__(self, ner_dataset, dataset_path, verbose=False):
+        """
+        :param ner_dataset:  [str] e.g. 'conll2003'
+        :param dataset_path: [str] path to dataset directory
+        :param verbose:      [bool]
+        """
+        self.ner_dataset = ner_dataset
+        self.dataset_path = dataset_path
+        self.verbose = verbose
+        self.mirror = os.environ.get(self.env_variable_mirror)
+        self.manifest = DatasetManifest(dataset_path)
+
+    def fetch(self, file_name, url, sha256=None):
+        """
+        :param file_name: [str] name of file in dataset directory, e.g. 'eng.train'
+        :param url:       [str] url to fetch file from if no mirror is used
+        :param sha256:    [str, optional] expected checksum, if None: use checksum from manifest (if available)
+        :return: file_path: [str] path to verified file in dataset directory
+        """
+        file_path = join(self.dataset_path, file_name)
+        file_entry = self.manifest.get_file(file_name)
+        if sha256 is None and file_entry is not None:
+            sha256 = file_entry["sha256"]
+
+        # skip if verified file exists
+        if isfile(file_path):
+            checksum = self._sha256(file_path)
+            if sha256 is None or checksum == sha256:
+                if file_entry is None:
+                    self.manifest.set_file(
+                        file_name, checksum, os.path.getsize(file_path), file_path
+                    )
+                if self.verbose:
+                    print(f".. file at {file_path} already exists & is verified")
+                return file_path
+            else:
+                print(
+                    f"ATTENTION! checksum of existing file {file_path} does not match -> fetch again"
+                )
+                os.remove(file_path)
+
+        # fetch
+        source = self._get_source(file_name, url)
+        file_path_part = f"{file_path}.part"
+        if source.startswith("http://") or source.startswith("https://"):
+            self._download(source, file_path_part)
+        else:
+            shutil.copyfile(self._to_path(source), file_path_part)
+
+        # verify
+        checksum = self._sha256(file_path_part)
+        if sha256 is not None and checksum != sha256:
+            os.remove(file_path_part)
+            raise Exception(
+                f"checksum of {file_name} fetched from {source} = {checksum} does not match expected {sha256}. "
+                f"if the source has changed on purpose, remove the file entry from {self.manifest.path}"
+            )
+        os.replace(file_path_part, file_path)
+        self.manifest.set_file(file_name, checksum, os.path.getsize(file_path), source)
+        if self.verbose:
+            print(f".. file fetched from {source} and saved at {file_path}")
+        return file_path
+
+    ####################################################################################################################
+    # HELPER
+    ####################################################################################################################
+    def _get_source(self, file_name, url):
+        """
+        :param file_name: [str] e.g. 'eng.train'
+        :param url:       [str] original url
+        :return: source:  [str] path in local mirror or original url
+        """
+        if self.mirror is None:
+            return url
+        else:
+            source = join(self._to_path(self.mirror), self.ner_dataset, file_name)
+            if not isfile(source):
+                raise Exception(
+                    f"file {source} not found in mirror {self.mirror} ({self.env_variable_mirror})"
+                )
+            return source
+
+    @staticmethod
+    def _to_path(location):
+        """
+        :param location: [str] path or file:// url, e.g. 'file:///mnt/mirror'
+        :return: path:   [str] e.g. '/mnt/mirror'
+        """
+        if location.startswith("file://"):
+            return url2pathname(urlparse(location).path)
+        else:
+            return location
+
+    def _download(self, url, file_path_part):
+        """
+        stream url to file_path_part in chunks, resume if file_path_part exists from an earlier attempt
+        -------------------------------------------------------------------------------------------------
+        :param url:            [str]
+        :param file_path_part: [str]
+        :return: -
+        """
+        offset = os.path.getsize(file_path_part) if isfile(file_path_part) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset > 0 else {}
+
+        with requests.get(
+            url,
+            headers=headers,
+            stream=True,
+            allow_redirects=True,
+            timeout=self.timeout,
+        ) as response:
+            if response.status_code == 416:  # range not satisfiable, i.e. complete
+                return
+            response.raise_for_status()
+
+            if response.status_code == 206:  # partial content, i.e. resume
+                mode = "ab"
+                if self.verbose:
+                    print(f".. resume download of {url} at byte {offset}")
+            else:
+                mode = "wb"
+
+            with open(file_path_part, mode) as f:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    f.write(chunk)
+
+    def _sha256(self, file_path):
+        """
+        :param file_path: [str]
+        :return: sha256:  [str] hex digest of file content
+        """
+        sha256 = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.chunk_size), b""):
+                sha256.update(chunk)
+        return sha256.hexdigest()
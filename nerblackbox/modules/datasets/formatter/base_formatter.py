@@ -1,6 +1,9 @@
 import os
+import csv
+import shutil
 import subprocess
 import json
+import multiprocessing
 import pandas as pd
 from abc import ABC, abstractmethod
 
@@ -9,6 +12,7 @@ from os.path import join
 from nerblackbox.modules.utils.util_functions import get_dataset_path
 from nerblackbox.modules.utils.env_variable import env_variable
 from nerblackbox.modules.datasets.plots import Plots
+from nerblackbox.modules.datasets.dataset_manifest import DatasetManifest
 from nerblackbox.modules.datasets.formatter.util_functions import get_ner_tag_mapping
 from nerblackbox.modules.ner_training.logging.default_logger import DefaultLogger
 
@@ -49,10 +53,11 @@ class BaseFormatter(ABC):
         pass
 
     @abstractmethod
-    def format_data(self):
+    def format_data(self, num_workers: int = 1):
         """
         III: format data
         ----------------
+        :param num_workers: [int] number of processes that the original files are sharded across
         :return: -
         """
         pass
@@ -110,18 +115,157 @@ class BaseFormatter(ABC):
         print(f"> dumped the following dict to {json_path}:")
         print(ner_tag_mapping)
 
+    ####################################################################################################################
+    # HELPER: READ ORIGINAL
+    ####################################################################################################################
+    @abstractmethod
+    def _get_original_file_path(self, phase):
+        """
+        III: format data
+        ----------------
+        :param phase: [str] 'train', 'val' or 'test'
+        :return: file_path_original: [str] path to original file
+        """
+        pass
+
+    @abstractmethod
+    def _format_original_row(self, row):
+        """
+        III: format data
+        ----------------
+        :param row: [list] of [str], i.e. split line of original file, e.g. ['Inger', 'B-PER', ..]
+        :return: _row: [list] of [str], e.g. ['Inger', 'PER'], or [] if row does not contain a word & tag
+        """
+        pass
+
+    def _read_original_file(self, phase, start=0, end=None):
+        """
+        III: format data
+        ----------------
+        :param phase: [str] 'train', 'val' or 'test'
+        :param start: [int] byte offset of first line to read
+        :param end:   [int or None] byte offset at which reading stops, None = end of file
+        :return: _rows: [generator] of [list] of [str], e.g. [], ['Inger', 'PER'], ['säger', '0'], ..
+        """
+        file_path_original = self._get_original_file_path(phase)
+        if os.path.isfile(file_path_original):
+            with open(file_path_original, "rb") as f:
+                f.seek(start)
+                while end is None or f.tell() < end:
+                    line = f.readline()
+                    if not line:
+                        break
+                    yield self._format_original_row(
+                        line.decode("utf-8").strip().split()
+                    )
+
+    @staticmethod
+    def _get_shards(file_path, num_shards):
+        """
+        III: format data
+        ----------------
+        :param file_path:  [str] path to original file
+        :param num_shards: [int] maximum number of shards
+        :return: shards:   [list] of [tuple] (start, end) with byte offsets that coincide with sentence boundaries
+        """
+        file_size = os.path.getsize(file_path)
+        offsets = [0]
+        with open(file_path, "rb") as f:
+            for i in range(1, num_shards):
+                f.seek(max(file_size * i // num_shards, offsets[-1]))
+                f.readline()  # skip (potentially) incomplete line
+                while True:
+                    line = f.readline()
+                    if not line or not line.strip():  # end of file or end of sentence
+                        break
+                offset = f.tell()
+                if offsets[-1] < offset < file_size:
+                    offsets.append(offset)
+        offsets.append(file_size)
+        return list(zip(offsets[:-1], offsets[1:]))
+
     ####################################################################################################################
     # HELPER: WRITE FORMATTED
     ####################################################################################################################
-    def _write_formatted_csv(self, phase, rows):
+    def _format_original_file(self, phase, num_workers=1):
         """
         III: format data
-        ----------------------------------------------
-        :param phase:         [str] 'train' or 'test'
-        :param rows:          [list] of [list] of [str], e.g. [['Inger', 'PER'], ['säger', '0'], ..]
+        ----------------
+        stream original file of phase through the ner tag mapping to formatted csv,
+        optionally sharded across num_workers processes
+        -------------------------------------------------------------------------
+        :param phase:       [str] 'train', 'val' or 'test'
+        :param num_workers: [int] number of processes that the original file is sharded across
         :return: -
         """
         file_path = join(self.dataset_path, f"{phase}_formatted.csv")
+        file_path_original = self._get_original_file_path(phase)
+
+        if num_workers > 1 and os.path.isfile(file_path_original):
+            shards = self._get_shards(file_path_original, num_workers)
+        else:
+            shards = [(0, None)]
+
+        if len(shards) == 1:
+            num_rows, num_sentences = self._write_formatted_csv(
+                phase, self._read_original_file(phase)
+            )
+        else:
+            file_paths_shards = [f"{file_path}.{i}" for i in range(len(shards))]
+            with multiprocessing.Pool(len(shards)) as pool:
+                counts = pool.starmap(
+                    self._format_original_file_shard,
+                    [
+                        (phase, start, end, file_path_shard)
+                        for (start, end), file_path_shard in zip(
+                            shards, file_paths_shards
+                        )
+                    ],
+                )
+
+            # concatenate shards in order
+            with open(file_path, "wb") as f:
+                for file_path_shard in file_paths_shards:
+                    with open(file_path_shard, "rb") as f_shard:
+                        shutil.copyfileobj(f_shard, f)
+                    os.remove(file_path_shard)
+
+            num_rows = sum([count[0] for count in counts])
+            num_sentences = sum([count[1] for count in counts])
+
+        if os.path.isfile(file_path_original):
+            print(f"\n> read {file_path_original} in {len(shards)} shard(s)")
+        print(
+            f"> phase = {phase}: wrote {num_rows} words in {num_sentences} sentences to {file_path}"
+        )
+
+    def _format_original_file_shard(self, phase, start, end, file_path):
+        """
+        III: format data
+        ----------------
+        :param phase:     [str] 'train', 'val' or 'test'
+        :param start:     [int] byte offset of shard start in original file
+        :param end:       [int] byte offset of shard end in original file
+        :param file_path: [str] path to formatted csv of shard
+        :return: num_rows:      [int]
+        :return: num_sentences: [int]
+        """
+        return self._write_formatted_csv(
+            phase, self._read_original_file(phase, start, end), file_path=file_path
+        )
+
+    def _write_formatted_csv(self, phase, rows, file_path=None):
+        """
+        III: format data
+        ----------------------------------------------
+        :param phase:         [str] 'train' or 'test'
+        :param rows:          [iterable] of [list] of [str], e.g. [['Inger', 'PER'], ['säger', '0'], ..]
+        :param file_path:     [str, optional] path to formatted csv, default: <dataset_path>/<phase>_formatted.csv
+        :return: num_rows:      [int]
+        :return: num_sentences: [int]
+        """
+        if file_path is None:
+            file_path = join(self.dataset_path, f"{phase}_formatted.csv")
 
         # ner tag mapping
         ner_tag_mapping = get_ner_tag_mapping(
@@ -129,30 +273,36 @@ class BaseFormatter(ABC):
         )
 
         # processing
-        data = list()
+        num_rows = 0
+        num_sentences = 0
         tags = list()
         sentence = list()
-        for row in rows:
-            if len(row) == 2:
-                sentence.append(row[0])
-                tags.append(
-                    ner_tag_mapping(row[1]) if row[1] != "0" else "O"
-                )  # replace zeros by capital O (!)
-            else:
-                if len(row) != 0:
-                    print(
-                        f"ATTENTION!! row with length = {len(row)} found (should be 0 or 2): {row}"
-                    )
-                if len(tags) and len(sentence):
-                    data.append([" ".join(tags), " ".join(sentence)])
-                    tags = list()
-                    sentence = list()
-
-        df = pd.DataFrame(data)
-        df.to_csv(file_path, sep="\t", header=None, index=None)
-        print(
-            f"> phase = {phase}: wrote {len(rows)} words in {len(df)} sentences to {file_path}"
-        )
+        with open(file_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f, delimiter="\t", lineterminator="\n")
+            for row in rows:
+                num_rows += 1
+                if len(row) == 2:
+                    sentence.append(row[0])
+                    tags.append(
+                        ner_tag_mapping(row[1]) if row[1] != "0" else "O"
+                    )  # replace zeros by capital O (!)
+                else:
+                    if len(row) != 0:
+                        print(
+                            f"ATTENTION!! row with length = {len(row)} found (should be 0 or 2): {row}"
+                        )
+                    if len(tags) and len(sentence):
+                        writer.writerow([" ".join(tags), " ".join(sentence)])
+                        num_sentences += 1
+                        tags = list()
+                        sentence = list()
+
+            # last sentence (if original file does not end with an empty line)
+            if len(tags) and len(sentence):
+                writer.writerow([" ".join(tags), " ".join(sentence)])
+                num_sentences += 1
+
+        return num_rows, num_sentences
 
     ####################################################################################################################
     # HELPER: READ FORMATTED
@@ -210,6 +360,8 @@ class BaseFormatter(ABC):
         file_path = join(self.dataset_path, f"{phase}.csv")
         df.to_csv(file_path, sep="\t", index=False, header=None)
 
+    ####################################################################################################################
+    # HELPER: ANALYZE
     ####################################################################################################################
     def read_formatted_csv(self, phase):
         """
@@ -217,38 +369,143 @@ class BaseFormatter(ABC):
         ----------------------------------------------
         :param phase:         [str] 'train' or 'test'
         :return: num_sentences:    [int]
-                 stats_aggregated: [pandas Series] with indices = tags, values = number of occurrences
+                 stats_aggregated: [pandas DataFrame] with indices = tags, columns = 'tags', 'chunks'
         """
-        file_path = join(self.dataset_path, f"{phase}.csv")
+        stats_phase = self.get_stats()[phase]
+        return stats_phase["num_sentences"], self._stats_to_df(stats_phase)
 
-        columns = ["O"] + self.ner_tag_list
+    def get_stats(self):
+        """
+        V: analyze data
+        ----------------
+        get stats for all phases from dataset manifest, (re)compute them if final csv files have changed
+        ------------------------------------------------------------------------------------------------
+        :return: stats: [dict] w/ keys = 'train', 'val', 'test' & values = [dict] w/ keys =
+                        'num_sentences':    [int]
+                        'tokens':           [dict] w/ keys = tags & values = number of tokens
+                        'chunks':           [dict] w/ keys = tags & values = number of entity chunks
+                        'sentence_lengths': [dict] w/ keys = sentence length [str] & values = number of sentences
+        """
+        phases = ["train", "val", "test"]
+        fingerprint = {"tags": ["O"] + self.ner_tag_list}
+        for phase in phases:
+            file_path = join(self.dataset_path, f"{phase}.csv")
+            fingerprint[phase] = (
+                [os.path.getsize(file_path), os.path.getmtime(file_path)]
+                if os.path.isfile(file_path)
+                else None
+            )
 
-        try:
-            df = pd.read_csv(file_path, sep="\t")
-        except pd.io.common.EmptyDataError:
-            df = None
+        manifest = DatasetManifest(self.dataset_path)
+        stats = manifest.get_stats(fingerprint)
+        if stats is None:
+            stats = self._compute_stats(phases)
+            manifest.set_stats(fingerprint, stats)
+        return stats
 
-        stats = pd.DataFrame([], columns=columns)
+    def _compute_stats(self, phases):
+        """
+        V: analyze data
+        ----------------
+        single pass over the final csv files of all phases
+        --------------------------------------------------
+        :param phases: [list] of [str], e.g. ['train', 'val', 'test']
+        :return: stats: [dict], see get_stats()
+        """
+        columns = ["O"] + self.ner_tag_list
 
-        if df is not None:
-            tags = (
-                df.iloc[:, 0]
-                .apply(lambda x: x.split())
-                .apply(lambda x: [elem.split("-")[-1] for elem in x])
-            )
+        df_phases = list()
+        for phase in phases:
+            file_path = join(self.dataset_path, f"{phase}.csv")
+            try:
+                df_phase = pd.read_csv(file_path, sep="\t", header=None, usecols=[0])
+            except (FileNotFoundError, pd.errors.EmptyDataError):
+                continue
+            df_phases.append(pd.DataFrame({"phase": phase, "tags": df_phase[0]}))
+
+        if len(df_phases):
+            df = pd.concat(df_phases, ignore_index=True)
+        else:
+            df = pd.DataFrame({"phase": [], "tags": []})
+        df["sentence_length"] = df["tags"].str.split().str.len()
+
+        # one row per token
+        tokens = (
+            df["tags"]
+            .str.split()
+            .explode()
+            .dropna()
+            .to_frame("tag")
+            .rename_axis("sentence")
+            .reset_index()
+        )
+        tokens["phase"] = df["phase"].values[tokens["sentence"].values]
+        tokens["tag_plain"] = tokens["tag"].str.split("-").str[-1]
+
+        # chunk starts: B- prefix, or (plain) tag differs from previous tag in same sentence
+        first_in_sentence = tokens["sentence"] != tokens["sentence"].shift(1)
+        tokens["chunk_start"] = (tokens["tag_plain"] != "O") & (
+            tokens["tag"].str.startswith("B-")
+            | first_in_sentence
+            | (tokens["tag_plain"] != tokens["tag_plain"].shift(1))
+        )
 
-            for column in columns:
-                stats[column] = tags.apply(
-                    lambda x: len([elem for elem in x if elem == column])
-                )
+        token_counts = (
+            tokens.groupby(["phase", "tag_plain"]).size().unstack(fill_value=0)
+        )
+        chunk_counts = (
+            tokens[tokens["chunk_start"]]
+            .groupby(["phase", "tag_plain"])
+            .size()
+            .unstack(fill_value=0)
+        )
 
-            assert len(df) == len(stats)
+        stats = dict()
+        for phase in phases:
+            stats[phase] = {
+                "num_sentences": int((df["phase"] == phase).sum()),
+                "tokens": self._counts_to_dict(token_counts, phase, columns),
+                "chunks": self._counts_to_dict(chunk_counts, phase, columns),
+                "sentence_lengths": {
+                    str(length): int(count)
+                    for length, count in df.loc[df["phase"] == phase, "sentence_length"]
+                    .value_counts()
+                    .sort_index()
+                    .items()
+                },
+            }
+        return stats
 
-        num_sentences = len(stats)
-        stats_aggregated = stats.sum().to_frame().astype(int)
-        stats_aggregated.columns = ["tags"]
+    @staticmethod
+    def _counts_to_dict(counts, phase, columns):
+        """
+        V: analyze data
+        ----------------
+        :param counts:  [pandas DataFrame] w/ index = phases, columns = tags
+        :param phase:   [str] e.g. 'train'
+        :param columns: [list] of [str] tags to include, e.g. ['O', 'PER', ..]
+        :return: counts_phase: [dict] w/ keys = tags, values = counts
+        """
+        if phase in counts.index:
+            counts_phase = counts.loc[phase].reindex(columns, fill_value=0)
+        else:
+            counts_phase = pd.Series(0, index=columns)
+        return {tag: int(count) for tag, count in counts_phase.items()}
 
-        return num_sentences, stats_aggregated
+    @staticmethod
+    def _stats_to_df(stats_phase):
+        """
+        V: analyze data
+        ----------------
+        :param stats_phase: [dict], see get_stats()
+        :return: stats_aggregated: [pandas DataFrame] with indices = tags, columns = 'tags', 'chunks'
+        """
+        return pd.DataFrame(
+            {
+                "tags": pd.Series(stats_phase["tokens"], dtype=int),
+                "chunks": pd.Series(stats_phase["chunks"], dtype=int),
+            }
+        )
 
     @staticmethod
     def get_tokens(df):
@@ -266,37 +523,28 @@ class BaseFormatter(ABC):
             __file__, log_file=log_file, level="info", mode="w"
         )
 
-        self.num_tokens = {"total": 0}
-        self.num_sentences = {"total": 0}
-        self.stats_aggregated = {"total": None}
-
         phases = ["train", "val", "test"]
         phases_all = ["total"] + phases
 
-        for phase in phases:
-            (
-                self.num_sentences[phase],
-                _stats_aggregated_phase,
-            ) = self.read_formatted_csv(phase)
-            self.num_sentences["total"] += self.num_sentences[phase]
-            if self.stats_aggregated["total"] is None:
-                self.stats_aggregated["total"] = _stats_aggregated_phase
-            else:
-                self.stats_aggregated["total"] = (
-                    self.stats_aggregated["total"] + _stats_aggregated_phase
-                )
+        stats = self.get_stats()
 
-            self.stats_aggregated[phase] = self._stats_aggregated_add_columns(
-                _stats_aggregated_phase, self.num_sentences[phase]
+        self.num_sentences = {phase: stats[phase]["num_sentences"] for phase in phases}
+        self.num_sentences = {
+            "total": sum(self.num_sentences.values()),
+            **self.num_sentences,
+        }
+        stats_aggregated = {phase: self._stats_to_df(stats[phase]) for phase in phases}
+        stats_aggregated["total"] = sum([stats_aggregated[phase] for phase in phases])
+        self.stats_aggregated = {
+            phase: self._stats_aggregated_add_columns(
+                stats_aggregated[phase], self.num_sentences[phase]
             )
-
-        num_sentences_total = self.num_sentences["total"]
-        self.stats_aggregated["total"] = self._stats_aggregated_add_columns(
-            self.stats_aggregated["total"], self.num_sentences["total"]
-        )
+            for phase in phases_all
+        }
         self.num_tokens = {
             phase: self.get_tokens(self.stats_aggregated[phase]) for phase in phases_all
         }
+        num_sentences_total = self.num_sentences["total"]
         num_tokens_total = self.num_tokens["total"]
 
         # print/log
@@ -311,6 +559,9 @@ class BaseFormatter(ABC):
                 f"num_tokens = {self.num_tokens[phase]} "
                 f"({100*self.num_tokens[phase]/num_tokens_total:.2f}% of total = {num_tokens_total})"
             )
+            default_logger.log_info(
+                f"sentence_lengths = {stats[phase]['sentence_lengths']}"
+            )
             default_logger.log_info(self.stats_aggregated[phase])
 
         default_logger.log_info("")
@@ -328,26 +579,22 @@ class BaseFormatter(ABC):
         """
         V: analyze data
         ----------------
-        :param df: ..
-        :param number_of_sentences: ..
-        :return: ..
+        :param df:                  [pandas DataFrame] with indices = tags, columns = 'tags', 'chunks'
+        :param number_of_sentences: [int]
+        :return: df:                [pandas DataFrame] with additional (relative) columns, rounded to 2 decimals
         """
-        df["tags/sentence"] = df["tags"] / float(number_of_sentences)
-        df["tags/sentence"] = df["tags/sentence"].apply(lambda x: "{:.2f}".format(x))
+        df = df.copy()
+        df["tags/sentence"] = (df["tags"] / float(number_of_sentences)).round(2)
 
         # relative tags w/ 0
         number_of_occurrences = df["tags"].sum()
-        df["tags relative w/ 0"] = df["tags"] / number_of_occurrences
-        df["tags relative w/ 0"] = df["tags relative w/ 0"].apply(
-            lambda x: "{:.2f}".format(x)
-        )
+        df["tags relative w/ 0"] = (df["tags"] / number_of_occurrences).round(2)
 
         # relative tags w/o 0
-        number_of_filtered_occurrences = df["tags"].sum() - df.loc["O"]["tags"]
-        df["tags relative w/o 0"] = df["tags"] / number_of_filtered_occurrences
-        df["tags relative w/o 0"]["O"] = 0
-        df["tags relative w/o 0"] = df["tags relative w/o 0"].apply(
-            lambda x: "{:.2f}".format(x)
+        number_of_filtered_occurrences = df["tags"].sum() - df.loc["O", "tags"]
+        df["tags relative w/o 0"] = (df["tags"] / number_of_filtered_occurrences).round(
+            2
         )
+        df.loc["O", "tags relative w/o 0"] = 0
 
         return df
@@ -1,8 +1,6 @@
-import os
-import requests
-
-from os.path import join, isfile
+from os.path import join
 from nerblackbox.modules.datasets.formatter.base_formatter import BaseFormatter
+from nerblackbox.modules.datasets.fetcher import Fetcher
 
 
 class CoNLL2003Formatter(BaseFormatter):
@@ -24,19 +22,9 @@ class CoNLL2003Formatter(BaseFormatter):
         url_base = "https://raw.githubusercontent.com/patverga/torch-ner-nlp-from-scratch/master/data/conll2003/"
         targets = ["eng.train", "eng.testa", "eng.testb"]
 
+        fetcher = Fetcher(self.ner_dataset, self.dataset_path, verbose=verbose)
         for target in targets:
-            target_file = join(self.dataset_path, target)
-
-            # fetch tgz from url
-            if isfile(target_file):
-                if verbose:
-                    print(f".. file at {target_file} already exists")
-            else:
-                url = url_base + target
-                myfile = requests.get(url, allow_redirects=True)
-                open(target_file, "wb").write(myfile.content)
-                if verbose:
-                    print(f".. file fetched from {url} and saved at {target_file}")
+            fetcher.fetch(target, url_base + target)
 
     def create_ner_tag_mapping(self):
         """
@@ -46,15 +34,15 @@ class CoNLL2003Formatter(BaseFormatter):
         """
         return dict()
 
-    def format_data(self):
+    def format_data(self, num_workers: int = 1):
         """
         III: format data
         ----------------
+        :param num_workers: [int] number of processes that the original files are sharded across
         :return: -
         """
         for phase in ["train", "val", "test"]:
-            rows = self._read_original_file(phase)
-            self._write_formatted_csv(phase, rows)
+            self._format_original_file(phase, num_workers=num_workers)
 
     def resplit_data(self, val_fraction: float):
         """
@@ -78,30 +66,27 @@ class CoNLL2003Formatter(BaseFormatter):
     ####################################################################################################################
     # HELPER: READ ORIGINAL
     ####################################################################################################################
-    def _read_original_file(self, phase):
+    def _get_original_file_path(self, phase):
         """
         III: format data
-        ---------------------------------------------
-        :param phase:   [str] 'train' or 'test'
-        :return: _rows: [list] of [list] of [str], e.g. [[], ['Inger', 'PER'], ['säger', '0'], ..]
+        ----------------
+        :param phase: [str] 'train', 'val' or 'test'
+        :return: file_path_original: [str] path to original file
         """
         file_name = {
             "train": "eng.train",
             "val": "eng.testa",
             "test": "eng.testb",
         }
-        file_path_original = join(self.dataset_path, file_name[phase])
+        return join(self.dataset_path, file_name[phase])
 
-        _rows = list()
-        if os.path.isfile(file_path_original):
-            with open(file_path_original) as f:
-                for i, row in enumerate(f.readlines()):
-                    _rows.append(row.strip().split())
-            print(f"\n> read {file_path_original}")
-
-        _rows = [
+    def _format_original_row(self, row):
+        """
+        III: format data
+        ----------------
+        :param row: [list] of [str], i.e. split line of original file
+        :return: _row: [list] of [str], e.g. ['EU', 'I-ORG'], or [] for empty line & document start
+        """
+        return (
             [row[0], row[-1]] if (len(row) == 4 and row[0] != "-DOCSTART-") else list()
-            for row in _rows
-        ]
-
-        return _rows
+        )
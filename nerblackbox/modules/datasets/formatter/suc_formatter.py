@@ -43,15 +43,15 @@ class SUCFormatter(BaseFormatter):
         #     'other': 'misc',
         # }
 
-    def format_data(self):
+    def format_data(self, num_workers: int = 1):
         """
         III: format data
         ----------------
+        :param num_workers: [int] number of processes that the original files are sharded across
         :return: -
         """
         for phase in ["train", "val", "test"]:
-            rows = self._read_original_file(phase)
-            self._write_formatted_csv(phase, rows)
+            self._format_original_file(phase, num_workers=num_workers)
 
     def resplit_data(self, val_fraction: float):
         """
@@ -75,12 +75,12 @@ class SUCFormatter(BaseFormatter):
     ####################################################################################################################
     # HELPER: READ ORIGINAL
     ####################################################################################################################
-    def _read_original_file(self, phase):
+    def _get_original_file_path(self, phase):
         """
         III: format data
-        ---------------------------------------------
-        :param phase:   [str] 'train' or 'test'
-        :return: _rows: [list] of [list] of [str], e.g. [[], ['Inger', 'PER'], ['säger', '0'], ..]
+        ----------------
+        :param phase: [str] 'train', 'val' or 'test'
+        :return: file_path_original: [str] path to original file
         """
         file_name = {
             "train": "suc-train.conll",
@@ -88,22 +88,20 @@ class SUCFormatter(BaseFormatter):
             "test": "suc-test.conll",
         }
         file_path_original = join(self.dataset_path, file_name[phase])
-
-        _rows = list()
-        if os.path.isfile(file_path_original):
-            with open(file_path_original) as f:
-                for i, row in enumerate(f.readlines()):
-                    _rows.append(row.strip().split())
-            print(f"\n> read {file_path_original}")
-        else:
+        if not os.path.isfile(file_path_original):
             raise Exception(f"> original file {file_path_original} could not be found.")
+        return file_path_original
 
-        _rows = [
+    def _format_original_row(self, row):
+        """
+        III: format data
+        ----------------
+        :param row: [list] of [str], i.e. split line of original file
+        :return: _row: [list] of [str], e.g. ['Inger', 'B-person'], or [] for empty line
+        """
+        return (
             [row[1], self.transform_tags(row[-3], row[-2])] if len(row) > 0 else list()
-            for row in _rows
-        ]
-
-        return _rows
+        )
 
     @staticmethod
     def transform_tags(bio, tag):
@@ -1,10 +1,7 @@
-import os
-import subprocess
-
 from os.path import join
 
 from nerblackbox.modules.datasets.formatter.base_formatter import BaseFormatter
-from nerblackbox.modules.utils.env_variable import env_variable
+from nerblackbox.modules.datasets.fetcher import Fetcher
 
 
 class SwedishNerCorpusFormatter(BaseFormatter):
@@ -23,20 +20,14 @@ class SwedishNerCorpusFormatter(BaseFormatter):
         :param verbose: [bool]
         :return: -
         """
-        bash_cmds = [
-            f'git clone https://github.com/klintan/swedish-ner-corpus.git {env_variable("DIR_DATASETS")}/_swedish_ner_corpus',
-            f'mv {env_variable("DIR_DATASETS")}/_swedish_ner_corpus/* {env_variable("DIR_DATASETS")}/swedish_ner_corpus',
-            f'rm -rf {env_variable("DIR_DATASETS")}/_swedish_ner_corpus',
-        ]
-
-        for bash_cmd in bash_cmds:
-            if verbose:
-                print(bash_cmd)
+        url_base = (
+            "https://raw.githubusercontent.com/klintan/swedish-ner-corpus/master/"
+        )
+        targets = ["train_corpus.txt", "test_corpus.txt"]
 
-            try:
-                subprocess.run(bash_cmd, shell=True, check=True)
-            except subprocess.CalledProcessError as e:
-                print(e)
+        fetcher = Fetcher(self.ner_dataset, self.dataset_path, verbose=verbose)
+        for target in targets:
+            fetcher.fetch(target, url_base + target)
 
     def create_ner_tag_mapping(self):
         """
@@ -49,15 +40,15 @@ class SwedishNerCorpusFormatter(BaseFormatter):
             "PRG": "O",
         }
 
-    def format_data(self):
+    def format_data(self, num_workers: int = 1):
         """
         III: format data
         ----------------
+        :param num_workers: [int] number of processes that the original files are sharded across
         :return: -
         """
         for phase in ["train", "test"]:
-            rows = self._read_original_file(phase)
-            self._write_formatted_csv(phase, rows)
+            self._format_original_file(phase, num_workers=num_workers)
 
     def resplit_data(self, val_fraction: float):
         """
@@ -79,22 +70,20 @@ class SwedishNerCorpusFormatter(BaseFormatter):
     ####################################################################################################################
     # HELPER: READ ORIGINAL
     ####################################################################################################################
-    def _read_original_file(self, phase):
+    def _get_original_file_path(self, phase):
         """
-        - read original text files
-        ---------------------------------------------
-        :param phase:   [str] 'train' or 'test'
-        :return: _rows: [list] of [list] of [str], e.g. [['Inger', 'PER'], ['säger', '0'], ..]
+        III: format data
+        ----------------
+        :param phase: [str] 'train' or 'test'
+        :return: file_path_original: [str] path to original file
         """
-        file_path_original = join(self.dataset_path, f"{phase}_corpus.txt")
-
-        _rows = list()
-        if os.path.isfile(file_path_original):
-            with open(file_path_original) as f:
-                for row in f.readlines():
-                    _rows.append(row.strip().split())
-            print(f"\n> read {file_path_original}")
+        return join(self.dataset_path, f"{phase}_corpus.txt")
 
-        _rows = [row if len(row) == 2 else list() for row in _rows]
-
-        return _rows
+    def _format_original_row(self, row):
+        """
+        III: format data
+        ----------------
+        :param row: [list] of [str], i.e. split line of original file
+        :return: _row: [list] of [str], e.g. ['Inger', 'PER'], or [] for empty line
+        """
+        return row if len(row) == 2 else list()
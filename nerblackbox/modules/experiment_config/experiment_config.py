@@ -1,9 +1,11 @@
 import os
 from os.path import join
 from configparser import ConfigParser
+from pkg_resources import resource_filename
 from nerblackbox.modules.utils.util_functions import get_hardcoded_parameters
 from nerblackbox.modules.utils.util_functions import env_variable
 from nerblackbox.modules.utils.util_functions import get_run_name, get_run_name_nr
+from nerblackbox.modules.experiment_config.search_space import SearchSpace
 from itertools import product
 from typing import Union, Tuple, Any, Dict, Optional, List
 
@@ -15,6 +17,25 @@ class ExperimentConfig:
 
     _, params, hparams, _ = get_hardcoded_parameters(keys=False)
 
+    search_settings = {
+        "scheduler": "str",
+        "num_trials": "int",
+        "seed": "int",
+        "metric": "str",
+        "metric_mode": "str",
+        "reduction_factor": "int",
+        "grace_period": "int",
+    }
+    search_settings_default = {
+        "scheduler": "random",
+        "num_trials": 10,
+        "seed": 42,
+        "metric": "chk_f1_micro",
+        "metric_mode": "max",
+        "reduction_factor": 3,
+        "grace_period": 1,
+    }
+
     def __init__(self, experiment_name: str, run_name: str, device, fp16: bool):
         """
         :param experiment_name: [str],         e.g. 'exp1'
@@ -41,6 +62,11 @@ class ExperimentConfig:
                 f"default config file at {self.config_path_default} does not exist"
             )
 
+        # default.ini shipped w/ the package: fallback for keys that are missing in an older DATA_DIR/default.ini
+        self.config_path_default_package = resource_filename(
+            "nerblackbox", "modules/data/experiment_configs/default.ini"
+        )
+
     def get_params_and_hparams(
         self, run_name_nr: Optional[str] = None
     ) -> Dict[str, Any]:
@@ -66,11 +92,47 @@ class ExperimentConfig:
 
         return params_and_hparams
 
+    def get_search_settings(self) -> Optional[Dict[str, Any]]:
+        """
+        get settings of hyperparameter search, specified in section [search] of <experiment_name>.ini
+        ---------------------------------------------------------------------------------------------
+        :return: search_settings: [dict] e.g. {'scheduler': 'asha', 'num_trials': 10, 'metric': 'chk_f1_micro', ..}
+                                  or None if experiment has no section [search_space]
+        """
+        config = ConfigParser()
+        config.read(self.config_path)
+        if not config.has_section("search_space"):
+            return None
+
+        search_settings = dict(self.search_settings_default)
+        if config.has_section("search"):
+            for k, v in config.items("search"):
+                if k not in self.search_settings.keys():
+                    raise Exception(f"search setting = {k} is unknown.")
+                search_settings[k] = (
+                    int(v) if self.search_settings[k] == "int" else v.strip()
+                )
+
+        if search_settings["scheduler"] not in ["random", "asha"]:
+            raise Exception(
+                f"search scheduler = {search_settings['scheduler']} unknown, use 'random' or 'asha'."
+            )
+        if search_settings["metric_mode"] not in ["min", "max"]:
+            raise Exception(
+                f"search metric_mode = {search_settings['metric_mode']} unknown, use 'min' or 'max'."
+            )
+        if search_settings["reduction_factor"] < 2:
+            raise Exception(f"search reduction_factor needs to be >= 2.")
+        if search_settings["grace_period"] < 1:
+            raise Exception(f"search grace_period needs to be >= 1.")
+        return search_settings
+
     def parse(self) -> Tuple[List[str], Dict[str, Dict], Dict[str, Dict]]:
         """
         parse <experiment_name>.ini files
         if self.run_name is specified, parse only that run. else parse all runs.
-        ------------------------------------------------------------------------
+        runs comprise [runX] sections and trials sampled from [search_space] (if specified).
+        ------------------------------------------------------------------------------------
         :return: _runs_name_nr [list] of [str], e.g. ['runA-1', 'runA-2', 'runB-1', 'runB-2']
                  _runs_params  [dict] w/ keys = run [str], values = params [dict],
                                       e.g. {'runA-1': {'patience': 2, 'mode': 'min', ..}, ..}
@@ -157,7 +219,21 @@ class ExperimentConfig:
         :return: _config_dict: [dict] w/ keys = sections [str], values = [dict] w/ params: values
         """
         _config = ConfigParser()
-        _config.read(self.config_path_default if default else self.config_path)
+        _config.read(
+            [self.config_path_default_package, self.config_path_default]
+            if default
+            else self.config_path
+        )  # default: keys in DATA_DIR/default.ini override the ones in the package's default.ini
+
+        # hyperparameter search: sections [search] & [search_space] -> trial sections [runS1], [runS2], ..
+        search_settings = None if default else self.get_search_settings()
+        if search_settings is not None:
+            search_space = dict(_config.items("search_space"))
+        for s in ["search", "search_space"]:
+            _config.remove_section(s)
+        if search_settings is not None:
+            self._add_trials(_config, search_space, search_settings)
+
         _config_dict: Dict[str, Dict[str, Any]] = {
             s: dict(_config.items(s)) for s in _config.sections()
         }  # {'hparams': {'monitor': 'val_loss'}}
@@ -189,6 +265,35 @@ class ExperimentConfig:
 
         return _config, _config_dict
 
+    def _add_trials(
+        self,
+        _config: ConfigParser,
+        _search_space: Dict[str, str],
+        _search_settings: Dict[str, Any],
+    ) -> None:
+        """
+        sample trials from search space and add them as run sections to _config
+        -----------------------------------------------------------------------
+        :param _config:          [ConfigParser instance]
+        :param _search_space:    [dict] e.g. {'lr_max': 'loguniform(1e-5, 1e-4)', 'batch_size': 'choice(16, 32)'}
+        :param _search_settings: [dict] e.g. {'scheduler': 'asha', 'num_trials': 10, 'seed': 42, ..}
+        :changed attr: _config:  w/ added sections [runS1], [runS2], ..
+        :return: -
+        """
+        search_space = SearchSpace(_search_space, types={**self.params, **self.hparams})
+        trials = search_space.sample(
+            num_trials=_search_settings["num_trials"], seed=_search_settings["seed"]
+        )
+        for i, trial in enumerate(trials):
+            run_name = f"runS{i + 1}"
+            if _config.has_section(run_name):
+                raise Exception(
+                    f"section [{run_name}] is reserved for trials of the hyperparameter search."
+                )
+            _config.add_section(run_name)
+            for k, v in trial.items():
+                _config.set(run_name, k, v)
+
     def _convert(
         self, _input_key: str, _input_value: str
     ) -> Union[str, int, float, bool]:
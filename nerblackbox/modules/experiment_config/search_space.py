@@ -0,0 +1,107 @@
+import re
+import math
+import random
+from typing import Dict, List
+
+
+class SearchSpace:
+    """
+    class that samples trials (= runs) from the [search_space] section of <experiment_name>.ini files
+
+    each value in the search space is either fixed or one of the following distributions:
+    - uniform(low, high)        e.g. lr_warmup_epochs = uniform(0, 2)
+    - loguniform(low, high)     e.g. lr_max = loguniform(1e-5, 1e-4)
+    - randint(low, high)        e.g. lr_num_cycles = randint(1, 4)    (high is included)
+    - choice(value1, value2, ..) e.g. lr_schedule = choice(constant, linear, cosine)
+    """
+
+    distributions = ["uniform", "loguniform", "randint", "choice"]
+    pattern = re.compile(r"^\s*(\w+)\s*\((.*)\)\s*$")
+
+    def __init__(self, search_space: Dict[str, str], types: Dict[str, str]):
+        """
+        :param search_space: [dict] w/ keys = parameter name [str] & values = distribution [str],
+                                    e.g. {'lr_max': 'loguniform(1e-5, 1e-4)', 'batch_size': 'choice(16, 32)'}
+        :param types:        [dict] w/ keys = parameter name [str] & values = type [str], e.g. {'lr_max': 'float'}
+        """
+        self.search_space = dict()
+        for key, value in search_space.items():
+            if key not in types.keys():
+                raise Exception(f"parameter = {key} is unknown.")
+            self.search_space[key] = self._parse(key, value)
+        self.types = types
+
+    def sample(self, num_trials: int, seed: int) -> List[Dict[str, str]]:
+        """
+        sample trials. the same num_trials & seed always lead to the same trials.
+        --------------------------------------------------------------------------
+        :param num_trials: [int] e.g. 10
+        :param seed:       [int] e.g. 42
+        :return: trials:   [list] of [dict] w/ keys = parameter name [str] & values = value [str],
+                                  e.g. [{'lr_max': '2.3e-05', 'batch_size': '16'}, ..]
+        """
+        rng = random.Random(seed)
+        return [
+            {
+                key: self._sample(key, distribution, arguments, rng)
+                for key, (distribution, arguments) in self.search_space.items()
+            }
+            for _ in range(num_trials)
+        ]
+
+    ####################################################################################################################
+    # HELPER
+    ####################################################################################################################
+    def _parse(self, _key, _value):
+        """
+        :param _key:   [str] e.g. 'lr_max'
+        :param _value: [str] e.g. 'loguniform(1e-5, 1e-4)' or '2e-5'
+        :return: distribution: [str or None] e.g. 'loguniform' or None (fixed value)
+        :return: arguments:    [list] of [str] e.g. ['1e-5', '1e-4'] or ['2e-5']
+        """
+        match = self.pattern.match(_value)
+        if match is None:
+            return None, [_value.strip()]
+
+        distribution = match.group(1)
+        arguments = [argument.strip() for argument in match.group(2).split(",")]
+        if distribution not in self.distributions:
+            raise Exception(
+                f"distribution = {distribution} for parameter = {_key} unknown, use one of {self.distributions}."
+            )
+        if distribution == "choice":
+            if len(arguments) == 0 or "" in arguments:
+                raise Exception(f"choice for parameter = {_key} needs values.")
+        elif len(arguments) != 2:
+            raise Exception(
+                f"{distribution} for parameter = {_key} needs exactly 2 arguments (low, high)."
+            )
+        elif distribution == "loguniform" and float(arguments[0]) <= 0:
+            raise Exception(f"loguniform for parameter = {_key} needs low > 0.")
+        return distribution, arguments
+
+    def _sample(self, _key, _distribution, _arguments, _rng):
+        """
+        :param _key:          [str] e.g. 'lr_max'
+        :param _distribution: [str or None] e.g. 'loguniform'
+        :param _arguments:    [list] of [str] e.g. ['1e-5', '1e-4']
+        :param _rng:          [random.Random]
+        :return: value:       [str] e.g. '2.3e-05'
+        """
+        if _distribution is None:
+            return _arguments[0]
+        elif _distribution == "choice":
+            return _rng.choice(_arguments)
+        elif _distribution == "randint":
+            return str(_rng.randint(int(_arguments[0]), int(_arguments[1])))
+        else:
+            low, high = float(_arguments[0]), float(_arguments[1])
+            if _distribution == "uniform":
+                value = _rng.uniform(low, high)
+            else:
+                value = math.exp(_rng.uniform(math.log(low), math.log(high)))
+
+            if self.types[_key] == "int":
+                return str(int(round(value)))
+            else:
+                return f"{value:.3g}"
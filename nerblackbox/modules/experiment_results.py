@@ -1,6 +1,8 @@
-from typing import Optional, Dict
+from typing import Optional, Dict, TYPE_CHECKING
 from pandas import DataFrame
-from nerblackbox.modules.ner_training.ner_model_predict import NerModelPredict
+
+if TYPE_CHECKING:  # avoids importing torch & co. at runtime
+    from nerblackbox.modules.ner_training.ner_model_predict import NerModelPredict
 
 
 class ExperimentResults:
@@ -14,7 +16,7 @@ class ExperimentResults:
         average_runs: Optional[DataFrame] = None,
         best_single_run: Optional[Dict] = None,
         best_average_run: Optional[Dict] = None,
-        best_model: Optional[NerModelPredict] = None,
+        best_model: Optional["NerModelPredict"] = None,
     ):
         """
 
@@ -34,7 +36,7 @@ class ExperimentResults:
         self.best_average_run = best_average_run
         self.best_model = best_model
 
-    def _set_best_model(self, best_model: NerModelPredict) -> None:
+    def _set_best_model(self, best_model: "NerModelPredict") -> None:
         """set best model.
 
         Args:
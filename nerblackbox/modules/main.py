@@ -1,25 +1,29 @@
 import os
 from os.path import join, isfile, isdir
 import glob
-import mlflow
 import shutil
 from argparse import Namespace
+from concurrent.futures import ThreadPoolExecutor
 from pkg_resources import Requirement
 from pkg_resources import resource_filename, resource_isdir
+import numpy as np
 import pandas as pd
-from mlflow.tracking import MlflowClient
 
 from nerblackbox.modules.utils.env_variable import env_variable
 from nerblackbox.modules.utils.util_functions import epoch2checkpoint
-from nerblackbox.modules.utils.util_functions import (
-    get_run_name,
-    compute_mean_and_dmean,
-)
+from nerblackbox.modules.utils.util_functions import get_run_name
 from nerblackbox.modules.experiment_results import ExperimentResults
+from nerblackbox.modules.results_index import ResultsIndex
 from typing import Optional, Any, Tuple, Union, Dict, List
 from pandas import DataFrame
 
 DATASETS = ["conll2003", "swedish_ner_corpus"]
+FLAGS_WITH_EXPERIMENTS = [
+    "run_experiment",
+    "get_experiment_results",
+    "get_experiments",
+    "get_experiments_results",
+]
 
 
 class NerBlackBoxMain:
@@ -30,15 +34,24 @@ class NerBlackBoxMain:
         dataset_name: Optional[str] = None,  # analyze_data & set_up_dataset
         modify: Optional[bool] = True,  # set_up_dataset
         val_fraction: Optional[float] = 0.3,  # set_up_dataset
+        num_workers: Optional[int] = None,  # set_up_dataset
         verbose: Optional[bool] = False,
         experiment_name: Optional[str] = None,
         run_name: Optional[str] = None,  # run_experiment
         device: Optional[Any] = "gpu",  # run_experiment
         fp16: Optional[bool] = False,  # run_experiment
+        resume: Optional[bool] = False,  # run_experiment
         text_input: Optional[str] = None,  # predict
         ids: Optional[Tuple[str]] = (),  # get_experiments, get_experiments_results
         as_df: Optional[bool] = True,  # get_experiments, get_experiments_results
         results: Optional[bool] = False,  # clear_data
+        in_process: Optional[
+            bool
+        ] = False,  # analyze_data, set_up_dataset, run_experiment
+        refresh: Optional[
+            bool
+        ] = False,  # get_experiment_results, get_experiments_results
+        num_threads: Optional[int] = None,  # get_experiments_results
     ):
         """
         :param flag:            [str], e.g. 'analyze_data', 'set_up_dataset', 'run_experiment', ..
@@ -46,15 +59,20 @@ class NerBlackBoxMain:
         :param dataset_name     [str] e.g. 'swedish_ner_corpus'
         :param modify           [bool] if True: modify tags as specified in method modify_ner_tag_mapping()
         :param val_fraction     [float] e.g. 0.3
+        :param num_workers      [int or None] set_up_dataset: number of worker processes, None = 1
         :param verbose          [bool]
         :param experiment_name: [str], e.g. 'exp0'
         :param run_name:        [str or None], e.g. 'runA'
         :param device:          [torch device]
         :param fp16:            [bool]
+        :param resume:          [bool] if True, skip finished runs & resume interrupted runs of experiment
         :param text_input:      [str], e.g. 'this is some text that needs to be annotated'
         :param ids:             [tuple of int], experiment_ids to include
         :param as_df:           [bool] if True, return pandas DataFrame, else return dict
         :param results:         [bool] if True, clear not only checkpoints but also mlflow, tensorboard and logs
+        :param in_process:      [bool] if True, run mlflow entry points in the current process instead of a subprocess
+        :param refresh:         [bool] if True, rebuild results index from a full scan of the mlflow runs
+        :param num_threads      [int or None] get_experiments_results: number of worker threads, None = 1
         """
         self._assert_flag(flag)
 
@@ -65,21 +83,26 @@ class NerBlackBoxMain:
         self.dataset_name = dataset_name  # analyze_data & set_up_dataset
         self.modify = modify  # set_up_dataset
         self.val_fraction = val_fraction  # set_up_dataset
+        self.num_workers = num_workers  # set_up_dataset
         self.verbose = verbose
         self.experiment_name = experiment_name
         self.run_name = run_name  # run_experiment
         self.device = device  # run_experiment
         self.fp16 = fp16  # run_experiment
+        self.resume = resume  # run_experiment
         self.text_input = text_input  # predict
         self.ids = ids  # get_experiments, get_experiments_results
         self.as_df = as_df  # get_experiments, get_experiments_results
         self.results = results  # clear_data
+        self.in_process = in_process  # analyze_data, set_up_dataset, run_experiment
+        self.refresh = refresh  # get_experiment_results, get_experiments_results
+        self.num_threads = num_threads  # get_experiments_results
 
         data_dir = env_variable("DATA_DIR")
-        if os.path.isdir(data_dir):
+        if os.path.isdir(data_dir) and self.flag in FLAGS_WITH_EXPERIMENTS:
             self._set_client_and_get_experiments()
         else:
-            # will be set in init() method
+            # will be set in init() method, not needed otherwise (avoids importing mlflow)
             self.client = None
             self.experiment_id2name = None
             self.experiment_name2id = None
@@ -186,13 +209,7 @@ class NerBlackBoxMain:
             "verbose": self.verbose,
         }
 
-        mlflow.projects.run(
-            uri=resource_filename(Requirement.parse("nerblackbox"), "nerblackbox"),
-            entry_point="analyze_data",
-            experiment_name="Default",
-            parameters=_parameters,
-            use_conda=False,
-        )
+        self._run_entry_point("analyze_data", "Default", _parameters)
 
     def clear_data(self) -> None:
         """
@@ -212,7 +229,9 @@ class NerBlackBoxMain:
                 + glob.glob(join(results_dir, "mlruns", ".*"))
                 + glob.glob(join(results_dir, "tensorboard", "*"))
                 + glob.glob(join(results_dir, "logs.log"))
+                + glob.glob(join(results_dir, "logs"))
                 + glob.glob(join(results_dir, "*.npy"))
+                + glob.glob(join(results_dir, "*.npz"))
             )
             objects_to_remove.extend(results_files)
 
@@ -304,21 +323,31 @@ class NerBlackBoxMain:
 
     def get_experiments_results(self) -> Optional[Namespace]:
         r"""
-        :used attr: ids     [tuple] of [str], e.g. ('4', '5')
-        :used attr: as_df   [bool] if True, return [pandas DataFrame], else return [dict]
-        :used attr: verbose [bool]
+        :used attr: ids         [tuple] of [str], e.g. ('4', '5')
+        :used attr: as_df       [bool] if True, return [pandas DataFrame], else return [dict]
+        :used attr: verbose     [bool]
+        :used attr: num_threads [int or None] max. number of experiments processed concurrently, None = 1
         :return: experiments_results: [Namespace] w/ attributes = 'best_single_runs', 'best_average_runs'
                                                    & values = [pandas DataFrame] or [dict]
         """
         assert self.ids is not None, f"ERROR! self.ids is None."
+        assert (
+            self.num_threads is None or self.num_threads >= 1
+        ), f"ERROR! num_threads = {self.num_threads} needs to be >= 1."
         experiments_filtered = self._filter_experiments_by_ids(self.ids)
 
+        # query & parse experiments concurrently (I/O bound), merge in sorted order
+        with ThreadPoolExecutor(max_workers=self.num_threads or 1) as executor:
+            experiments_results = list(
+                executor.map(
+                    self._get_single_experiment_results,
+                    sorted(list(experiments_filtered.keys())),
+                )
+            )
+
         best_single_runs_overview = list()
         best_average_runs_overview = list()
-        for _id in sorted(list(experiments_filtered.keys())):
-            experiment_results = self._get_single_experiment_results(
-                _id,
-            )
+        for experiment_results in experiments_results:
             if experiment_results.best_single_run:
                 best_single_runs_overview.append(experiment_results.best_single_run)
             if experiment_results.best_average_run:
@@ -373,21 +402,17 @@ class NerBlackBoxMain:
         :used attr: run_name        [str] or None, e.g. 'runA'
         :used attr: device          [torch device]
         :used attr: fp16            [bool]
+        :used attr: resume          [bool]
         """
         _parameters = {
             "experiment_name": self.experiment_name,
             "run_name": self.run_name if self.run_name else "",
             "device": self.device,
             "fp16": int(self.fp16),
+            "resume": int(self.resume),
         }
 
-        mlflow.projects.run(
-            uri=resource_filename(Requirement.parse("nerblackbox"), "nerblackbox"),
-            entry_point="run_experiment",
-            experiment_name=self.experiment_name,
-            parameters=_parameters,
-            use_conda=False,
-        )
+        self._run_entry_point("run_experiment", self.experiment_name, _parameters)
 
         self._get_experiments()  # needs to updated to get results from experiment that was run
         self.get_experiment_results()
@@ -397,23 +422,22 @@ class NerBlackBoxMain:
         :param _dataset_name:    [str] e.g. 'swedish_ner_corpus'
         :used attr: modify       [bool] if True: modify tags as specified in method modify_ner_tag_mapping()
         :used attr: val_fraction [float] e.g. 0.3
+        :used attr: num_workers  [int or None] number of worker processes, None = 1
         :used attr: verbose      [bool]
         """
+        assert (
+            self.num_workers is None or self.num_workers >= 1
+        ), f"ERROR! num_workers = {self.num_workers} needs to be >= 1."
 
         _parameters = {
             "ner_dataset": _dataset_name,
             "modify": self.modify,
             "val_fraction": self.val_fraction,
             "verbose": self.verbose,
+            "num_workers": self.num_workers if self.num_workers else 1,
         }
 
-        mlflow.projects.run(
-            uri=resource_filename(Requirement.parse("nerblackbox"), "nerblackbox"),
-            entry_point="set_up_dataset",
-            experiment_name="Default",
-            parameters=_parameters,
-            use_conda=False,
-        )
+        self._run_entry_point("set_up_dataset", "Default", _parameters)
 
     def show_experiment_config(self) -> None:
         """
@@ -474,6 +498,8 @@ class NerBlackBoxMain:
         :created attr: experiment_name2id [dict] w/ keys = experiment_name [str] & values = experiment_id [str]
         :return: -
         """
+        from mlflow.tracking import MlflowClient
+
         self.client = MlflowClient()
         self._get_experiments()
 
@@ -497,6 +523,112 @@ class NerBlackBoxMain:
         ), f"ERROR! self.experiment_id2name is None."
         self.experiment_name2id = {v: k for k, v in self.experiment_id2name.items()}
 
+    ####################################################################################################################
+    # HELPER: ENTRY POINTS
+    ####################################################################################################################
+    def _run_entry_point(
+        self, entry_point: str, experiment_name: str, _parameters: Dict[str, Any]
+    ) -> None:
+        """
+        run entry point of MLproject, in a subprocess (mlflow.projects.run) or in the current process
+        ------------------------------------------------------------------------------------------------
+        :param entry_point:     [str] 'analyze_data', 'set_up_dataset' or 'run_experiment'
+        :param experiment_name: [str] mlflow experiment name, e.g. 'exp0'
+        :param _parameters:     [dict] entry point parameters
+        :used attr: in_process  [bool]
+        :return: -
+        """
+        if self.in_process:
+            self._run_entry_point_in_process(entry_point, experiment_name, _parameters)
+        else:
+            import mlflow.projects
+
+            mlflow.projects.run(
+                uri=resource_filename(Requirement.parse("nerblackbox"), "nerblackbox"),
+                entry_point=entry_point,
+                experiment_name=experiment_name,
+                parameters=_parameters,
+                use_conda=False,
+            )
+
+    @staticmethod
+    def _run_entry_point_in_process(
+        entry_point: str, experiment_name: str, _parameters: Dict[str, Any]
+    ) -> None:
+        """
+        run entry point of MLproject in the current process, with the same mlflow run structure as
+        mlflow.projects.run: a run w/ entry point parameters is created and resumed by the script (MLFLOW_RUN_ID)
+        -----------------------------------------------------------------------------------------------------------
+        :param entry_point:     [str] 'analyze_data', 'set_up_dataset' or 'run_experiment'
+        :param experiment_name: [str] mlflow experiment name, e.g. 'exp0'
+        :param _parameters:     [dict] entry point parameters
+        :return: -
+        """
+        from mlflow.tracking import MlflowClient
+
+        client = MlflowClient()
+        experiment = client.get_experiment_by_name(experiment_name)
+        experiment_id = (
+            experiment.experiment_id
+            if experiment is not None
+            else client.create_experiment(experiment_name)
+        )
+        run = client.create_run(
+            experiment_id,
+            tags={
+                "mlflow.source.name": resource_filename(
+                    Requirement.parse("nerblackbox"), "nerblackbox"
+                ),
+                "mlflow.source.type": "PROJECT",
+                "mlflow.project.entryPoint": entry_point,
+            },
+        )
+        env_variables = {
+            "MLFLOW_RUN_ID": run.info.run_id,
+            "MLFLOW_EXPERIMENT_ID": experiment_id,
+        }
+        env_variables_previous = {key: os.environ.get(key) for key in env_variables}
+        os.environ.update(env_variables)
+        try:
+            for k, v in _parameters.items():
+                client.log_param(run.info.run_id, k, v)
+
+            if entry_point == "run_experiment":
+                from nerblackbox.modules.scripts import script_run_experiment
+
+                parser = script_run_experiment.get_parser()
+                args = parser.parse_args(
+                    [
+                        elem
+                        for k, v in _parameters.items()
+                        for elem in [f"--{k}", str(v)]
+                    ]
+                )
+                script_run_experiment.main(
+                    *script_run_experiment._parse_args(parser, args)
+                )
+            elif entry_point == "set_up_dataset":
+                from nerblackbox.modules.scripts import script_set_up_dataset
+
+                script_set_up_dataset.main(Namespace(**_parameters))
+            elif entry_point == "analyze_data":
+                from nerblackbox.modules.scripts import script_analyze_data
+
+                script_analyze_data.main(Namespace(**_parameters))
+            else:
+                raise Exception(f"entry_point = {entry_point} unknown.")
+        except BaseException:
+            # run is left RUNNING if the script fails before it attaches to the run (mlflow.start_run)
+            if client.get_run(run.info.run_id).info.status == "RUNNING":
+                client.set_terminated(run.info.run_id, status="FAILED")
+            raise
+        finally:
+            for key, value in env_variables_previous.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
     ####################################################################################################################
     # HELPER: SINGLE EXPERIMENT
     ####################################################################################################################
@@ -510,10 +642,10 @@ class NerBlackBoxMain:
         ), f"ERROR! self.experiment_id2name is None."
 
         experiment_name = self.experiment_id2name[experiment_id]
-        runs = self.client.search_runs(experiment_id)
+        records = self._get_records(experiment_id)
 
         _experiment, _single_runs, _average_runs = self._parse_and_create_dataframe(
-            runs,
+            records,
         )
 
         # best run
@@ -584,6 +716,25 @@ class NerBlackBoxMain:
             _best_average_run,
         )
 
+    def _get_records(self, experiment_id: str) -> List[Dict[str, Any]]:
+        r"""
+        get run records of experiment from results index,
+        fall back to a full mlflow scan (& reindex) if experiment is not indexed or refresh is requested
+        ------------------------------------------------------------------------------------------------
+        :param experiment_id: [str], e.g. '0'
+        :used attr: refresh   [bool]
+        :return: records: [list] of [dict], see ResultsIndex
+        """
+        results_index = ResultsIndex()
+        records = None if self.refresh else results_index.get_records(experiment_id)
+        if records is None:
+            records = [
+                results_index.run_to_record(run)
+                for run in self.client.search_runs(experiment_id)
+            ]
+            results_index.set_records(experiment_id, records)
+        return records
+
     ####################################################################################################################
     # HELPER: ALL EXPERIMENTS
     ####################################################################################################################
@@ -608,171 +759,89 @@ class NerBlackBoxMain:
 
     @staticmethod
     def _parse_and_create_dataframe(
-        _runs: List,
-    ) -> Tuple[DataFrame, DataFrame, DataFrame]:
+        _records: List[Dict[str, Any]],
+    ) -> Tuple[Optional[DataFrame], Optional[DataFrame], Optional[DataFrame]]:
         r"""
-        turn mlflow Run objects (= search_runs() results) into data frames
-        ------------------------------------------------------------------
-        :param _runs:   [list] of [mlflow.entities.Run objects]
+        turn run records (see ResultsIndex) into data frames
+        ----------------------------------------------------
+        :param _records: [list] of [dict] w/ keys = 'run_id', 'run_name_nr', 'params', 'metrics'
         :return: _experiment:   [pandas DataFrame] overview on experiment parameters
         :return: _single_runs:  [pandas DataFrame] overview on single  run parameters & results
         :return: _average_runs: [pandas DataFrame] overview on average run parameters & results
         """
-        fields_metrics = [
-            "epoch_best",
-            "epoch_stopped",
-            "epoch_best_val_chk_f1_micro",
-            "epoch_best_test_chk_f1_micro",
+        fields_metrics = ["epoch_best", "epoch_stopped"] + [
+            f"epoch_{epoch}_{phase}_{level}_f1_micro"
+            for epoch in ["best", "stopped"]
+            for phase in ["val", "test"]
+            for level in ["all", "fil", "chk"]
+        ]
+        by = ("metrics", "epoch_best_val_chk_f1_micro")
+
+        records_experiment = [
+            record for record in _records if len(record["metrics"]) == 0
         ]
+        records_runs = [record for record in _records if len(record["metrics"]) > 0]
 
         ###########################################
-        # parameters_experiment & parameters_runs
+        # experiment
         ###########################################
-        parameters_runs: Dict[Tuple, Any] = dict()
-        for i in range(len(_runs)):
-            if len(_runs[i].data.metrics) == 0:  # experiment
-                parameters_experiment = {
-                    k: [v] for k, v in _runs[i].data.params.items()
-                }
-            else:  # run
-                if ("info", "run_id") not in parameters_runs.keys():
-                    parameters_runs[("info", "run_id")] = [_runs[i].info.run_id]
-                else:
-                    parameters_runs[("info", "run_id")].append(_runs[i].info.run_id)
+        if len(records_experiment):
+            _experiment = pd.DataFrame(
+                {k: [v] for k, v in records_experiment[-1]["params"].items()},
+                index=["experiment"],
+            ).T
+        else:
+            _experiment = None
 
-                if ("info", "run_name_nr") not in parameters_runs.keys():
-                    parameters_runs[("info", "run_name_nr")] = [
-                        _runs[i].data.tags["mlflow.runName"]
-                    ]
-                else:
-                    parameters_runs[("info", "run_name_nr")].append(
-                        _runs[i].data.tags["mlflow.runName"]
-                    )
-
-                for k, v in _runs[i].data.params.items():
-                    if ("params", k) not in parameters_runs.keys():
-                        parameters_runs[("params", k)] = [v]
-                    else:
-                        parameters_runs[("params", k)].append(v)
-
-                for k in fields_metrics:
-                    if ("metrics", k) not in parameters_runs.keys():
-                        try:
-                            parameters_runs[("metrics", k)] = [_runs[i].data.metrics[k]]
-                        except:
-                            parameters_runs[("metrics", k)] = [-1]
-                    else:
-                        try:
-                            parameters_runs[("metrics", k)].append(
-                                _runs[i].data.metrics[k]
-                            )
-                        except:
-                            parameters_runs[("metrics", k)] = [-1]
-
-        _experiment = pd.DataFrame(parameters_experiment, index=["experiment"]).T
-        for k in ["epoch_best", "epoch_stopped"]:
-            try:
-                parameters_runs[("metrics", k)] = [
-                    int(elem) for elem in parameters_runs[("metrics", k)]
-                ]
-            except:
-                parameters_runs[("metrics", k)] = [-1]
+        if len(records_runs) == 0:
+            return _experiment, None, None
 
         ###########################################
-        # parameters_runs_average
+        # single runs: tidy data frame w/ one row per run
         ###########################################
-        def average(_parameters_runs):
-            _parameters_runs_average = {("info", "run_name"): list()}
-            _parameters_runs_average.update(
-                {
-                    k: list()
-                    for k in _parameters_runs.keys()
-                    if k[0] not in ["info", "metrics"]
-                }
-            )
-            _parameters_runs_average.update(
-                {
-                    k: list()
-                    for k in [
-                        ("metrics", "epoch_best_val_chk_f1_micro"),
-                        ("metrics", "d_epoch_best_val_chk_f1_micro"),
-                        ("metrics", "epoch_best_test_chk_f1_micro"),
-                        ("metrics", "d_epoch_best_test_chk_f1_micro"),
-                    ]
-                }
-            )
-
-            runs_name_nr = _parameters_runs[("info", "run_name_nr")]
-            nr_runs = len(runs_name_nr)
-            runs_name = list(
-                set([get_run_name(run_name_nr) for run_name_nr in runs_name_nr])
-            )
-            indices = {
-                run_name: [
-                    idx
-                    for idx in range(nr_runs)
-                    if get_run_name(runs_name_nr[idx]) == run_name
-                ]
-                for run_name in runs_name
+        info = pd.DataFrame(
+            {
+                "run_id": [record["run_id"] for record in records_runs],
+                "run_name_nr": [record["run_name_nr"] for record in records_runs],
             }
+        )
+        params = pd.DataFrame([record["params"] for record in records_runs])
+        metrics = pd.DataFrame([record["metrics"] for record in records_runs]).reindex(
+            columns=fields_metrics
+        )  # missing metrics = NaN, ignored in averages below
 
-            def get_mean_and_dmean(_parameters_runs, phase):
-                values = [
-                    _parameters_runs[("metrics", f"epoch_best_{phase}_chk_f1_micro")][
-                        idx
-                    ]
-                    for idx in indices[run_name]
-                ]
-                return compute_mean_and_dmean(values)
-
-            #######################
-            # loop over runs_name
-            #######################
-            for run_name in runs_name:
-                # add ('info', 'run_name')
-                _parameters_runs_average[("info", "run_name")].append(run_name)
-
-                # add ('params', *)
-                random_index = indices[run_name][0]
-                keys_kept = [k for k in _parameters_runs.keys() if k[0] == "params"]
-                for key in keys_kept:
-                    _parameters_runs_average[key].append(
-                        _parameters_runs[key][random_index]
-                    )
-
-                # add ('metrics', *)
-                val_mean, val_dmean = get_mean_and_dmean(_parameters_runs, "val")
-                test_mean, test_dmean = get_mean_and_dmean(_parameters_runs, "test")
-                metrics = {
-                    "epoch_best_val_chk_f1_micro": val_mean,
-                    "d_epoch_best_val_chk_f1_micro": val_dmean,
-                    "epoch_best_test_chk_f1_micro": test_mean,
-                    "d_epoch_best_test_chk_f1_micro": test_dmean,
-                }
-                for k in metrics.keys():
-                    key = ("metrics", k)
-                    _parameters_runs_average[key].append(metrics[k])
+        metrics_single = metrics.fillna(-1)
+        metrics_single[["epoch_best", "epoch_stopped"]] = metrics_single[
+            ["epoch_best", "epoch_stopped"]
+        ].astype(int)
 
-            return _parameters_runs_average
+        _single_runs = pd.concat(
+            {"info": info, "params": params, "metrics": metrics_single}, axis=1
+        ).sort_values(by=by, ascending=False)
 
         ###########################################
-        # sort & return
+        # average runs: group by run name
         ###########################################
-        by = ("metrics", "epoch_best_val_chk_f1_micro")
-        try:
-            _single_runs = pd.DataFrame(parameters_runs).sort_values(
-                by=by, ascending=False
-            )
-        except:
-            _single_runs = None
+        run_name = info["run_name_nr"].map(get_run_name).rename("run_name")
+        metrics_grouped = metrics.groupby(run_name)
+        metrics_mean = metrics_grouped.mean()
+        metrics_count = metrics_grouped.count()
+        metrics_dmean = (metrics_grouped.std(ddof=0) / np.sqrt(metrics_count)).where(
+            metrics_count > 1
+        )
 
-        try:
-            parameters_runs_average = average(parameters_runs)
-            _average_runs = pd.DataFrame(parameters_runs_average).sort_values(
-                by=by, ascending=False
-            )
-        except:
-            _average_runs = None
+        metrics_average = pd.concat(
+            [metrics_mean.fillna(-1), metrics_dmean.add_prefix("d_")], axis=1
+        )[[field for k in fields_metrics for field in [k, f"d_{k}"]]]
+
+        _average_runs = pd.concat(
+            {
+                "info": metrics_mean.index.to_frame(index=False),
+                "params": params.groupby(run_name).first().reset_index(drop=True),
+                "metrics": metrics_average.reset_index(drop=True),
+            },
+            axis=1,
+        ).sort_values(by=by, ascending=False)
 
         return _experiment, _single_runs, _average_runs
 
@@ -2,17 +2,26 @@ import torch
 import mlflow
 import os
 from os.path import join
+from typing import Optional
 from pytorch_lightning import Trainer
 from pytorch_lightning.loggers import TensorBoardLogger
 from pytorch_lightning.callbacks import ModelCheckpoint
-from pytorch_lightning.callbacks import EarlyStopping
 
 from nerblackbox.modules.ner_training.ner_model_train import (
     NerModelTrain,
 )
 from nerblackbox.modules.ner_training.logging.default_logger import DefaultLogger
+from nerblackbox.modules.ner_training.callbacks.resumable_early_stopping import (
+    ResumableEarlyStopping,
+)
+from nerblackbox.modules.ner_training.callbacks.successive_halving import (
+    SuccessiveHalvingEarlyStopping,
+)
+from nerblackbox.modules.ner_training.callbacks.profiling import ProfilingCallback
+from nerblackbox.modules.experiment_config.experiment_config import ExperimentConfig
 from nerblackbox.modules.utils.util_functions import unify_parameters
 from nerblackbox.modules.utils.env_variable import env_variable
+from nerblackbox.modules.results_index import ResultsIndex
 from nerblackbox.modules.utils.util_functions import (
     get_package_version,
     checkpoint2epoch,
@@ -20,12 +29,21 @@ from nerblackbox.modules.utils.util_functions import (
 )
 
 
-def main(params, hparams, log_dirs, experiment: bool):
+def main(
+    params,
+    hparams,
+    log_dirs,
+    experiment: bool,
+    parent_run_id: Optional[str] = None,
+    resume_run_id: Optional[str] = None,
+):
     """
-    :param params:     [argparse.Namespace] attr: experiment_name, run_name, pretrained_model_name, dataset_name, ..
-    :param hparams:    [argparse.Namespace] attr: batch_size, max_seq_length, max_epochs, lr_*
-    :param log_dirs:   [argparse.Namespace] attr: mlflow, tensorboard
-    :param experiment: [bool] whether run is part of an experiment w/ multiple runs
+    :param params:        [argparse.Namespace] attr: experiment_name, run_name, pretrained_model_name, dataset_name, ..
+    :param hparams:       [argparse.Namespace] attr: batch_size, max_seq_length, max_epochs, lr_*
+    :param log_dirs:      [argparse.Namespace] attr: mlflow, tensorboard
+    :param experiment:    [bool] whether run is part of an experiment w/ multiple runs
+    :param parent_run_id: [str] mlflow run_id of experiment run, if run is executed in a separate worker process
+    :param resume_run_id: [str] mlflow run_id of interrupted run that is resumed from its last checkpoint
     :return: -
     """
     default_logger = DefaultLogger(
@@ -37,44 +55,87 @@ def main(params, hparams, log_dirs, experiment: bool):
     lightning_hparams = unify_parameters(params, hparams, log_dirs, experiment)
 
     tb_logger = logging_start(params, log_dirs)
-    with mlflow.start_run(run_name=params.run_name_nr, nested=experiment):
+    last_checkpoint = join(_get_model_checkpoint_directory(params), "last.ckpt")
+    if resume_run_id is None or not os.path.isfile(last_checkpoint):
+        resume_from_checkpoint = None
+        if os.path.isfile(last_checkpoint):
+            os.remove(last_checkpoint)  # left over by a previous run w/ the same name
+        if resume_run_id is not None:
+            default_logger.log_info(
+                f"> resume run from scratch, no checkpoint {last_checkpoint} found "
+                f"(setting checkpoints_resume = True saves one after each epoch)"
+            )
+    else:
+        resume_from_checkpoint = last_checkpoint
+        default_logger.log_info(f"> resume run from checkpoint {last_checkpoint}")
+
+    with start_run(params, experiment, parent_run_id, resume_run_id) as active_run:
 
         model = NerModelTrain(lightning_hparams)
-        callbacks = get_callbacks(params, hparams, log_dirs)
-
-        trainer = Trainer(
-            max_epochs=hparams.max_epochs,
-            gpus=torch.cuda.device_count() if params.device.type == "cuda" else None,
-            precision=16 if (params.fp16 and params.device.type == "cuda") else 32,
-            amp_level="O1",
-            logger=tb_logger,
-            checkpoint_callback=callbacks["checkpoint"],
-            early_stop_callback=callbacks["early_stop"],
-        )
-        trainer.fit(model)
-        trainer.test()
-
-        callback_info = get_callback_info(callbacks, params, hparams)
-
-        # use best checkpoint
-        model_best = NerModelTrain.load_from_checkpoint(
-            checkpoint_path=callback_info["checkpoint_best"]
-        )
-        best_trainer = Trainer(
-            gpus=torch.cuda.device_count() if params.device.type == "cuda" else None,
-            precision=16 if (params.fp16 and params.device.type == "cuda") else 32,
-            logger=tb_logger,
-        )
-        best_trainer.test(model_best)
-
-        # logging end
-        logging_end(
-            tb_logger, callback_info, hparams, model, model_best, default_logger
-        )
-
-        # remove checkpoint
-        if params.checkpoints is False:
-            remove_checkpoint(callback_info["checkpoint_best"], default_logger)
+        try:
+            search_settings = (
+                ExperimentConfig(
+                    experiment_name=params.experiment_name,
+                    run_name=params.run_name,
+                    device=params.device,
+                    fp16=params.fp16,
+                ).get_search_settings()
+                if experiment
+                else None
+            )
+            callbacks = get_callbacks(
+                params,
+                hparams,
+                log_dirs,
+                search_settings,
+                last_checkpoint if params.checkpoints_resume else None,
+            )
+            if resume_from_checkpoint is not None:
+                restore_training_state(resume_from_checkpoint, model, callbacks)
+
+            trainer = Trainer(
+                max_epochs=hparams.max_epochs,
+                gpus=torch.cuda.device_count()
+                if params.device.type == "cuda"
+                else None,
+                precision=16 if (params.fp16 and params.device.type == "cuda") else 32,
+                amp_level="O1",
+                logger=tb_logger,
+                checkpoint_callback=callbacks["checkpoint"],
+                early_stop_callback=callbacks["early_stop"],
+                resume_from_checkpoint=resume_from_checkpoint,
+                accumulate_grad_batches=hparams.accumulate_grad_batches,
+                profiler=callbacks["profiling"],
+                callbacks=[callbacks["profiling"]] if callbacks["profiling"] else [],
+            )
+            trainer.fit(model)
+            trainer.test()
+
+            callback_info = get_callback_info(callbacks, params, hparams)
+
+            # use best checkpoint
+            test_epoch_best(trainer, model, callback_info)
+
+            # logging end
+            logging_end(tb_logger, callback_info, hparams, model, default_logger)
+
+            # remove checkpoint
+            if os.path.isfile(last_checkpoint):
+                remove_checkpoint(last_checkpoint, default_logger)
+            if params.checkpoints is False:
+                remove_checkpoint(callback_info["checkpoint_best"], default_logger)
+        except BaseException:
+            # mlflow (before run ends, also if training fails): the training error takes precedence
+            try:
+                model.mlflow_client.finish_metrics()
+            except Exception as e:
+                default_logger.log_warning(f"> {e}")
+            raise
+        else:
+            model.mlflow_client.finish_metrics()  # mlflow (before run ends)
+
+    # results index (after run has finished)
+    ResultsIndex().update_run(active_run.info.run_id)
 
 
 ########################################################################################################################
@@ -95,6 +156,8 @@ def print_run_information(_params, _hparams, _logger):
     _logger.log_info(f"> available GPUs: {torch.cuda.device_count()}")
     _logger.log_info(f"> device:         {_params.device}")
     _logger.log_info(f"> fp16:           {_params.fp16}")
+    if _params.fp16 and _params.device.type == "cpu":
+        _logger.log_info("> precision:      bfloat16 autocast (cpu)")
     _logger.log_info("..")
     _logger.log_info(f"> dataset_name:          {_params.dataset_name}")
     _logger.log_info(f"> dataset_tags:          {_params.dataset_tags}")
@@ -106,24 +169,63 @@ def print_run_information(_params, _hparams, _logger):
     _logger.log_info(f"> uncased:               {_params.uncased}")
     _logger.log_info("..")
     _logger.log_info(f"> checkpoints:           {_params.checkpoints}")
+    _logger.log_info(f"> checkpoints_resume:    {_params.checkpoints_resume}")
     _logger.log_info(f"> logging_level:         {_params.logging_level}")
     _logger.log_info(f"> multiple_runs:         {_params.multiple_runs}")
+    _logger.log_info(f"> profiling_steps:       {_params.profiling_steps}")
     _logger.log_info("")
     _logger.log_info("- HPARAMS ----------------------------------------")
-    _logger.log_info(f"> batch_size:       {_hparams.batch_size}")
-    _logger.log_info(f"> max_seq_length:   {_hparams.max_seq_length}")
-    _logger.log_info(f"> max_epochs:       {_hparams.max_epochs}")
-    _logger.log_info(f"> monitor:          {_hparams.monitor}")
-    _logger.log_info(f"> min_delta:        {_hparams.min_delta}")
-    _logger.log_info(f"> patience:         {_hparams.patience}")
-    _logger.log_info(f"> mode:             {_hparams.mode}")
-    _logger.log_info(f"> lr_max:           {_hparams.lr_max}")
-    _logger.log_info(f"> lr_warmup_epochs: {_hparams.lr_warmup_epochs}")
-    _logger.log_info(f"> lr_schedule:      {_hparams.lr_schedule}")
-    _logger.log_info(f"> lr_num_cycles:    {_hparams.lr_num_cycles}")
+    _logger.log_info(f"> batch_size:              {_hparams.batch_size}")
+    _logger.log_info(f"> accumulate_grad_batches: {_hparams.accumulate_grad_batches}")
+    _logger.log_info(f"> max_seq_length:          {_hparams.max_seq_length}")
+    _logger.log_info(f"> max_epochs:              {_hparams.max_epochs}")
+    _logger.log_info(f"> monitor:                 {_hparams.monitor}")
+    _logger.log_info(f"> min_delta:               {_hparams.min_delta}")
+    _logger.log_info(f"> patience:                {_hparams.patience}")
+    _logger.log_info(f"> mode:                    {_hparams.mode}")
+    _logger.log_info(f"> lr_max:                  {_hparams.lr_max}")
+    _logger.log_info(f"> lr_warmup_epochs:        {_hparams.lr_warmup_epochs}")
+    _logger.log_info(f"> lr_schedule:             {_hparams.lr_schedule}")
+    _logger.log_info(f"> lr_num_cycles:           {_hparams.lr_num_cycles}")
+    _logger.log_info(f"> freeze_embeddings:       {_hparams.freeze_embeddings}")
+    _logger.log_info(f"> freeze_layers:           {_hparams.freeze_layers}")
+    _logger.log_info(f"> gradient_checkpointing:  {_hparams.gradient_checkpointing}")
     _logger.log_info("")
 
 
+def start_run(_params, _experiment, _parent_run_id=None, _resume_run_id=None):
+    """
+    :param _params:        [argparse.Namespace] attr: experiment_name, run_name, pretrained_model_name, dataset_name, ..
+    :param _experiment:    [bool] whether run is part of an experiment w/ multiple runs
+    :param _parent_run_id: [str] mlflow run_id of experiment run, if run is executed in a separate worker process
+    :param _resume_run_id: [str] mlflow run_id of interrupted run that is resumed
+    :return: active_run:   [mlflow ActiveRun]
+    """
+    if _resume_run_id is not None:
+        return mlflow.start_run(
+            run_id=_resume_run_id, nested=_experiment and _parent_run_id is None
+        )
+    elif _parent_run_id is None:
+        return mlflow.start_run(run_name=_params.run_name_nr, nested=_experiment)
+    else:
+        # the experiment run is only active in the main process -> create nested run explicitly
+        from mlflow.tracking import MlflowClient
+        from mlflow.tracking.context.registry import resolve_tags
+        from mlflow.utils.mlflow_tags import MLFLOW_PARENT_RUN_ID, MLFLOW_RUN_NAME
+
+        client = MlflowClient()
+        run = client.create_run(
+            experiment_id=client.get_run(_parent_run_id).info.experiment_id,
+            tags=resolve_tags(
+                {
+                    MLFLOW_PARENT_RUN_ID: _parent_run_id,
+                    MLFLOW_RUN_NAME: _params.run_name_nr,
+                }
+            ),
+        )
+        return mlflow.start_run(run_id=run.info.run_id)
+
+
 def _get_model_checkpoint_directory(_params):
     """
     :param _params:     [argparse.Namespace] attr: experiment_name, run_name, pretrained_model_name, dataset_name, ..
@@ -132,12 +234,16 @@ def _get_model_checkpoint_directory(_params):
     return join(env_variable("DIR_CHECKPOINTS"), _params.experiment_run_name_nr)
 
 
-def get_callbacks(_params, _hparams, _log_dirs):
+def get_callbacks(
+    _params, _hparams, _log_dirs, _search_settings=None, _last_checkpoint=None
+):
     """
-    :param _params:     [argparse.Namespace] attr: experiment_name, run_name, pretrained_model_name, dataset_name, ..
-    :param _hparams:    [argparse.Namespace] attr: batch_size, max_seq_length, max_epochs, lr_*
-    :param _log_dirs:   [argparse.Namespace] attr: mlflow, tensorboard
-    :return: _callbacks: [dict] w/ keys 'checkpoint', 'early_stop' & values = [pytorch lightning callback]
+    :param _params:          [argparse.Namespace] attr: experiment_name, run_name, pretrained_model_name, dataset_name, ..
+    :param _hparams:         [argparse.Namespace] attr: batch_size, max_seq_length, max_epochs, lr_*
+    :param _log_dirs:        [argparse.Namespace] attr: mlflow, tensorboard
+    :param _search_settings: [dict] hyperparameter search settings, e.g. {'scheduler': 'asha', ..}, or None
+    :param _last_checkpoint: [str] path to checkpoint w/ training state after last epoch (to resume), or None
+    :return: _callbacks: [dict] w/ keys 'checkpoint', 'early_stop', 'profiling' & values = [pytorch lightning callback]
     """
     early_stopping_params = {
         k: vars(_hparams)[k] for k in ["monitor", "min_delta", "patience", "mode"]
@@ -150,11 +256,42 @@ def get_callbacks(_params, _hparams, _log_dirs):
         "checkpoint": ModelCheckpoint(
             filepath=model_checkpoint_filepath, verbose=True
         ),  # if _params.checkpoints else None,
-        "early_stop": EarlyStopping(**early_stopping_params, verbose=True),
+        "early_stop": ResumableEarlyStopping(
+            last_checkpoint=_last_checkpoint, **early_stopping_params, verbose=True
+        ),
+        "profiling": ProfilingCallback(_params.profiling_steps)
+        if _params.profiling_steps > 0
+        else None,
     }
+    if _search_settings is not None and _search_settings["scheduler"] == "asha":
+        _callbacks["early_stop"] = SuccessiveHalvingEarlyStopping(
+            experiment_name=_params.experiment_name,
+            run_name_nr=_params.run_name_nr,
+            metric=_search_settings["metric"],
+            metric_mode=_search_settings["metric_mode"],
+            reduction_factor=_search_settings["reduction_factor"],
+            grace_period=_search_settings["grace_period"],
+            last_checkpoint=_last_checkpoint,
+            **early_stopping_params,
+            verbose=True,
+        )
     return _callbacks
 
 
+def restore_training_state(_checkpoint_path, _model, _callbacks):
+    """
+    restore training state that pytorch lightning does not restore by itself (resume_from_checkpoint)
+    ---------------------------------------------------------------------------------------------------
+    :param _checkpoint_path: [str] path to last checkpoint
+    :param _model:           [NerModelTrain]
+    :param _callbacks:       [dict] w/ keys 'checkpoint', 'early_stop' & values = [pytorch lightning callback]
+    :return: -
+    """
+    checkpoint = torch.load(_checkpoint_path, map_location="cpu")
+    _model.restore_training_state(checkpoint)
+    _callbacks["early_stop"].restore(checkpoint, _callbacks["checkpoint"])
+
+
 def get_callback_info(_callbacks, _params, _hparams):
     """
     :param _callbacks: [dict] w/ keys 'checkpoint', 'early_stop' & values = [pytorch lightning callback]
@@ -165,9 +302,13 @@ def get_callback_info(_callbacks, _params, _hparams):
     checkpoint_best = list(_callbacks["checkpoint"].best_k_models.keys())[0]
     callback_info = dict()
     callback_info["epoch_best"] = checkpoint2epoch(checkpoint_best)
+    pruned = (
+        isinstance(_callbacks["early_stop"], SuccessiveHalvingEarlyStopping)
+        and _callbacks["early_stop"].pruned
+    )  # successive halving may stop a run at epoch 0
     callback_info["epoch_stopped"] = (
         _callbacks["early_stop"].stopped_epoch
-        if _callbacks["early_stop"].stopped_epoch
+        if _callbacks["early_stop"].stopped_epoch or pruned
         else _hparams.max_epochs - 1
     )
     callback_info["checkpoint_best"] = join(
@@ -178,6 +319,30 @@ def get_callback_info(_callbacks, _params, _hparams):
     return callback_info
 
 
+def test_epoch_best(_trainer, _model, _callback_info):
+    """
+    test model w/ weights of best epoch, unless it coincides w/ the stopped epoch (which has been tested already).
+    the weights of the best checkpoint are loaded into the trained model in place (no reload of data & model).
+    ---------------------------------------------------------------------------------------------------------------
+    :param _trainer:       [pytorch lightning Trainer] that has been used to train & test _model
+    :param _model:         [NerModelTrain] epoch_stopped
+    :param _callback_info: [dict] w/ keys 'epoch_best', 'epoch_stopped', 'checkpoint_best'
+    :changed attr: _model.epoch_metrics: [dict] w/ test metrics for epoch_best & epoch_stopped
+    :return: -
+    """
+    epoch_best = _callback_info["epoch_best"]
+    if epoch_best == _callback_info["epoch_stopped"]:
+        return
+
+    checkpoint = torch.load(_callback_info["checkpoint_best"], map_location="cpu")
+    _model.load_state_dict(checkpoint["state_dict"])
+
+    current_epoch = _model.current_epoch
+    _model.current_epoch = epoch_best  # test metrics are stored for epoch_best
+    _trainer.test()
+    _model.current_epoch = current_epoch
+
+
 def logging_start(_params, _log_dirs):
     """
     :param _params:      [argparse.Namespace] attr: experiment_name, run_name, pretrained_model_name, dataset_name, ..
@@ -193,15 +358,12 @@ def logging_start(_params, _log_dirs):
     return _tb_logger
 
 
-def logging_end(
-    _tb_logger, _callback_info, _hparams, _model_stopped, _model_best, _logger
-):
+def logging_end(_tb_logger, _callback_info, _hparams, _model, _logger):
     """
     :param _tb_logger:     [pytorch lightning TensorBoardLogger]
     :param _callback_info: [dict] w/ keys 'epoch_best', 'epoch_stopped', 'checkpoint_best'
     :param _hparams:       [argparse.Namespace] attr: batch_size, max_seq_length, max_epochs, lr_*
-    :param _model_stopped: [NerModelTrain] epoch_stopped
-    :param _model_best:    [NerModelTrain] epoch_best
+    :param _model:         [NerModelTrain] w/ val & test metrics for epoch_best & epoch_stopped
     :param _logger:        [DefaultLogger]
     :return: -
     """
@@ -211,28 +373,28 @@ def logging_end(
     _logger.log_info(f"epoch_best: {epoch_best}")
     _logger.log_info(f"epoch_stopped: {epoch_stopped}")
 
-    _model_stopped.mlflow_client.log_metric("epoch_best", epoch_best)
-    _model_stopped.mlflow_client.log_metric("epoch_stopped", epoch_stopped)
+    _model.mlflow_client.log_metric("epoch_best", epoch_best)
+    _model.mlflow_client.log_metric("epoch_stopped", epoch_stopped)
     for metric in ("all_f1_micro", "fil_f1_micro", "chk_f1_micro"):
-        _model_stopped.mlflow_client.log_metric(
+        _model.mlflow_client.log_metric(
             f"epoch_stopped_val_{metric}",
-            _model_stopped.epoch_metrics["val"][epoch_stopped][metric],
+            _model.epoch_metrics["val"][epoch_stopped][metric],
         )
-        _model_stopped.mlflow_client.log_metric(
+        _model.mlflow_client.log_metric(
             f"epoch_stopped_test_{metric}",
-            _model_stopped.epoch_metrics["test"][epoch_stopped][metric],
+            _model.epoch_metrics["test"][epoch_stopped][metric],
         )
-        _model_stopped.mlflow_client.log_metric(
+        _model.mlflow_client.log_metric(
             f"epoch_best_val_{metric}",
-            _model_stopped.epoch_metrics["val"][epoch_best][metric],
+            _model.epoch_metrics["val"][epoch_best][metric],
         )
-        _model_stopped.mlflow_client.log_metric(
-            f"epoch_best_test_{metric}", _model_best.epoch_metrics["test"][0][metric]
+        _model.mlflow_client.log_metric(
+            f"epoch_best_test_{metric}",
+            _model.epoch_metrics["test"][epoch_best][metric],
         )
-
-    _model_stopped.mlflow_client.finish_artifact_logger()  # mlflow
+    _model.mlflow_client.finish_artifact_logger()  # mlflow
     _tb_logger_stopped_epoch(
-        _tb_logger, _hparams, epoch_best, epoch_stopped, _model_stopped, _model_best
+        _tb_logger, _hparams, epoch_best, epoch_stopped, _model
     )  # tb
 
 
@@ -241,8 +403,7 @@ def _tb_logger_stopped_epoch(
     _hparams,
     _epoch_best,
     _epoch_stopped,
-    _model_stopped,
-    _model_best,
+    _model,
     metrics=("all_f1_micro", "fil_f1_micro", "chk_f1_micro"),
 ):
     """
@@ -252,8 +413,7 @@ def _tb_logger_stopped_epoch(
     :param _hparams:        [argparse.Namespace] attr: batch_size, max_seq_length, max_epochs, prune_ratio_*, lr_*
     :param _epoch_best:     [int]
     :param _epoch_stopped:  [int]
-    :param _model_stopped:  [NerModelTrain] epoch_stopped
-    :param _model_best:     [NerModelTrain] epoch_best
+    :param _model:          [NerModelTrain] w/ val & test metrics for epoch_best & epoch_stopped
     :param metrics:         [tuple] of metrics to be logged in hparams section
     :return:
     """
@@ -265,7 +425,7 @@ def _tb_logger_stopped_epoch(
 
     # val/test
     hparams_stopped_val = {
-        f'hparam/val/epoch_stopped_{_epoch_stopped}/{metric.replace("+", "P")}': _model_stopped.epoch_metrics[
+        f'hparam/val/epoch_stopped_{_epoch_stopped}/{metric.replace("+", "P")}': _model.epoch_metrics[
             "val"
         ][
             _epoch_stopped
@@ -275,7 +435,7 @@ def _tb_logger_stopped_epoch(
         for metric in metrics
     }
     hparams_stopped_test = {
-        f'hparam/test/epoch_stopped_{_epoch_stopped}/{metric.replace("+", "P")}': _model_stopped.epoch_metrics[
+        f'hparam/test/epoch_stopped_{_epoch_stopped}/{metric.replace("+", "P")}': _model.epoch_metrics[
             "test"
         ][
             _epoch_stopped
@@ -286,7 +446,7 @@ def _tb_logger_stopped_epoch(
     }
 
     hparams_best_val = {
-        f'hparam/val/epoch_best_{_epoch_best}/{metric.replace("+", "P")}': _model_stopped.epoch_metrics[
+        f'hparam/val/epoch_best_{_epoch_best}/{metric.replace("+", "P")}': _model.epoch_metrics[
             "val"
         ][
             _epoch_best
@@ -297,10 +457,10 @@ def _tb_logger_stopped_epoch(
     }
 
     hparams_best_test = {
-        f'hparam/test/epoch_best_{_epoch_best}/{metric.replace("+", "P")}': _model_best.epoch_metrics[
+        f'hparam/test/epoch_best_{_epoch_best}/{metric.replace("+", "P")}': _model.epoch_metrics[
             "test"
         ][
-            0
+            _epoch_best
         ][
             metric
         ]
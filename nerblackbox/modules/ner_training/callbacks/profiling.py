@@ -0,0 +1,195 @@
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, Optional
+
+import torch
+from pytorch_lightning.callbacks.base import Callback
+from pytorch_lightning.profiler.profiler import BaseProfiler
+
+try:
+    import resource
+except ImportError:  # windows
+    resource = None
+
+
+class ProfilingCallback(BaseProfiler, Callback):
+    """
+    opt-in instrumentation of training throughput & memory, used as both profiler & callback of the Trainer.
+
+    as profiler, it times the actions of each training batch (data loader wait, forward, backward, optimizer step)
+    and counts samples & tokens (real / padded) of the fetched batches.
+    as callback, it logs averages over every log_every_n_steps training batches to tensorboard & mlflow
+    (prefix 'profiling/'), and a summary of the whole run when training ends.
+    time spent on validation is excluded.
+    """
+
+    actions = {
+        "get_train_batch": "data",
+        "model_forward": "forward",
+        "model_backward": "backward",
+        "optimizer_step": "optimizer",
+    }
+
+    def __init__(self, log_every_n_steps: int):
+        """
+        :param log_every_n_steps: [int] e.g. 50, number of training batches that metrics are averaged & logged over
+        """
+        self.log_every_n_steps = log_every_n_steps
+        self.synchronize = torch.cuda.is_available()
+        self.starts: Dict[str, float] = dict()
+        self.window: Dict[str, float] = defaultdict(float)
+        self.window_start: Optional[float] = None
+        self.total: Dict[str, float] = defaultdict(float)
+        self.summary: Dict[str, float] = dict()
+
+    ####################################################################################################################
+    # PROFILER
+    ####################################################################################################################
+    def start(self, action_name):
+        if action_name in self.actions:
+            self.starts[action_name] = time.perf_counter()
+
+    def stop(self, action_name):
+        if action_name in self.actions and action_name in self.starts:
+            if self.synchronize and action_name != "get_train_batch":
+                torch.cuda.synchronize()  # cuda kernels run asynchronously
+            self.window[
+                self.actions[action_name]
+            ] += time.perf_counter() - self.starts.pop(action_name)
+
+    def profile_iterable(self, iterable, action_name):
+        for value in super().profile_iterable(iterable, action_name):
+            if action_name == "get_train_batch":
+                _, batch = value
+                input_ids, attention_mask = batch[0], batch[1]
+                self.window["samples"] += input_ids.shape[0]
+                self.window["tokens"] += float(attention_mask.sum())
+                self.window["tokens_padded"] += input_ids.numel()
+            yield value
+
+    ####################################################################################################################
+    # CALLBACK
+    ####################################################################################################################
+    def on_epoch_start(self, trainer, pl_module):
+        self._start_window()
+
+    def on_batch_end(self, trainer, pl_module):
+        self.window["batches"] += 1
+        if self.window["batches"] >= self.log_every_n_steps:
+            metrics = self._close_window()
+            pl_module.logger.log_metrics(metrics, pl_module.global_step)
+            pl_module.mlflow_client.log_step_metrics(pl_module.global_step, metrics)
+            self._start_window()
+
+    def on_validation_start(self, trainer, pl_module):
+        self._close_window()  # incomplete window is only used for the summary
+
+    def on_validation_end(self, trainer, pl_module):
+        self._start_window()
+
+    def on_train_end(self, trainer, pl_module):
+        self._close_window()
+        self.summary = self.get_summary()
+        pl_module.mlflow_client.log_profiling_summary(self.summary)
+        pl_module.default_logger.log_info(
+            "- PROFILING --------------------------------------"
+        )
+        for k, v in self.summary.items():
+            pl_module.default_logger.log_info(f"> {k}: {v}")
+
+    ####################################################################################################################
+    # HELPER
+    ####################################################################################################################
+    def get_summary(self) -> Dict[str, float]:
+        """
+        :return: summary: [dict] w/ throughput, time fractions & memory of all training batches of the run
+        """
+        summary = {
+            "batches": int(self.total["batches"]),
+            "samples": int(self.total["samples"]),
+            "time_sec": round(self.total["time"], 3),
+        }
+        summary.update(
+            {
+                k.split("/", 1)[1]: v
+                for k, v in self._get_metrics(self.total, fractions=True).items()
+            }
+        )
+        if summary["batches"] > 0:
+            times = {
+                "input": self.total["data"],
+                "compute": self.total["forward"]
+                + self.total["backward"]
+                + self.total["optimizer"],
+                "other (logging, callbacks, ..)": self.total["other"],
+            }
+            summary["bound"] = max(times, key=times.get)
+        return summary
+
+    def _start_window(self):
+        self.window = defaultdict(float)
+        self.window_start = time.perf_counter()
+
+    def _close_window(self) -> Dict[str, float]:
+        """
+        add window to total
+        -------------------
+        :return: metrics: [dict] w/ keys = 'profiling/samples_per_sec', .. & values = [float] averages over window
+        """
+        if self.window_start is None or self.window["batches"] == 0:
+            self.window_start = None
+            return dict()
+
+        self.window["time"] = time.perf_counter() - self.window_start
+        self.window["other"] = max(
+            0.0,
+            self.window["time"]
+            - sum(self.window[action] for action in self.actions.values()),
+        )
+        for k, v in self.window.items():
+            self.total[k] += v
+        self.window_start = None
+        return self._get_metrics(self.window)
+
+    def _get_metrics(self, counts, fractions=False) -> Dict[str, float]:
+        """
+        :param counts:    [dict] w/ accumulated 'time', 'batches', 'samples', 'tokens', .., 'data', 'forward', ..
+        :param fractions: [bool] if True, time fractions instead of seconds per batch
+        :return: metrics: [dict] w/ keys = 'profiling/samples_per_sec', .. & values = [float]
+        """
+        if counts["batches"] == 0 or counts["time"] == 0:
+            return dict()
+
+        metrics = {
+            "profiling/samples_per_sec": counts["samples"] / counts["time"],
+            "profiling/tokens_per_sec": counts["tokens"] / counts["time"],
+            "profiling/padded_tokens_per_sec": counts["tokens_padded"] / counts["time"],
+            "profiling/step_sec": counts["time"] / counts["batches"],
+        }
+        for action in list(self.actions.values()) + ["other"]:
+            if fractions:
+                metrics[f"profiling/{action}_fraction"] = (
+                    counts[action] / counts["time"]
+                )
+            else:
+                metrics[f"profiling/{action}_sec"] = counts[action] / counts["batches"]
+
+        peak_rss_mb = self._get_peak_rss_mb()
+        if peak_rss_mb is not None:
+            metrics["profiling/peak_rss_mb"] = peak_rss_mb
+        if torch.cuda.is_available():
+            metrics["profiling/peak_gpu_memory_mb"] = (
+                torch.cuda.max_memory_allocated() / 1024**2
+            )
+        return {k: round(v, 4) for k, v in metrics.items()}
+
+    @staticmethod
+    def _get_peak_rss_mb() -> Optional[float]:
+        """
+        :return: peak_rss_mb: [float] peak resident set size of the process in MB, None if not available
+        """
+        if resource is None:
+            return None
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak_rss / 1024**2 if sys.platform == "darwin" else peak_rss / 1024
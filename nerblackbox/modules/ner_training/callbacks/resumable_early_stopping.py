@@ -0,0 +1,78 @@
+from typing import Optional, Dict, Any
+from pytorch_lightning.callbacks import EarlyStopping
+
+
+class ResumableEarlyStopping(EarlyStopping):
+    """
+    early stopping that saves the whole training state to last_checkpoint after each epoch that training continues,
+    i.e. after the stop decision for the epoch has been made.
+
+    besides the trainer state (weights, optimizer, epoch, ..) & the model state (see NerModelTrain.on_save_checkpoint),
+    the checkpoint contains the state of this callback & the checkpoint callback,
+    which pytorch lightning does not (fully) restore by itself.
+    """
+
+    def __init__(self, last_checkpoint: Optional[str] = None, **kwargs):
+        """
+        :param last_checkpoint: [str] path to checkpoint that is overwritten after each epoch, None = no checkpoint
+        :param kwargs:          [dict] w/ EarlyStopping parameters, e.g. {'monitor': 'val_loss', 'patience': 2, ..}
+        """
+        super().__init__(**kwargs)
+        self.last_checkpoint = last_checkpoint
+        self.state_to_restore: Optional[Dict[str, Any]] = None
+
+    def on_train_start(self, trainer, pl_module):
+        super().on_train_start(trainer, pl_module)
+        if self.state_to_restore is not None:
+            self.wait = self.state_to_restore["wait"]
+            self.best = self.state_to_restore["best"]
+            self.state_to_restore = None
+
+    def on_epoch_end(self, trainer, pl_module):
+        stop_training = self.should_stop(trainer, pl_module)
+        if not stop_training and self.last_checkpoint is not None:
+            self._save_last_checkpoint(trainer)
+        return stop_training
+
+    def should_stop(self, trainer, pl_module) -> bool:
+        """
+        :param trainer:   [pytorch lightning Trainer]
+        :param pl_module: [NerModelTrain]
+        :return: stop_training: [bool]
+        """
+        return super().on_epoch_end(trainer, pl_module)
+
+    ####################################################################################################################
+    # CHECKPOINT
+    ####################################################################################################################
+    def _save_last_checkpoint(self, trainer):
+        """
+        :param trainer: [pytorch lightning Trainer]
+        :return: -
+        """
+        checkpoint = trainer.dump_checkpoint()
+        checkpoint["early_stop_callback_state"] = {
+            "wait": self.wait,
+            "best": self.best,
+        }
+        if trainer.checkpoint_callback:
+            checkpoint["checkpoint_callback_state"] = {
+                "best_k_models": dict(trainer.checkpoint_callback.best_k_models),
+                "kth_best_model": trainer.checkpoint_callback.kth_best_model,
+                "kth_value": trainer.checkpoint_callback.kth_value,
+            }
+        trainer._atomic_save(checkpoint, self.last_checkpoint)
+
+    def restore(self, checkpoint: Dict[str, Any], checkpoint_callback=None) -> None:
+        """
+        restore state of this callback (when training starts) & of checkpoint_callback (immediately)
+        --------------------------------------------------------------------------------------------
+        :param checkpoint:          [dict] loaded last checkpoint
+        :param checkpoint_callback: [pytorch lightning ModelCheckpoint]
+        :return: -
+        """
+        self.state_to_restore = checkpoint.get("early_stop_callback_state")
+        checkpoint_callback_state = checkpoint.get("checkpoint_callback_state")
+        if checkpoint_callback and checkpoint_callback_state is not None:
+            for k, v in checkpoint_callback_state.items():
+                setattr(checkpoint_callback, k, v)
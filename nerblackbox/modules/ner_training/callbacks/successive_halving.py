@@ -0,0 +1,150 @@
+import os
+import json
+import glob
+from os.path import join, isfile
+
+from nerblackbox.modules.utils.env_variable import env_variable
+from nerblackbox.modules.ner_training.callbacks.resumable_early_stopping import (
+    ResumableEarlyStopping,
+)
+
+
+class SuccessiveHalvingEarlyStopping(ResumableEarlyStopping):
+    """
+    early stopping (patience) combined with asynchronous successive halving (ASHA) across the runs of an experiment.
+
+    rungs are placed at epochs (counting from 1) grace_period * reduction_factor^k, k = 0, 1, 2, ..
+    whenever a run reaches a rung, its val metric is recorded & compared to the values of all runs
+    that have reached the same rung so far. the run is stopped unless it is among the best 1 / reduction_factor.
+    """
+
+    def __init__(
+        self,
+        experiment_name: str,
+        run_name_nr: str,
+        metric: str = "chk_f1_micro",
+        metric_mode: str = "max",
+        reduction_factor: int = 3,
+        grace_period: int = 1,
+        **kwargs,
+    ):
+        """
+        :param experiment_name:  [str] e.g. 'exp0'
+        :param run_name_nr:      [str] e.g. 'runS1-1'
+        :param metric:           [str] val metric that runs are compared on, e.g. 'chk_f1_micro'
+        :param metric_mode:      [str] 'min' or 'max'
+        :param reduction_factor: [int] e.g. 3, only the best third of the runs continue at each rung
+        :param grace_period:     [int] e.g. 1, epochs before the first rung
+        :param kwargs:           [dict] w/ ResumableEarlyStopping parameters, e.g. {'monitor': 'val_loss', ..}
+        """
+        super().__init__(**kwargs)
+        self.rung_directory = self.get_rung_directory(experiment_name)
+        self.rung_file = join(self.rung_directory, f"{run_name_nr}.json")
+        self.metric = metric
+        self.metric_mode = metric_mode
+        self.reduction_factor = reduction_factor
+        self.grace_period = grace_period
+        self.pruned = False
+
+    @staticmethod
+    def get_rung_directory(experiment_name: str) -> str:
+        """
+        :param experiment_name: [str] e.g. 'exp0'
+        :return: rung_directory: [str] directory that contains one json file w/ rung values per run
+        """
+        return join(env_variable("DIR_RESULTS"), "search", experiment_name)
+
+    def on_train_start(self, trainer, pl_module):
+        super().on_train_start(trainer, pl_module)
+        self.pruned = False
+
+    def should_stop(self, trainer, pl_module):
+        stop_training = super().should_stop(trainer, pl_module)
+        if stop_training:
+            return stop_training
+
+        epoch = trainer.current_epoch
+        if not self.is_rung(epoch):
+            return False
+
+        value = float(pl_module.epoch_metrics["val"][epoch][self.metric])
+        self._record(epoch, value)
+        if self._is_pruned(value, self._get_rung_values(epoch)):
+            self.pruned = True
+            self.stopped_epoch = epoch
+            print(
+                f"> successive halving: run stopped at epoch {epoch} (val {self.metric} = {value:.4f})"
+            )
+            return True
+        return False
+
+    ####################################################################################################################
+    # HELPER
+    ####################################################################################################################
+    def is_rung(self, epoch: int) -> bool:
+        """
+        :param epoch: [int] e.g. 2 (counting from 0)
+        :return: is_rung: [bool] True if epoch + 1 = grace_period * reduction_factor^k
+        """
+        epochs = epoch + 1
+        if epochs % self.grace_period != 0:
+            return False
+        ratio = epochs // self.grace_period
+        while ratio % self.reduction_factor == 0:
+            ratio //= self.reduction_factor
+        return ratio == 1
+
+    def _record(self, epoch, value):
+        """
+        :param epoch: [int]
+        :param value: [float] val metric at epoch
+        :return: -
+        """
+        os.makedirs(self.rung_directory, exist_ok=True)
+        rungs = self._load(self.rung_file)
+        rungs[str(epoch)] = value
+        rung_file_tmp = f"{self.rung_file}.tmp"
+        with open(rung_file_tmp, "w") as f:
+            json.dump(rungs, f)
+        os.replace(rung_file_tmp, self.rung_file)
+
+    def _get_rung_values(self, epoch):
+        """
+        :param epoch: [int]
+        :return: values: [list] of [float] val metric at epoch of all runs that have reached it
+        """
+        rungs_all_runs = [
+            self._load(rung_file)
+            for rung_file in glob.glob(join(self.rung_directory, "*.json"))
+        ]
+        return [rungs[str(epoch)] for rungs in rungs_all_runs if str(epoch) in rungs]
+
+    def _is_pruned(self, value, values):
+        """
+        :param value:  [float] val metric of run
+        :param values: [list] of [float] val metric of all runs at the same rung (incl. run itself)
+        :return: pruned: [bool] True if value is not among the best 1 / reduction_factor of values
+        """
+        if len(values) <= 1:
+            return False
+        nr_promoted = max(1, len(values) // self.reduction_factor)
+        values_sorted = sorted(values, reverse=self.metric_mode == "max")
+        threshold = values_sorted[nr_promoted - 1]
+        if self.metric_mode == "max":
+            return value < threshold
+        else:
+            return value > threshold
+
+    @staticmethod
+    def _load(rung_file):
+        """
+        :param rung_file: [str]
+        :return: rungs: [dict] w/ keys = epoch [str] & values = val metric [float]
+        """
+        if not isfile(rung_file):
+            return dict()
+        try:
+            with open(rung_file, "r") as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            return dict()
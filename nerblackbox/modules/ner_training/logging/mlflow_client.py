@@ -1,5 +1,10 @@
+import json
 import mlflow
+from os.path import join, dirname
 from nerblackbox.modules.experiment_config.experiment_config import ExperimentConfig
+from nerblackbox.modules.ner_training.logging.mlflow_metric_buffer import (
+    MLflowMetricBuffer,
+)
 
 
 class MLflowClient:
@@ -17,6 +22,7 @@ class MLflowClient:
         self.log_dirs = log_dirs
         self.logged_metrics = logged_metrics  # TODO: not used !!
         self.default_logger = default_logger
+        self.metric_buffer = None  # created for active run when first metric is logged
 
     @staticmethod
     def log_params(params, hparams, experiment=False):
@@ -63,36 +69,92 @@ class MLflowClient:
                     mlflow.log_param(hyperparameter, vars(hparams)[hyperparameter])
 
     def log_metric(self, _metric, _stopped_epoch):
-        mlflow.log_metric(_metric, _stopped_epoch)
+        """
+        mlflow metric logging (buffered, see finish_metrics)
+        ----------------------------------------------------
+        :param: _metric:        [str], e.g. 'epoch_best'
+        :param: _stopped_epoch: [float]
+        :return: -
+        """
+        self._get_metric_buffer().add(_metric, _stopped_epoch)
 
     def log_metrics(self, _epoch, _epoch_val_metrics):
         """
-        mlflow metrics logging
-        -----------------------------
+        mlflow metrics logging (one batch per epoch w/ step = epoch, logged in the background)
+        ----------------------------------------------------------------------
         :param: _epoch:             [int]
         :param: _epoch_val_metrics  [dict] w/ keys 'loss', 'acc', 'f1' & values = [np array]
         :return: -
         """
-        mlflow.log_metric("epoch", _epoch)
+        metric_buffer = self._get_metric_buffer()
+        metric_buffer.add("epoch", _epoch, step=_epoch)
         for metric in _epoch_val_metrics.keys():
             _metric = metric.replace("[", "_").replace("]", "_").replace("+", "P")
-            mlflow.log_metric(_metric, _epoch_val_metrics[metric])
+            metric_buffer.add(_metric, _epoch_val_metrics[metric], step=_epoch)
+        metric_buffer.flush()
+
+    def log_step_metrics(self, _step, _metrics):
+        """
+        mlflow metrics logging for training steps (one batch, logged in the background)
+        -------------------------------------------------------------------------------
+        :param: _step:    [int] global step
+        :param: _metrics: [dict] w/ keys 'profiling/samples_per_sec', .. & values = [float]
+        :return: -
+        """
+        metric_buffer = self._get_metric_buffer()
+        for metric in _metrics.keys():
+            metric_buffer.add(metric, _metrics[metric], step=_step)
+        metric_buffer.flush()
+
+    def log_profiling_summary(self, _summary):
+        """
+        log profiling summary as artifact (profiling.json, next to the classification reports)
+        ---------------------------------------------------------------------------------------
+        :param: _summary: [dict] w/ keys 'samples_per_sec', .. & values = [float]
+        :return: -
+        """
+        profiling_file = join(dirname(self.log_dirs.mlflow_file), "profiling.json")
+        with open(profiling_file, "w") as f:
+            json.dump(_summary, f, indent=2)
+        mlflow.log_artifact(profiling_file)
 
-    def log_classification_report(self, _classification_report, overwrite=False):
+    def finish_metrics(self):
         """
-        log classification report
+        log all buffered metrics & wait until they are logged. needs to be called before the mlflow run ends.
+        ------------------------------------------------------------------------------------------------------
+        :return: -
+        """
+        if self.metric_buffer is not None:
+            metric_buffer, self.metric_buffer = self.metric_buffer, None
+            metric_buffer.close()
+
+    def log_classification_report(self, _classification_report):
+        """
+        log classification report (append to artifact)
         ------------------------------------------------------------------------------------
         :param: _classification_report: [str]
-        :param: overwrite: [bool] if True, overwrite existing artifact, else append
         :return: -
         """
-        if overwrite:
-            self._clear_artifact()
         self._log_artifact(_classification_report)
 
-    @staticmethod
-    def log_time(_time):
-        mlflow.log_metric("time", _time)
+    def clear_classification_report(self):
+        """
+        clear classification reports of previous runs w/ the same artifact
+        ------------------------------------------------------------------
+        :return: -
+        """
+        self._clear_artifact()
+
+    def log_time(self, _time):
+        self._get_metric_buffer().add("time", _time)
+
+    def _get_metric_buffer(self):
+        """
+        :return: metric_buffer: [MLflowMetricBuffer] for active mlflow run
+        """
+        if self.metric_buffer is None:
+            self.metric_buffer = MLflowMetricBuffer.for_active_run()
+        return self.metric_buffer
 
     def _clear_artifact(self):
         """
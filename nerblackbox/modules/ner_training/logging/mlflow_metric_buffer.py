@@ -0,0 +1,106 @@
+import time
+import queue
+import atexit
+import threading
+from typing import List, Optional
+
+import mlflow
+from mlflow.entities import Metric
+from mlflow.tracking import MlflowClient
+
+
+class MLflowMetricBuffer:
+    """
+    buffer for the mlflow metrics of a single run.
+
+    metrics are collected in memory and flushed as batches (mlflow log_batch) to a bounded queue,
+    which is processed by a background thread. if the queue is full, flush blocks until the thread has caught up.
+    close() (called at the end of the run or, at the latest, when the process exits) waits until all metrics are logged.
+    """
+
+    max_metrics_per_batch = 1000  # limit of mlflow log_batch
+
+    def __init__(self, run_id: str, tracking_uri: str, max_queued_batches: int = 8):
+        """
+        :param run_id:             [str] mlflow run_id that metrics are logged to
+        :param tracking_uri:       [str] mlflow tracking uri
+        :param max_queued_batches: [int] e.g. 8, maximum number of batches that wait to be logged
+        """
+        self.run_id = run_id
+        self.client = MlflowClient(tracking_uri=tracking_uri)
+        self.metrics: List[Metric] = list()
+        self.queue: queue.Queue = queue.Queue(maxsize=max_queued_batches)
+        self.exception: Optional[Exception] = None
+        self.closed = False
+
+        self.thread = threading.Thread(target=self._log_batches, daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    @classmethod
+    def for_active_run(cls, **kwargs) -> "MLflowMetricBuffer":
+        """
+        :param kwargs: [dict] w/ optional parameters, e.g. {'max_queued_batches': 8}
+        :return: metric_buffer: [MLflowMetricBuffer] for the active mlflow run
+        """
+        return cls(
+            run_id=mlflow.active_run().info.run_id,
+            tracking_uri=mlflow.get_tracking_uri(),
+            **kwargs,
+        )
+
+    def add(self, key: str, value: float, step: int = 0) -> None:
+        """
+        :param key:   [str] e.g. 'all_f1_micro'
+        :param value: [float] e.g. 0.87
+        :param step:  [int] e.g. 0
+        :return: -
+        """
+        self.metrics.append(Metric(key, float(value), int(time.time() * 1000), step))
+
+    def flush(self) -> None:
+        """
+        hand over buffered metrics to the background thread
+        ---------------------------------------------------
+        :return: -
+        """
+        for i in range(0, len(self.metrics), self.max_metrics_per_batch):
+            self.queue.put(self.metrics[i : i + self.max_metrics_per_batch])
+        self.metrics = list()
+
+    def close(self) -> None:
+        """
+        flush & wait until all metrics are logged
+        -----------------------------------------
+        :return: -
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self.flush()
+        self.queue.put(None)
+        self.thread.join()
+        atexit.unregister(self.close)
+        if self.exception is not None:
+            raise Exception(
+                f"mlflow metrics of run {self.run_id} could not be logged: {self.exception}"
+            )
+
+    ####################################################################################################################
+    # HELPER
+    ####################################################################################################################
+    def _log_batches(self):
+        """
+        background thread: log queued batches until close()
+        ----------------------------------------------------
+        :return: -
+        """
+        while True:
+            batch = self.queue.get()
+            if batch is None:
+                break
+            try:
+                self.client.log_batch(self.run_id, metrics=batch)
+            except Exception as e:
+                if self.exception is None:
+                    self.exception = e
@@ -1,18 +1,10 @@
 from dataclasses import dataclass
 from dataclasses import asdict
 
-from sklearn.metrics import accuracy_score as accuracy_sklearn
-from sklearn.metrics import precision_score as precision_sklearn
-from sklearn.metrics import recall_score as recall_sklearn
-from sklearn.metrics import precision_recall_fscore_support as prf_sklearn
-from sklearn.exceptions import UndefinedMetricWarning
+import numpy as np
 
 import warnings
 
-from seqeval.metrics import precision_score as precision_seqeval
-from seqeval.metrics import recall_score as recall_seqeval
-from seqeval.metrics import f1_score as f1_seqeval
-
 
 class NerMetrics:
     def __init__(
@@ -23,13 +15,18 @@ class NerMetrics:
         level="token",
         plain_tags=False,
         verbose=False,
+        confusion_matrix=None,
+        chunk_counts=None,
     ):
         """
-        :param true_flat: [np array] of shape [batch_size * seq_length]
-        :param pred_flat: [np array] of shape [batch_size * seq_length]
-        :param tag_list:  [optional, list] of [str] labels to take into account for metrics
-        :param level:     [optional, str] 'token' or 'chunk'
-        :param verbose:   [optional, bool] if True, show verbose output
+        :param true_flat:        [np array] of shape [batch_size * seq_length]
+        :param pred_flat:        [np array] of shape [batch_size * seq_length]
+        :param tag_list:         [optional, list] of [str] labels to take into account for metrics
+        :param level:            [optional, str] 'token' or 'chunk'
+        :param verbose:          [optional, bool] if True, show verbose output
+        :param confusion_matrix: [optional, ConfusionMatrix] of true_flat & pred_flat,
+                                                             to share it between multiple tag_lists (token level)
+        :param chunk_counts:     [optional, ChunkCounts] of true_flat & pred_flat (chunk level)
         """
         self.true_flat = true_flat
         self.pred_flat = pred_flat
@@ -40,9 +37,21 @@ class NerMetrics:
         self.results = Results()
         self.failure_value = -1
 
-        if self.level == "chunk":
-            self.true_flat_bio = convert_to_chunk(self.true_flat, to_bio=plain_tags)
-            self.pred_flat_bio = convert_to_chunk(self.pred_flat, to_bio=plain_tags)
+        if self.level == "token":
+            self.confusion_matrix = (
+                confusion_matrix
+                if confusion_matrix is not None
+                else ConfusionMatrix.from_tags(self.true_flat, self.pred_flat)
+            )
+            self.counts = self.confusion_matrix.get_counts(self.tag_list)
+        elif self.level == "chunk":
+            self.chunk_counts = (
+                chunk_counts
+                if chunk_counts is not None
+                else ChunkCounts.from_tags(
+                    self.true_flat, self.pred_flat, plain_tags=plain_tags
+                )
+            )
 
     def results_as_dict(self):
         return asdict(self.results)
@@ -69,123 +78,198 @@ class NerMetrics:
 
     def accuracy(self):
         """
-        computes accuracy of predictions (_np_logits) w.r.t. ground truth (_np_label_ids)
-        ---------------------------------------------------------------------------------
-        :return: acc [np float]
+        computes accuracy of predictions (_pred_flat) w.r.t. ground truth (_true_flat), for all labels
+        ------------------------------------------------------------------------------------------------
+        :return: acc [float]
         """
-        self.results.acc = accuracy_sklearn(
-            self.true_flat, self.pred_flat, normalize=True
+        self.results.acc = self._divide(
+            self.confusion_matrix.counts.trace(),
+            self.confusion_matrix.counts.sum(),
+            "acc",
         )
 
     def precision(self):
         """
         computes precision (macro/micro) of predictions (_pred_flat) w.r.t. ground truth (_true_flat)
         -----------------------------------------------------------------------------------------------
-        :return: precision_macro [np array] for each class, then averaged
-                 precision_micro [np array] for all examples
+        :return: precision_macro [float] for each class, then averaged
+                 precision_micro [float] for all examples
         """
         if self.level == "token":
-            try:
-                self.results.precision_macro = precision_sklearn(
-                    self.true_flat,
-                    self.pred_flat,
-                    labels=self.tag_list,
-                    average="macro",
-                )
-            except UndefinedMetricWarning as e:
-                if self.verbose:
-                    print(e)
-                self.results.precision_macro = self.failure_value
-
-            try:
-                self.results.precision_micro = precision_sklearn(
-                    self.true_flat,
-                    self.pred_flat,
-                    labels=self.tag_list,
-                    average="micro",
-                )
-            except UndefinedMetricWarning as e:
-                if self.verbose:
-                    print(e)
-                self.results.precision_macro = self.failure_value
-        else:
-            self.results.precision_micro = precision_seqeval(
-                self.true_flat_bio, self.pred_flat_bio, average="micro"
+            self.results.precision_macro = self._macro(
+                self._precision_per_label(), "precision_macro"
             )
+            self.results.precision_micro = self._precision_micro()
+        else:
+            self.results.precision_micro = self.chunk_counts.precision_micro()
 
     def recall(self):
         """
         computes recall (macro/micro) of predictions (_pred_flat) w.r.t. ground truth (_true_flat)
         -----------------------------------------------------------------------------------------------
-        :return: recall_macro [np array] for each class, then averaged
-                 recall_micro [np array] for all examples
+        :return: recall_macro [float] for each class, then averaged
+                 recall_micro [float] for all examples
         """
         if self.level == "token":
-            try:
-                self.results.recall_macro = recall_sklearn(
-                    self.true_flat,
-                    self.pred_flat,
-                    labels=self.tag_list,
-                    average="macro",
-                )
-            except UndefinedMetricWarning as e:
-                if self.verbose:
-                    print(e)
-                self.results.precision_macro = self.failure_value
-
-            try:
-                self.results.recall_micro = recall_sklearn(
-                    self.true_flat,
-                    self.pred_flat,
-                    labels=self.tag_list,
-                    average="micro",
-                )
-            except UndefinedMetricWarning as e:
-                if self.verbose:
-                    print(e)
-                self.results.precision_macro = self.failure_value
-        else:
-            self.results.recall_micro = recall_seqeval(
-                self.true_flat_bio, self.pred_flat_bio, average="micro"
+            self.results.recall_macro = self._macro(
+                self._recall_per_label(), "recall_macro"
             )
+            self.results.recall_micro = self._recall_micro()
+        else:
+            self.results.recall_micro = self.chunk_counts.recall_micro()
 
     def f1_score(self):
         """
         computes f1 score (macro/micro) of predictions (_pred_flat) w.r.t. ground truth (_true_flat)
         -----------------------------------------------------------------------------------------------
-        :return: f1_score_macro [np array] for each class, then averaged
-                 f1_score_micro [np array] for all examples
+        :return: f1_score_macro [float] for each class, then averaged
+                 f1_score_micro [float] for all examples
         """
         if self.level == "token":
-            try:
-                _, _, self.results.f1_macro, _ = prf_sklearn(
-                    self.true_flat,
-                    self.pred_flat,
-                    labels=self.tag_list,
-                    average="macro",
-                    warn_for=("precision", "recall", "f-score"),
-                )
-            except UndefinedMetricWarning as e:
-                if self.verbose:
-                    print(e)
-                self.results.precision_macro = self.failure_value
-
-            try:
-                _, _, self.results.f1_micro, _ = prf_sklearn(
-                    self.true_flat,
-                    self.pred_flat,
-                    labels=self.tag_list,
-                    average="micro",
-                    warn_for=("precision", "recall", "f-score"),
+            f1_per_label = [
+                self._f1(precision, recall)
+                for precision, recall in zip(
+                    self._precision_per_label(), self._recall_per_label()
                 )
-            except UndefinedMetricWarning as e:
-                if self.verbose:
-                    print(e)
-                self.results.precision_macro = self.failure_value
-        else:
-            self.results.f1_micro = f1_seqeval(
-                self.true_flat_bio, self.pred_flat_bio, average="micro"
+            ]
+            self.results.f1_macro = self._macro(f1_per_label, "f1_macro")
+            self.results.f1_micro = self._f1(
+                self._precision_micro(), self._recall_micro()
             )
+        else:
+            self.results.f1_micro = self.chunk_counts.f1_micro()
+
+    ####################################################################################################################
+    # HELPER: TOKEN LEVEL
+    ####################################################################################################################
+    def _precision_per_label(self):
+        return [
+            self._divide(tp, pred, "precision")
+            for tp, pred in zip(self.counts["tp"], self.counts["pred"])
+        ]
+
+    def _recall_per_label(self):
+        return [
+            self._divide(tp, true, "recall")
+            for tp, true in zip(self.counts["tp"], self.counts["true"])
+        ]
+
+    def _precision_micro(self):
+        return self._divide(
+            self.counts["tp"].sum(), self.counts["pred"].sum(), "precision_micro"
+        )
+
+    def _recall_micro(self):
+        return self._divide(
+            self.counts["tp"].sum(), self.counts["true"].sum(), "recall_micro"
+        )
+
+    def _f1(self, precision, recall):
+        """
+        :param precision: [float]
+        :param recall:    [float]
+        :return: f1 [float] harmonic mean of precision & recall, failure_value if one of them is ill-defined
+        """
+        if precision == self.failure_value or recall == self.failure_value:
+            return self.failure_value
+        elif precision + recall == 0:
+            return 0.0
+        else:
+            return 2 * precision * recall / (precision + recall)
+
+    def _macro(self, values, metric):
+        """
+        :param values: [list] of [float] metric for each label
+        :param metric: [str] e.g. 'precision_macro'
+        :return: macro [float] average of values, failure_value if one of them is ill-defined
+        """
+        if len(values) == 0 or self.failure_value in values:
+            if self.verbose:
+                print(f"{metric} is ill-defined for tag_list = {self.tag_list}")
+            return self.failure_value
+        return float(np.mean(values))
+
+    def _divide(self, numerator, denominator, metric):
+        """
+        :param numerator:   [int]
+        :param denominator: [int]
+        :param metric:      [str] e.g. 'precision'
+        :return: ratio [float], failure_value if denominator is zero (ill-defined)
+        """
+        if denominator == 0:
+            if self.verbose:
+                print(f"{metric} is ill-defined for tag_list = {self.tag_list}")
+            return self.failure_value
+        return float(numerator / denominator)
+
+
+class ConfusionMatrix:
+    """
+    token-level confusion matrix (rows = true labels, columns = predicted labels).
+
+    it is computed once per epoch, all token-level metrics of all tag subsets are derived from its counts.
+    """
+
+    def __init__(self, labels, counts):
+        """
+        :param labels: [list] of [str] labels, e.g. ['A', 'B', 'O']
+        :param counts: [np array] of shape [len(labels), len(labels)] w/ [int] counts
+        """
+        self.labels = list(labels)
+        self.counts = counts
+        self.index = {label: i for i, label in enumerate(self.labels)}
+
+    @classmethod
+    def from_tags(cls, true_flat, pred_flat):
+        """
+        :param true_flat: [np array] of shape [batch_size * seq_length] w/ [str] tags
+        :param pred_flat: [np array] of shape [batch_size * seq_length] w/ [str] tags
+        :return: confusion_matrix: [ConfusionMatrix] w/ labels = all labels that occur in true_flat or pred_flat
+        """
+        true_flat, pred_flat = np.asarray(true_flat), np.asarray(pred_flat)
+        labels, label_ids = np.unique(
+            np.concatenate([true_flat, pred_flat]), return_inverse=True
+        )
+        return cls.from_ids(
+            label_ids[: len(true_flat)], label_ids[len(true_flat) :], labels
+        )
+
+    @classmethod
+    def from_ids(cls, true_ids, pred_ids, labels):
+        """
+        :param true_ids: [np array] of shape [batch_size * seq_length] w/ [int] label ids
+        :param pred_ids: [np array] of shape [batch_size * seq_length] w/ [int] label ids
+        :param labels:   [list] of [str] labels, e.g. ['A', 'B', 'O'], label id = position in list
+        :return: confusion_matrix: [ConfusionMatrix]
+        """
+        nr_labels = len(labels)
+        counts = np.bincount(
+            np.asarray(true_ids, dtype=np.int64) * nr_labels
+            + np.asarray(pred_ids, dtype=np.int64),
+            minlength=nr_labels * nr_labels,
+        ).reshape(nr_labels, nr_labels)
+        return cls(labels, counts)
+
+    def get_counts(self, tag_list=None):
+        """
+        :param tag_list: [optional, list] of [str] labels, None = all labels that occur in true or pred
+        :return: counts: [dict] w/ keys 'tp', 'pred', 'true' & values = [np array] of shape [len(tag_list)]
+                                w/ true positives, predictions & true occurrences for each label in tag_list
+        """
+        counts = {
+            "tp": np.diag(self.counts),
+            "pred": self.counts.sum(axis=0),
+            "true": self.counts.sum(axis=1),
+        }
+        if tag_list is None:
+            occurring = (counts["pred"] + counts["true"]) > 0
+            return {key: value[occurring] for key, value in counts.items()}
+
+        indices = [self.index.get(tag) for tag in tag_list]
+        return {
+            key: np.array([value[i] if i is not None else 0 for i in indices])
+            for key, value in counts.items()
+        }
 
 
 @dataclass
@@ -199,58 +283,198 @@ class Results:
     f1_macro: float = -1
 
 
-def convert_to_chunk(tag_list, to_bio=True):
+class ChunkCounts:
     """
-    - get rid of special tokens
-    - add bio prefixed to tags
-    ---------------------------
-    :param tag_list:      [list] of [str], e.g. ['O',   'ORG',   'ORG']
-    :param to_bio:        [bool] whether to cast to bio labels
-    :return: bio_tag_list [list] of [str], e.g. ['O', 'B-ORG', 'I-ORG']
+    chunk-level counts (true positives, predictions, true occurrences) for each chunk type.
+
+    chunks (start, end, type) are extracted from flat tag id sequences with numpy and matched via set intersection.
+    special tokens (e.g. '[CLS]') count as 'O'. for plain tags, a chunk is a maximal sequence of equal tags,
+    for bio tags, a chunk starts with a 'B-' tag or an 'I-' tag whose type differs from the previous tag (seqeval).
     """
-    if to_bio:
-        return add_bio_to_tag_list(get_rid_of_special_tokens(tag_list))
-    else:
-        return get_rid_of_special_tokens(tag_list)
 
+    def __init__(self, types, tp, pred, true):
+        """
+        :param types: [list] of [str] chunk types, e.g. ['LOC', 'PER']
+        :param tp:    [np array] of shape [len(types)] w/ [int] number of correctly predicted chunks
+        :param pred:  [np array] of shape [len(types)] w/ [int] number of predicted chunks
+        :param true:  [np array] of shape [len(types)] w/ [int] number of true chunks
+        """
+        self.types = list(types)
+        self.tp = tp
+        self.pred = pred
+        self.true = true
+
+    @classmethod
+    def from_tags(cls, true_flat, pred_flat, plain_tags=False):
+        """
+        :param true_flat:  [np array] of shape [batch_size * seq_length] w/ [str] tags
+        :param pred_flat:  [np array] of shape [batch_size * seq_length] w/ [str] tags
+        :param plain_tags: [bool] True if tags are plain (e.g. 'PER'), False if they are bio (e.g. 'B-PER')
+        :return: chunk_counts: [ChunkCounts]
+        """
+        true_flat, pred_flat = np.asarray(true_flat), np.asarray(pred_flat)
+        tag_list, tag_ids = np.unique(
+            np.concatenate([true_flat, pred_flat]), return_inverse=True
+        )
+        return cls.from_ids(
+            tag_ids[: len(true_flat)],
+            tag_ids[len(true_flat) :],
+            list(tag_list),
+            plain_tags=plain_tags,
+        )
 
-def add_bio_to_tag_list(tag_list):
-    """
-    adds bio prefixes to tags
-    ---------------------------
-    :param tag_list:      [list] of [str], e.g. ['O',   'ORG',   'ORG']
-    :return: bio_tag_list [list] of [str], e.g. ['O', 'B-ORG', 'I-ORG']
-    """
-    return [
-        _add_bio_to_tag(tag_list[i], previous=tag_list[i - 1] if i > 0 else None)
-        for i in range(len(tag_list))
-    ]
+    @classmethod
+    def from_ids(cls, true_ids, pred_ids, tag_list, plain_tags=False):
+        """
+        :param true_ids:   [np array] of shape [batch_size * seq_length] w/ [int] tag ids
+        :param pred_ids:   [np array] of shape [batch_size * seq_length] w/ [int] tag ids
+        :param tag_list:   [list] of [str] tags, e.g. ['[PAD]', 'O', 'PER'], tag id = position in list
+        :param plain_tags: [bool] True if tags are plain (e.g. 'PER'), False if they are bio (e.g. 'B-PER')
+        :return: chunk_counts: [ChunkCounts]
+        """
+        types, type_table, begin_table = get_chunk_type_tables(tag_list, plain_tags)
+        nr_types = len(types) + 1  # incl. 'O' (= 0)
 
+        chunk_keys = dict()
+        chunk_types = dict()
+        for field, tag_ids in zip(["true", "pred"], [true_ids, pred_ids]):
+            starts, ends, chunk_types[field] = get_chunks(
+                np.asarray(tag_ids, dtype=np.int64), type_table, begin_table
+            )
+            chunk_keys[field] = (
+                starts * (len(true_ids) + 1) + ends
+            ) * nr_types + chunk_types[field]
 
-def _add_bio_to_tag(tag, previous):
+        _, index_true, _ = np.intersect1d(
+            chunk_keys["true"], chunk_keys["pred"], return_indices=True
+        )
+        tp = np.bincount(chunk_types["true"][index_true], minlength=nr_types)
+        pred = np.bincount(chunk_types["pred"], minlength=nr_types)
+        true = np.bincount(chunk_types["true"], minlength=nr_types)
+        return cls(types, tp[1:], pred[1:], true[1:])
+
+    ####################################################################################################################
+    # METRICS
+    ####################################################################################################################
+    def precision_micro(self):
+        return self._divide(self.tp.sum(), self.pred.sum())
+
+    def recall_micro(self):
+        return self._divide(self.tp.sum(), self.true.sum())
+
+    def f1_micro(self):
+        return self._f1(self.precision_micro(), self.recall_micro())
+
+    def classification_report(self, digits=2):
+        """
+        :param digits: [int] number of digits of precision, recall & f1-score
+        :return: report: [str] w/ precision, recall, f1-score & support for each chunk type that occurs in true
+        """
+        headers = ["precision", "recall", "f1-score", "support"]
+        width = max([len(_type) for _type in self.types] + [len("weighted avg")])
+        head_fmt = "{:>{width}s} " + " {:>9}" * len(headers)
+        row_fmt = "{:>{width}s} " + " {:>9.{digits}f}" * 3 + " {:>9}\n"
+
+        report = head_fmt.format("", *headers, width=width) + "\n\n"
+        rows = list()
+        for i, _type in enumerate(self.types):
+            if self.true[i] > 0:
+                precision = self._divide(self.tp[i], self.pred[i])
+                recall = self._divide(self.tp[i], self.true[i])
+                rows.append(
+                    (precision, recall, self._f1(precision, recall), self.true[i])
+                )
+                report += row_fmt.format(_type, *rows[-1], width=width, digits=digits)
+        report += "\n"
+
+        support = int(self.true.sum())
+        averages = {
+            "micro avg": (self.precision_micro(), self.recall_micro(), self.f1_micro()),
+            "macro avg": tuple(np.mean([row[:3] for row in rows], axis=0))
+            if len(rows)
+            else (0.0, 0.0, 0.0),
+            "weighted avg": tuple(
+                np.average(
+                    [row[:3] for row in rows],
+                    weights=[row[3] for row in rows],
+                    axis=0,
+                )
+            )
+            if len(rows)
+            else (0.0, 0.0, 0.0),
+        }
+        for heading, average in averages.items():
+            report += row_fmt.format(
+                heading, *average, support, width=width, digits=digits
+            )
+        return report
+
+    ####################################################################################################################
+    # HELPER
+    ####################################################################################################################
+    @staticmethod
+    def _divide(numerator, denominator):
+        """
+        :return: ratio [float], 0 if denominator is zero (seqeval convention)
+        """
+        return float(numerator / denominator) if denominator > 0 else 0.0
+
+    @staticmethod
+    def _f1(precision, recall):
+        return (
+            2 * precision * recall / (precision + recall)
+            if precision + recall > 0
+            else 0.0
+        )
+
+
+def get_chunk_type_tables(tag_list, plain_tags):
     """
-    add bio prefix to tag, depending on previous tag
-    ------------------------------------------------
-    :param tag:       [str], e.g. 'ORG'
-    :param previous:  [str], e.g. 'ORG'
-    :return: bio_tag: [str], e.g. 'I-ORG'
+    get lookup tables from tag id to chunk type id & to whether the tag begins a chunk
+    ----------------------------------------------------------------------------------
+    :param tag_list:   [list] of [str] tags, e.g. ['[PAD]', 'O', 'B-PER', 'I-PER']
+    :param plain_tags: [bool] True if tags are plain (e.g. 'PER'), False if they are bio (e.g. 'B-PER')
+    :return: types:       [list] of [str] chunk types, e.g. ['PER']
+             type_table:  [np array] of shape [len(tag_list)] w/ chunk type id, e.g. [0, 0, 1, 1] (0 = 'O')
+             begin_table: [np array] of shape [len(tag_list)] w/ [bool], e.g. [False, False, True, False]
     """
-    if tag == "O" or tag.startswith("["):
-        return tag
-    elif previous is None:
-        return f"B-{tag}"
-    elif tag != previous:
-        return f"B-{tag}"
-    else:
-        return f"I-{tag}"
+    tag_types = list()
+    for tag in tag_list:
+        if tag == "O" or tag.startswith("["):
+            tag_types.append(None)
+        elif plain_tags or not tag[:2] in ["B-", "I-"]:
+            tag_types.append(tag)
+        else:
+            tag_types.append(tag[2:])
+
+    types = sorted(set(tag_type for tag_type in tag_types if tag_type is not None))
+    type_ids = {_type: i + 1 for i, _type in enumerate(types)}
+    type_table = np.array(
+        [type_ids.get(tag_type, 0) for tag_type in tag_types], dtype=np.int64
+    )
+    begin_table = np.array(
+        [not plain_tags and tag.startswith("B-") for tag in tag_list], dtype=bool
+    )
+    return types, type_table, begin_table
 
 
-def get_rid_of_special_tokens(tag_list):
+def get_chunks(tag_ids, type_table, begin_table):
     """
-    replace special tokens ('[CLS]', '[SEP]', '[PAD]') by 'O'
-    ---------------------------------------------------------
-    :param tag_list:           [list] of [str], e.g. ['[CLS]', 'O', 'ORG', 'ORG', '[SEP]']
-    :return: cleaned_tag_list: [list] of [str], e.g. [    'O', 'O', 'ORG', 'ORG',     'O']
+    extract chunks from flat tag id sequence
+    ----------------------------------------
+    :param tag_ids:     [np array] of shape [seq_length] w/ [int] tag ids
+    :param type_table:  [np array] w/ chunk type id for each tag id (0 = 'O'), see get_chunk_type_tables()
+    :param begin_table: [np array] w/ [bool] for each tag id, see get_chunk_type_tables()
+    :return: starts: [np array] of shape [nr_chunks] w/ [int] index of first token of chunk
+             ends:   [np array] of shape [nr_chunks] w/ [int] index of last token of chunk + 1
+             types:  [np array] of shape [nr_chunks] w/ [int] chunk type id
     """
+    types = type_table[tag_ids]
+    types_previous = np.concatenate([[0], types[:-1]])
+    is_start = (types > 0) & (begin_table[tag_ids] | (types != types_previous))
+    starts = np.flatnonzero(is_start)
 
-    return [tag if not tag.startswith("[") else "O" for tag in tag_list]
+    # a chunk ends before the next start or 'O'
+    boundaries = np.flatnonzero(np.concatenate([is_start | (types == 0), [True]]))
+    ends = boundaries[np.searchsorted(boundaries, starts, side="right")]
+    return starts, ends, types[starts]
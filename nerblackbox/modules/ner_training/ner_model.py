@@ -1,6 +1,7 @@
 import warnings
+import contextlib
 import numpy as np
-from seqeval.metrics import classification_report as classification_report_seqeval
+import torch
 from sklearn.metrics import classification_report as classification_report_sklearn
 import pytorch_lightning as pl
 from abc import ABC, abstractmethod
@@ -10,13 +11,14 @@ from transformers import get_linear_schedule_with_warmup
 from transformers import get_constant_schedule_with_warmup
 from transformers import get_cosine_schedule_with_warmup
 from transformers import get_cosine_with_hard_restarts_schedule_with_warmup
-from transformers import AutoTokenizer
 
 from nerblackbox.modules.ner_training.data_preprocessing.data_preprocessor import (
     DataPreprocessor,
 )
+from nerblackbox.modules.ner_training.pretrained_cache import PretrainedCache
 from nerblackbox.modules.ner_training.metrics.ner_metrics import NerMetrics
-from nerblackbox.modules.ner_training.metrics.ner_metrics import convert_to_chunk
+from nerblackbox.modules.ner_training.metrics.ner_metrics import ConfusionMatrix
+from nerblackbox.modules.ner_training.metrics.ner_metrics import ChunkCounts
 from nerblackbox.modules.utils.util_functions import split_parameters
 from nerblackbox.modules.utils.env_variable import env_variable
 
@@ -34,6 +36,11 @@ class NerModel(pl.LightningModule, ABC):
             hparams
         )
 
+        # mixed precision on cpu (on gpu: fp16 via pytorch lightning)
+        self.bf16 = False
+        if vars(self.params).get("fp16") and vars(self.params).get("device") == "cpu":
+            self.set_bf16(True)
+
         # preparations
         self._preparations()
 
@@ -69,9 +76,7 @@ class NerModel(pl.LightningModule, ABC):
         :return: -
         """
         # tokenizer
-        self.tokenizer = AutoTokenizer.from_pretrained(
-            self.pretrained_model_name, do_lower_case=False
-        )  # needs to be False !!
+        self.tokenizer = PretrainedCache.get_tokenizer(self.pretrained_model_name)
 
         self.data_preprocessor = DataPreprocessor(
             tokenizer=self.tokenizer,
@@ -101,12 +106,14 @@ class NerModel(pl.LightningModule, ABC):
                                        on non-padding tokens (i.e. where elements in _input_ids are not 0)
                     ii) _tag_ids_prediction_logits: [torch tensor] of shape [batch_size, seq_length, vocabulary_size]
         """
-        return self.model(
-            _input_ids,
-            attention_mask=_attention_mask,
-            token_type_ids=_segment_ids,
-            labels=_tag_ids,
-        )
+        with self._autocast():
+            _outputs = self.model(
+                _input_ids,
+                attention_mask=_attention_mask,
+                token_type_ids=_segment_ids,
+                labels=_tag_ids,
+            )
+        return (_outputs[0].float(),) + tuple(_outputs[1:])  # loss in fp32 for logging
 
     ####################################################################################################################
     # TRAIN
@@ -139,6 +146,7 @@ class NerModel(pl.LightningModule, ABC):
     def optimizer_step(
         self, current_epoch, batch_nb, optimizer, optimizer_i, second_order_closure=None
     ):
+        # called by pytorch lightning every accumulate_grad_batches batches
         # update params
         optimizer.step()
         optimizer.zero_grad()
@@ -161,16 +169,26 @@ class NerModel(pl.LightningModule, ABC):
                 "val", batch, outputs, input_ids, attention_mask, segment_ids, tag_ids
             )
 
-        return batch_loss, tag_ids, logits
+        return batch_loss, tag_ids, torch.argmax(logits, dim=2)  # on device
 
     def validation_epoch_end(self, outputs):
         """
-        :param outputs: [list] of [list] w/ 3 elements [batch_loss, batch_tag_ids, batch_logits] for each batch
+        :param outputs: [list] of [list] w/ 3 elements [batch_loss, batch_tag_ids, batch_pred_ids] for each batch
         :return:        [dict] w/ key 'val_loss' & value = mean batch loss of val dataset [float]
         """
         # OPTIONAL
         return self._validate_on_epoch("val", outputs=outputs)
 
+    def on_train_end(self):
+        """
+        report the last val epoch (stopped or max_epochs - 1) if it was skipped (see setting report_epochs)
+        ---------------------------------------------------------------------------------------------------
+        :return: -
+        """
+        if self.val_epoch_unreported is not None:
+            self._report_epoch("val", *self.val_epoch_unreported)
+            self.val_epoch_unreported = None
+
     ####################################################################################################################
     # TEST
     ####################################################################################################################
@@ -186,11 +204,11 @@ class NerModel(pl.LightningModule, ABC):
                 "test", batch, outputs, input_ids, attention_mask, segment_ids, tag_ids
             )
 
-        return batch_loss, tag_ids, logits
+        return batch_loss, tag_ids, torch.argmax(logits, dim=2)  # on device
 
     def test_epoch_end(self, outputs):
         """
-        :param outputs: [list] of [list] w/ 3 elements [batch_loss, batch_tag_ids, batch_logits] for each batch
+        :param outputs: [list] of [list] w/ 3 elements [batch_loss, batch_tag_ids, batch_pred_ids] for each batch
         :return:        [dict] w/ key 'test_loss' & value = mean batch loss of test dataset [float]
         """
         # OPTIONAL
@@ -221,6 +239,28 @@ class NerModel(pl.LightningModule, ABC):
     ####################################################################################################################
     # 1. PREPARATIONS
     ####################################################################################################################
+    def set_bf16(self, bf16: bool = True) -> None:
+        """
+        use bfloat16 autocast (mixed precision) for forward passes on cpu, falls back to fp32 if not supported by torch
+        ---------------------------------------------------------------------------------------------------------------
+        :param bf16: [bool]
+        :return: -
+        """
+        if bf16 and not hasattr(torch, "autocast"):
+            warnings.warn(
+                f"bfloat16 autocast on cpu needs torch >= 1.10 (found {torch.__version__}), fall back to fp32."
+            )
+            bf16 = False
+        self.bf16 = bf16
+
+    def _autocast(self):
+        """
+        :return: context manager: [torch.autocast] on cpu w/ bfloat16 if self.bf16, else no-op
+        """
+        if self.bf16:
+            return torch.autocast("cpu", dtype=torch.bfloat16)
+        return contextlib.ExitStack()
+
     def _create_optimizer(
         self, learning_rate, fp16=True, no_decay=("bias", "gamma", "beta")
     ):
@@ -235,6 +275,8 @@ class NerModel(pl.LightningModule, ABC):
         # Remove unused pooler that otherwise break Apex
         param_optimizer = list(self.model.named_parameters())
         param_optimizer = [n for n in param_optimizer if "pooler" not in n[0]]
+        # Remove frozen parameters (no optimizer state)
+        param_optimizer = [n for n in param_optimizer if n[1].requires_grad]
         optimizer_grouped_parameters = [
             {
                 "params": [
@@ -329,12 +371,16 @@ class NerModel(pl.LightningModule, ABC):
     def _get_steps(self, _num_epochs):
         """
         helper method for _create_scheduler
-        gets steps = num_epochs * (number of training data samples)
-        -----------------------------------------------------------------
+        gets steps = num_epochs * (number of optimizer steps per epoch)
+        with (number of optimizer steps per epoch) = (number of training batches) // accumulate_grad_batches
+        (gradients of an incomplete accumulation at the end of an epoch are discarded by pytorch lightning)
+        ---------------------------------------------------------------------------------------------------
         :param _num_epochs: [int], e.g. 10
-        :return: steps:     [int], e.g. 2500 (in case of 250 training data samples)
+        :return: steps:     [int], e.g. 2500 (in case of 250 training batches & accumulate_grad_batches = 1)
         """
-        return _num_epochs * len(self.dataloader["train"])
+        return _num_epochs * (
+            len(self.dataloader["train"]) // self._hparams.accumulate_grad_batches
+        )
 
     ####################################################################################################################
     # 2. VALIDATE / COMPUTE METRICS
@@ -344,7 +390,7 @@ class NerModel(pl.LightningModule, ABC):
         validate on all batches of one epoch, i.e. whole val or test dataset
         --------------------------------------------------------------------
         :param phase:   [str], 'val', 'test'
-        :param outputs: [list] of [list] w/ 3 elements [batch_loss, batch_tag_ids, batch_logits] for each batch
+        :param outputs: [list] of [list] w/ 3 elements [batch_loss, batch_tag_ids, batch_pred_ids] for each batch
         :return: [dict] w/ key '<phase>_loss' & value = mean batch loss [float]
         """
         # to cpu/numpy
@@ -353,9 +399,9 @@ class NerModel(pl.LightningModule, ABC):
             "tag_ids": [
                 output[1].detach().cpu().numpy() for output in outputs
             ],  # [batch_size, seq_length]
-            "logits": [
+            "pred_ids": [
                 output[2].detach().cpu().numpy() for output in outputs
-            ],  # [batch_size, seq_length, num_tags]
+            ],  # [batch_size, seq_length]
         }
 
         # combine np_batch metrics to np_epoch metrics
@@ -364,21 +410,20 @@ class NerModel(pl.LightningModule, ABC):
             "tag_ids": np.concatenate(
                 np_batch["tag_ids"]
             ),  # shape: [epoch_size, seq_length]
-            "logits": np.concatenate(
-                np_batch["logits"]
-            ),  # shape: [epoch_size, seq_length, num_tags]
+            "pred_ids": np.concatenate(
+                np_batch["pred_ids"]
+            ),  # shape: [epoch_size, seq_length]
         }
 
         # epoch metrics
-        epoch_metrics, epoch_tags = self.compute_metrics(phase, np_epoch)
+        epoch_metrics, epoch_tag_ids, epoch_chunk_counts = self.compute_metrics(
+            phase, np_epoch
+        )
 
-        # tracked metrics & classification reports
+        # tracked metrics
         self.add_epoch_metrics(
             phase, self.current_epoch, epoch_metrics
         )  # attr: epoch_metrics
-        self.get_classification_report(
-            phase, self.current_epoch, epoch_tags
-        )  # attr: classification_reports
 
         # logging: tb
         self.write_metrics_for_tensorboard(phase, epoch_metrics)
@@ -386,20 +431,34 @@ class NerModel(pl.LightningModule, ABC):
         # logging: mlflow
         if phase == "val":
             self.mlflow_client.log_metrics(self.current_epoch, epoch_metrics)
-        self.mlflow_client.log_classification_report(
-            self.classification_reports[phase][self.current_epoch],
-            overwrite=(phase == "val" and self.current_epoch == 0),
-        )
-        self.mlflow_client.finish_artifact_mlflow()
+
+        # classification reports & tag dumps (see setting report_epochs)
+        epoch_results = {f"{phase}_loss": np_epoch["loss"]}
+        if phase == "val" and self.current_epoch == 0:
+            self.mlflow_client.clear_classification_report()
+        if self.is_report_epoch(phase, self.current_epoch, epoch_results):
+            self._report_epoch(
+                phase, self.current_epoch, epoch_tag_ids, epoch_chunk_counts
+            )
+            if phase == "val":
+                self.val_epoch_unreported = None
+        elif phase == "val":
+            self.val_epoch_unreported = (
+                self.current_epoch,
+                epoch_tag_ids,
+                epoch_chunk_counts,
+            )  # last val epoch is reported in any case, see on_train_end()
 
         # print
         self._print_metrics(
-            phase, epoch_metrics, self.classification_reports[phase][self.current_epoch]
+            phase,
+            epoch_metrics,
+            self.classification_reports[phase].get(self.current_epoch),
         )
 
         self.default_logger.log_debug(f"--> {phase}: epoch done")
 
-        return {f"{phase}_loss": np_epoch["loss"]}
+        return epoch_results
 
     def compute_metrics(self, phase, _np_dict):
         """
@@ -409,35 +468,37 @@ class NerModel(pl.LightningModule, ABC):
         :param _np_dict:       [dict] w/ key-value pairs:
                                      'loss':     [np value]
                                      'tag_ids':  [np array] of shape [batch_size, seq_length]
-                                     'logits'    [np array] of shape [batch_size, seq_length, num_tags]
+                                     'pred_ids': [np array] of shape [batch_size, seq_length]
         :return: metrics       [dict] w/ keys 'all+_loss', 'all+_acc', 'fil_f1_micro', .. & values = [np array]
-                 tags          [dict] w/ keys 'true', 'pred'      & values = [np array]
+                 tag_ids       [dict] w/ keys 'true', 'pred'      & values = [np array] w/o [PAD] occurrences
+                 chunk_counts  [ChunkCounts]
         """
         # batch / dataset
         tag_ids = dict()
-        tag_ids["true"], tag_ids["pred"] = self._reduce_and_flatten(
-            _np_dict["tag_ids"], _np_dict["logits"]
+        tag_ids["true"], tag_ids["pred"] = self._flatten(
+            _np_dict["tag_ids"], _np_dict["pred_ids"]
         )
 
-        tags = {
-            field: self._convert_tag_ids_to_tags(tag_ids[field])
-            for field in ["true", "pred"]
-        }
-        tags = self._get_rid_of_pad_tag_occurrences(tags)
+        tag_ids = self._get_rid_of_pad_tag_occurrences(tag_ids)
 
         self.default_logger.log_debug("phase:", phase)
         self.default_logger.log_debug(
-            "true:", np.shape(tags["true"]), list(set(tags["true"]))
+            "true:", np.shape(tag_ids["true"]), np.unique(tag_ids["true"]).tolist()
         )
         self.default_logger.log_debug(
-            "pred:", np.shape(tags["pred"]), list(set(tags["pred"]))
+            "pred:", np.shape(tag_ids["pred"]), np.unique(tag_ids["pred"]).tolist()
         )
 
-        if phase == "val":
-            for field in ["true", "pred"]:
-                np.save(f'{env_variable("DIR_RESULTS")}/{field}.npy', tags[field])
-
         # batch / dataset metrics
+        confusion_matrix = ConfusionMatrix.from_ids(
+            tag_ids["true"], tag_ids["pred"], self.tag_list
+        )  # shared by all token-level metrics
+        chunk_counts = ChunkCounts.from_ids(
+            tag_ids["true"],
+            tag_ids["pred"],
+            self.tag_list,
+            plain_tags=self.params.dataset_tags == "plain",
+        )  # chunk-level metrics & classification report
         metrics = {"all+_loss": _np_dict["loss"]}
         for tag_subset in [
             "all+",
@@ -447,25 +508,29 @@ class NerModel(pl.LightningModule, ABC):
         ] + self.tag_list:  # self._get_filtered_tags():
             metrics.update(
                 self._compute_metrics_for_tags_subset(
-                    tags, phase, tag_subset=tag_subset
+                    tag_ids,
+                    phase,
+                    tag_subset=tag_subset,
+                    confusion_matrix=confusion_matrix,
+                    chunk_counts=chunk_counts,
                 )
             )
 
-        return metrics, tags
+        return metrics, tag_ids, chunk_counts
 
     @staticmethod
-    def _reduce_and_flatten(_np_tag_ids, _np_logits):
+    def _flatten(_np_tag_ids, _np_pred_ids):
         """
         helper method
-        reduce _np_logits (3D -> 2D), flatten both np arrays (2D -> 1D)
-        ---------------------------------------------------------------
-        :param _np_tag_ids: [np array] of shape [batch_size, seq_length]
-        :param _np_logits:  [np array] of shape [batch_size, seq_length, num_tags]
-        :return: true_flat: [np array] of shape [batch_size * seq_length], _np_tag_ids               flattened
-                 pred_flat: [np array] of shape [batch_size * seq_length], _np_logits    reduced and flattened
+        flatten both np arrays (2D -> 1D)
+        ---------------------------------
+        :param _np_tag_ids:  [np array] of shape [batch_size, seq_length]
+        :param _np_pred_ids: [np array] of shape [batch_size, seq_length], argmax of logits
+        :return: true_flat:  [np array] of shape [batch_size * seq_length], _np_tag_ids  flattened
+                 pred_flat:  [np array] of shape [batch_size * seq_length], _np_pred_ids flattened
         """
         true_flat = _np_tag_ids.flatten()
-        pred_flat = np.argmax(_np_logits, axis=2).flatten()
+        pred_flat = _np_pred_ids.flatten()
         return true_flat, pred_flat
 
     def _convert_tag_ids_to_tags(self, _tag_ids):
@@ -476,29 +541,39 @@ class NerModel(pl.LightningModule, ABC):
         :param _tag_ids: [np array] of shape [batch_size * seq_length] with [int] elements
         :return: _tags:  [np array] of shape [batch_size * seq_length] with [str] elements
         """
-        return np.array([self.tag_list[elem] for elem in _tag_ids])
+        return np.array(self.tag_list)[_tag_ids]
 
-    @staticmethod
-    def _get_rid_of_pad_tag_occurrences(_tags):
+    def _get_rid_of_pad_tag_occurrences(self, _tag_ids):
         """
         get rid of all elements where '[PAD]' occurs in true array
         ----------------------------------------------------------
-        :param _tags:      [dict] w/ keys = 'true', 'pred' and
-                                     values = [np array] of shape [batch_size * seq_length]
-        :return: _tags_new [dict] w/ keys = 'true', 'pred' and
-                                     values = [np array] of shape [batch_size * seq_length - # of pad occurrences]
+        :param _tag_ids:      [dict] w/ keys = 'true', 'pred' and
+                                        values = [np array] of shape [batch_size * seq_length] w/ [int] elements
+        :return: _tag_ids_new [dict] w/ keys = 'true', 'pred' and
+                                        values = [np array] of shape [batch_size * seq_length - # of pad occurrences]
         """
-        pad_indices = np.where(_tags["true"] == "[PAD]")
-        return {key: np.delete(_tags[key], pad_indices) for key in ["true", "pred"]}
+        if "[PAD]" not in self.tag_list:
+            return _tag_ids
+        mask = _tag_ids["true"] != self.tag_list.index("[PAD]")
+        return {key: _tag_ids[key][mask] for key in ["true", "pred"]}
 
-    def _compute_metrics_for_tags_subset(self, _tags, _phase, tag_subset: str):
+    def _compute_metrics_for_tags_subset(
+        self,
+        _tag_ids,
+        _phase,
+        tag_subset: str,
+        confusion_matrix=None,
+        chunk_counts=None,
+    ):
         """
         helper method
         compute metrics for tags subset (e.g. 'all', 'fil')
         ---------------------------------------------------
-        :param _tags:      [dict] w/ keys 'true', 'pred'      & values = [np array]
-        :param _phase:     [str], 'train', 'val'
-        :param tag_subset: [str], e.g. 'all+', 'all', 'fil', 'PER'
+        :param _tag_ids:         [dict] w/ keys 'true', 'pred'      & values = [np array]
+        :param _phase:           [str], 'train', 'val'
+        :param tag_subset:       [str], e.g. 'all+', 'all', 'fil', 'PER'
+        :param confusion_matrix: [optional, ConfusionMatrix] of _tag_ids, shared by all tag subsets
+        :param chunk_counts:     [optional, ChunkCounts] of _tag_ids
         :return: _metrics  [dict] w/ keys = metric (e.g. 'all_precision_micro') and value = [float]
         """
         tag_list = self._get_filtered_tags(tag_subset)
@@ -512,11 +587,13 @@ class NerModel(pl.LightningModule, ABC):
             level = "token"
 
         ner_metrics = NerMetrics(
-            _tags["true"],
-            _tags["pred"],
+            _tag_ids["true"],
+            _tag_ids["pred"],
             tag_list=tag_list,
             level=level,
             plain_tags=self.params.dataset_tags == "plain",
+            confusion_matrix=confusion_matrix,
+            chunk_counts=chunk_counts,
         )
         ner_metrics.compute(
             self.logged_metrics.get_metrics(tag_group=tag_group, phase_group=[_phase])
@@ -592,12 +669,75 @@ class NerModel(pl.LightningModule, ABC):
         """
         self.epoch_metrics[phase][epoch] = _epoch_metrics
 
-    def get_classification_report(self, phase, epoch, epoch_tags):
+    def is_report_epoch(self, phase, epoch, epoch_results):
+        """
+        whether classification reports & tag dumps are created for epoch, depending on setting report_epochs:
+        - 'all':  every epoch
+        - 'best': every epoch that becomes the best checkpoint so far (monitor & mode of the checkpoint callback)
+        - N:      every N-th epoch, e.g. '5'
+        test epochs are always reported, the last val epoch is reported in on_train_end() if need be.
+        -----------------------------------------------------------------------------------------------------
+        :param phase:         [str] 'val', 'test'
+        :param epoch:         [int]
+        :param epoch_results: [dict] w/ key '<phase>_loss', i.e. what the checkpoint callback monitors
+        :return: report_epoch: [bool]
+        """
+        report_epochs = self.params.report_epochs
+        if phase == "test" or report_epochs == "all":
+            return True
+        elif report_epochs == "best":
+            checkpoint_callback = self.trainer.checkpoint_callback
+            current = epoch_results.get(checkpoint_callback.monitor)
+            return current is None or bool(
+                checkpoint_callback.check_monitor_top_k(current)
+            )
+        else:
+            return (epoch + 1) % int(report_epochs) == 0
+
+    def _report_epoch(self, phase, epoch, epoch_tag_ids, epoch_chunk_counts):
+        """
+        create & log classification report, dump tag ids (val only)
+        ------------------------------------------------------------
+        :param phase:              [str] 'val', 'test'
+        :param epoch:              [int]
+        :param epoch_tag_ids:      [dict] w/ keys 'true', 'pred' & values = [np array] w/ [int] tag ids
+        :param epoch_chunk_counts: [ChunkCounts]
+        :return: -
+        """
+        self.get_classification_report(
+            phase, epoch, epoch_tag_ids, epoch_chunk_counts
+        )  # attr: classification_reports
+        self.mlflow_client.log_classification_report(
+            self.classification_reports[phase][epoch]
+        )
+        self.mlflow_client.finish_artifact_mlflow()
+        if phase == "val":
+            self.dump_tag_ids(phase, epoch_tag_ids)
+
+    def dump_tag_ids(self, phase, epoch_tag_ids):
         """
-        get token-based (sklearn) & chunk-based (seqeval) classification report
-        -----------------------------------------------------------------------
+        dump true & predicted tag ids (compressed) to DIR_RESULTS/<phase>_tag_ids.npz
+        ------------------------------------------------------------------------------
+        :param phase:         [str] 'val', 'test'
+        :param epoch_tag_ids: [dict] w/ keys 'true', 'pred' & values = [np array] w/ [int] tag ids
+        :return: -
+        """
+        np.savez_compressed(
+            f'{env_variable("DIR_RESULTS")}/{phase}_tag_ids.npz',
+            true=epoch_tag_ids["true"],
+            pred=epoch_tag_ids["pred"],
+            tag_list=np.array(self.tag_list),
+        )
+
+    def get_classification_report(
+        self, phase, epoch, epoch_tag_ids, epoch_chunk_counts
+    ):
+        """
+        get token-based (sklearn) & chunk-based classification report
+        -------------------------------------------------------------
         :param: epoch:                         [int]
-        :param: epoch_tags:                    [dict] w/ keys 'true', 'pred'      & values = [np array]
+        :param: epoch_tag_ids:                 [dict] w/ keys 'true', 'pred'      & values = [np array]
+        :param: epoch_chunk_counts:            [ChunkCounts]
         :changed attr: classification reports: [dict] w/ keys = epoch [int], values = classification report [str]
         :return: -
         """
@@ -613,30 +753,24 @@ class NerModel(pl.LightningModule, ABC):
         self.classification_reports[phase][
             epoch
         ] += "\n--- token-based (sklearn) classification report on fil ---\n"
+        epoch_tags = {
+            field: self._convert_tag_ids_to_tags(epoch_tag_ids[field])
+            for field in ["true", "pred"]
+        }
         self.classification_reports[phase][epoch] += classification_report_sklearn(
             epoch_tags["true"], epoch_tags["pred"], labels=tag_list_filtered
         )
 
         # chunk-based classification report
-        epoch_tags_chunk = dict()
-        for field in ["true", "pred"]:
-            epoch_tags_chunk[field] = convert_to_chunk(
-                epoch_tags[field], to_bio=self.params.dataset_tags == "plain"
-            )
         self.default_logger.log_debug("> dataset_tags:", self.params.dataset_tags)
-        self.default_logger.log_debug(
-            "> epoch_tags_chunk[true]:", list(set(epoch_tags_chunk["true"]))
-        )
-        self.default_logger.log_debug(
-            "> epoch_tags_chunk[pred]:", list(set(epoch_tags_chunk["pred"]))
-        )
+        self.default_logger.log_debug("> chunk types:", epoch_chunk_counts.types)
 
         self.classification_reports[phase][
             epoch
-        ] += "\n--- chunk-based (seqeval) classification report on fil ---\n"
-        self.classification_reports[phase][epoch] += classification_report_seqeval(
-            epoch_tags_chunk["true"], epoch_tags_chunk["pred"], suffix=False
-        )
+        ] += "\n--- chunk-based classification report on fil ---\n"
+        self.classification_reports[phase][
+            epoch
+        ] += epoch_chunk_counts.classification_report()
 
         warnings.resetwarnings()
 
@@ -1,11 +1,13 @@
 import json
+import time
 import numpy as np
 from transformers import AutoModelForTokenClassification
 from argparse import Namespace
 from torch.nn.functional import softmax
-from typing import List, Union
+from typing import Callable, Dict, List, Optional, Union
 
 from nerblackbox.modules.ner_training.ner_model import NerModel
+from nerblackbox.modules.ner_training.predict_stats import PredictStats
 
 
 class NerModelPredict(NerModel):
@@ -38,6 +40,7 @@ class NerModelPredict(NerModel):
             hparams: attr experiment_name, run_name, pretrained_model_name, dataset_name, ..
         """
         super().__init__(hparams)
+        self.predict_stats: Optional[PredictStats] = None
 
     ####################################################################################################################
     # Abstract Base Methods ############################################################################################
@@ -83,6 +86,35 @@ class NerModelPredict(NerModel):
     ####################################################################################################################
     # PREDICT
     ####################################################################################################################
+    def set_bf16(self, bf16: bool = True) -> None:
+        """use bfloat16 autocast (mixed precision) on cpu, e.g. on CPUs w/ native bfloat16 support
+
+        by default, it is used if the model was trained with fp16 on cpu.
+        falls back to fp32 (w/ a warning) if bfloat16 autocast is not supported by the installed torch version.
+
+        Args:
+            bf16: whether to use bfloat16 autocast
+        """
+        super().set_bf16(bf16)
+
+    def enable_predict_stats(
+        self, callback: Optional[Callable[[Dict], None]] = None
+    ) -> PredictStats:
+        """record latency & throughput statistics of all subsequent predict calls
+
+        Args:
+            callback: called after each predict call with the statistics of the call, see PredictStats.record()
+
+        Returns:
+            predict_stats: e.g. predict_stats.as_dict() or predict_stats.to_prometheus()
+        """
+        self.predict_stats = PredictStats(callback=callback)
+        return self.predict_stats
+
+    def disable_predict_stats(self) -> None:
+        """stop recording statistics of predict calls"""
+        self.predict_stats = None
+
     def predict(self, examples: List[str]) -> List[Namespace]:
         """predict tags
 
@@ -123,17 +155,33 @@ class NerModelPredict(NerModel):
         if isinstance(examples, str):
             examples = [examples]
 
+        # timing (see predict_stats)
+        seconds = {stage: 0.0 for stage in PredictStats.stages}
+        nr_tokens = nr_tokens_padded = 0
+        start = time.perf_counter()
+
         predict_dataloader = self._get_predict_dataloader(examples)
         examples_tokenized = self._get_tokenized_examples(
             examples
         )  # for external predictions
+        seconds["preprocessing"] += time.perf_counter() - start
 
         # get predictions
         predictions = (
             list()
         )  # for each example: .internal/.external = list of tuples (word, tag)
+        start = time.perf_counter()
         for example_tokenized, sample in zip(examples_tokenized, predict_dataloader):
+            # tensorization happens lazily in the dataloader
+            stop = time.perf_counter()
+            seconds["tensorization"] += stop - start
+            start = stop
+
             output_token_tensors, tokens = self._predict_on_tokens(sample)
+            stop = time.perf_counter()
+            seconds["forward"] += stop - start
+            start = stop
+
             if proba is False:
                 output_token_predictions = self._turn_tensors_into_tags(
                     output_token_tensors
@@ -147,10 +195,27 @@ class NerModelPredict(NerModel):
             output_word_predictions = self._get_tags_on_words_between_special_tokens(
                 tokens, output_token_predictions
             )
+            stop = time.perf_counter()
+            seconds["postprocessing"] += stop - start
+            start = stop
+
             prediction = self._summarize_prediction(
                 output_word_predictions, example_tokenized
             )
             predictions.append(prediction)
+            stop = time.perf_counter()
+            seconds["summarization"] += stop - start
+
+            if self.predict_stats is not None:
+                attention_mask = sample[1]
+                nr_tokens += int(attention_mask.sum())
+                nr_tokens_padded += attention_mask.numel()
+            start = time.perf_counter()
+
+        if self.predict_stats is not None:
+            self.predict_stats.record(
+                len(examples), nr_tokens, nr_tokens_padded, seconds
+            )
         return predictions
 
     ####################################################################################################################
@@ -196,11 +261,12 @@ class NerModelPredict(NerModel):
             label_ids,  # shape: [1, seq_length]
         ) = sample
 
-        output = self.model(
-            input_ids, attention_mask, segment_ids, label_ids
-        )  # shape: [1 (=#examples), 1 (=#batch_size), seq_length, #tags]
+        with self._autocast():
+            output = self.model(
+                input_ids, attention_mask, segment_ids, label_ids
+            )  # shape: [1 (=#examples), 1 (=#batch_size), seq_length, #tags]
         output_token_tensors = [
-            output[0][0][i]  # .detach().numpy()
+            output[0][0][i].float()  # .detach().numpy()
             for i in range(self._hparams.max_seq_length)
         ]  # shape: [seq_length, #tags]
 
@@ -1,13 +1,14 @@
-import os
-from os.path import join
 import json
-
-from transformers import AutoTokenizer, AutoModelForTokenClassification
+from functools import partial
+from inspect import signature
+import torch
+from torch.utils.checkpoint import checkpoint
 
 from nerblackbox.modules.ner_training.metrics.logged_metrics import LoggedMetrics
 from nerblackbox.modules.ner_training.logging.mlflow_client import MLflowClient
 from nerblackbox.modules.ner_training.logging.default_logger import DefaultLogger
 from nerblackbox.modules.ner_training.ner_model import NerModel
+from nerblackbox.modules.ner_training.pretrained_cache import PretrainedCache
 
 
 class NerModelTrain(NerModel):
@@ -73,18 +74,11 @@ class NerModelTrain(NerModel):
 
         self.epoch_metrics = {"val": dict(), "test": dict()}
         self.classification_reports = {"val": dict(), "test": dict()}
+        self.val_epoch_unreported = None  # see NerModel.on_train_end()
 
-        try:
-            # use transformers model
-            AutoTokenizer.from_pretrained(self.params.pretrained_model_name)
-            self.pretrained_model_name = self.params.pretrained_model_name
-        except ValueError:
-            # use local model
-            self.pretrained_model_name = join(
-                os.environ.get("DATA_DIR"),
-                "pretrained_models",
-                self.params.pretrained_model_name,
-            )
+        self.pretrained_model_name = PretrainedCache.get_pretrained_model_name(
+            self.params.pretrained_model_name
+        )  # transformers model or local model
 
     def _preparations_data_train(self):
         """
@@ -110,14 +104,34 @@ class NerModelTrain(NerModel):
         )  # save for PREDICT (see below)
 
         # model
-        self.model = AutoModelForTokenClassification.from_pretrained(
+        self.model = PretrainedCache.get_model(
             self.pretrained_model_name, num_labels=len(self.tag_list)
         )
+        self._freeze_parameters(
+            self._hparams.freeze_embeddings, self._hparams.freeze_layers
+        )
+        if self._hparams.gradient_checkpointing:
+            self._enable_gradient_checkpointing(self._hparams.freeze_layers)
 
         # dataloader
         self.dataloader = self.data_preprocessor.to_dataloader(
             input_examples, self.tag_list, batch_size=self._hparams.batch_size
         )
+        if self._hparams.accumulate_grad_batches > len(self.dataloader["train"]):
+            raise Exception(
+                f"accumulate_grad_batches = {self._hparams.accumulate_grad_batches} exceeds "
+                f"the number of training batches = {len(self.dataloader['train'])}."
+            )
+        if not (
+            self.params.report_epochs in ["all", "best"]
+            or (
+                self.params.report_epochs.isdigit()
+                and int(self.params.report_epochs) > 0
+            )
+        ):
+            raise Exception(
+                f"report_epochs = {self.params.report_epochs} unknown, use 'all', 'best' or a positive integer."
+            )
 
         # optimizer
         self.optimizer = self._create_optimizer(
@@ -130,3 +144,119 @@ class NerModelTrain(NerModel):
             self._hparams.lr_schedule,
             self._hparams.lr_num_cycles,
         )
+
+    ####################################################################################################################
+    # MEMORY ###########################################################################################################
+    ####################################################################################################################
+    def _get_encoder_layers(self):
+        """
+        :return: encoder_layers: [torch ModuleList] of transformer layers of self.model, lowest first
+        """
+        base_model = self.model.base_model
+        if hasattr(base_model, "encoder") and hasattr(base_model.encoder, "layer"):
+            return base_model.encoder.layer  # e.g. bert, roberta, electra
+        elif hasattr(base_model, "transformer") and hasattr(
+            base_model.transformer, "layer"
+        ):
+            return base_model.transformer.layer  # e.g. distilbert
+        else:
+            raise Exception(
+                f"encoder layers of model = {self.pretrained_model_name} not found."
+            )
+
+    def _freeze_parameters(self, _freeze_embeddings, _freeze_layers):
+        """
+        freeze embeddings and/or lowest encoder layers, i.e. exclude them from training & optimizer
+        --------------------------------------------------------------------------------------------
+        :param _freeze_embeddings: [bool]
+        :param _freeze_layers:     [int] number of lowest encoder layers to freeze, e.g. 6
+        :changed attr: model       [transformers AutoModelForTokenClassification] w/ frozen parameters
+        :return: -
+        """
+        modules_frozen = list()
+        if _freeze_embeddings:
+            modules_frozen.append(self.model.base_model.embeddings)
+        if _freeze_layers > 0:
+            encoder_layers = self._get_encoder_layers()
+            if _freeze_layers > len(encoder_layers):
+                raise Exception(
+                    f"freeze_layers = {_freeze_layers} exceeds "
+                    f"the number of encoder layers = {len(encoder_layers)}."
+                )
+            modules_frozen.extend(encoder_layers[:_freeze_layers])
+
+        for module in modules_frozen:
+            for parameter in module.parameters():
+                parameter.requires_grad = False
+
+        self.default_logger.log_debug(
+            "> frozen parameters:",
+            sum(p.numel() for p in self.model.parameters() if not p.requires_grad),
+        )
+
+    def _enable_gradient_checkpointing(self, _freeze_layers):
+        """
+        recompute the activations of the trainable encoder layers in the backward pass instead of storing them.
+        the lowest trainable layer is not checkpointed if its input does not require gradients (frozen layers below),
+        as its parameters would not get gradients otherwise (reentrant torch checkpoint).
+        ---------------------------------------------------------------------------------------------------------------
+        :param _freeze_layers: [int] number of lowest encoder layers that are frozen, e.g. 6
+        :changed attr: model   [transformers AutoModelForTokenClassification] w/ checkpointed encoder layers
+        :return: -
+        """
+        encoder_layers = self._get_encoder_layers()
+        checkpoint_kwargs = (
+            {"use_reentrant": True}
+            if "use_reentrant" in signature(checkpoint).parameters
+            else dict()
+        )
+        input_frozen = self._hparams.freeze_embeddings or _freeze_layers > 0
+        first_layer = _freeze_layers + 1 if input_frozen else _freeze_layers
+
+        for layer in encoder_layers[first_layer:]:
+            layer.forward = self._checkpointed_forward(layer, checkpoint_kwargs)
+
+    @staticmethod
+    def _checkpointed_forward(_layer, _checkpoint_kwargs):
+        """
+        :param _layer:             [torch Module] encoder layer
+        :param _checkpoint_kwargs: [dict] for torch.utils.checkpoint.checkpoint
+        :return: checkpointed_forward: [function] that replaces _layer.forward
+        """
+        forward = _layer.forward
+
+        def checkpointed_forward(*args, **kwargs):
+            if _layer.training and torch.is_grad_enabled():
+                return checkpoint(
+                    partial(forward, **kwargs), *args, **_checkpoint_kwargs
+                )
+            return forward(*args, **kwargs)
+
+        return checkpointed_forward
+
+    ####################################################################################################################
+    # CHECKPOINT #######################################################################################################
+    ####################################################################################################################
+    def on_save_checkpoint(self, checkpoint):
+        """
+        add state that is not handled by pytorch lightning to checkpoint
+        ----------------------------------------------------------------
+        :param checkpoint: [dict]
+        :return: -
+        """
+        checkpoint["scheduler_state"] = self.scheduler.state_dict()
+        checkpoint["epoch_metrics"] = self.epoch_metrics
+        checkpoint["classification_reports"] = self.classification_reports
+
+    def restore_training_state(self, checkpoint):
+        """
+        restore state that was added to checkpoint by on_save_checkpoint(), to resume training.
+        weights, optimizer & epoch are restored by pytorch lightning (Trainer w/ resume_from_checkpoint)
+        ------------------------------------------------------------------------------------------------
+        :param checkpoint: [dict]
+        :changed attr: scheduler, epoch_metrics, classification_reports
+        :return: -
+        """
+        self.scheduler.load_state_dict(checkpoint["scheduler_state"])
+        self.epoch_metrics = checkpoint["epoch_metrics"]
+        self.classification_reports = checkpoint["classification_reports"]
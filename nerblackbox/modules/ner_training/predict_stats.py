@@ -0,0 +1,150 @@
+import threading
+from typing import Callable, Dict, List, Optional
+
+
+class PredictStats:
+    """
+    latency & throughput statistics of NerModelPredict.predict / predict_proba calls,
+    broken down into the stages preprocessing, tensorization, forward, postprocessing & summarization
+    """
+
+    stages = [
+        "preprocessing",
+        "tensorization",
+        "forward",
+        "postprocessing",
+        "summarization",
+    ]
+    latency_buckets = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+    def __init__(self, callback: Optional[Callable[[Dict], None]] = None):
+        """
+        Args:
+            callback: called after each predict call with the statistics of the call, see record()
+        """
+        self.callback = callback
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """reset all statistics"""
+        with self._lock:
+            self.calls = 0
+            self.examples = 0
+            self.tokens = 0
+            self.tokens_padded = 0
+            self.seconds = {stage: 0.0 for stage in self.stages}
+            self.latency_bucket_counts = [0 for _ in self.latency_buckets]
+            self.last: Optional[Dict] = None
+
+    def record(
+        self, examples: int, tokens: int, tokens_padded: int, seconds: Dict[str, float]
+    ) -> Dict:
+        """record statistics of a single predict call
+
+        Args:
+            examples: number of examples
+            tokens: number of real tokens (incl. special tokens)
+            tokens_padded: number of tokens incl. padding
+            seconds: time spent per stage, e.g. {'preprocessing': 0.001, 'forward': 0.02, ..}
+
+        Returns:
+            call: statistics of the call w/ keys 'examples', 'tokens', 'tokens_padded', 'seconds', 'latency'
+        """
+        latency = sum(seconds.values())
+        call = {
+            "examples": examples,
+            "tokens": tokens,
+            "tokens_padded": tokens_padded,
+            "seconds": dict(seconds),
+            "latency": latency,
+        }
+        with self._lock:
+            self.calls += 1
+            self.examples += examples
+            self.tokens += tokens
+            self.tokens_padded += tokens_padded
+            for stage, _seconds in seconds.items():
+                self.seconds[stage] += _seconds
+            for i, bucket in enumerate(self.latency_buckets):
+                if latency <= bucket:
+                    self.latency_bucket_counts[i] += 1
+            self.last = call
+
+        if self.callback is not None:
+            self.callback(call)
+        return call
+
+    def as_dict(self) -> Dict:
+        """summary of all recorded predict calls
+
+        Returns:
+            summary: w/ keys 'calls', 'examples', 'tokens', 'tokens_padded', 'padding_ratio', 'seconds',
+                     'latency_mean', 'examples_per_sec', 'tokens_per_sec'
+        """
+        with self._lock:
+            seconds_total = sum(self.seconds.values())
+            return {
+                "calls": self.calls,
+                "examples": self.examples,
+                "tokens": self.tokens,
+                "tokens_padded": self.tokens_padded,
+                "padding_ratio": 1 - self.tokens / self.tokens_padded
+                if self.tokens_padded
+                else 0.0,
+                "seconds": dict(self.seconds),
+                "latency_mean": seconds_total / self.calls if self.calls else 0.0,
+                "examples_per_sec": self.examples / seconds_total
+                if seconds_total
+                else 0.0,
+                "tokens_per_sec": self.tokens / seconds_total if seconds_total else 0.0,
+            }
+
+    def to_prometheus(self, prefix: str = "nerblackbox_predict") -> str:
+        """export statistics in prometheus text format
+
+        Args:
+            prefix: prefix of the metric names
+
+        Returns:
+            text: e.g. to be served on a /metrics endpoint or written for a textfile collector
+        """
+        with self._lock:
+            lines: List[str] = list()
+
+            def counter(name, documentation, samples):
+                lines.append(f"# HELP {prefix}_{name} {documentation}")
+                lines.append(f"# TYPE {prefix}_{name} counter")
+                for labels, value in samples:
+                    lines.append(f"{prefix}_{name}{labels} {value}")
+
+            counter("calls_total", "Number of predict calls.", [("", self.calls)])
+            counter("examples_total", "Number of examples.", [("", self.examples)])
+            counter(
+                "tokens_total",
+                "Number of real tokens incl. special tokens.",
+                [("", self.tokens)],
+            )
+            counter(
+                "padded_tokens_total",
+                "Number of tokens incl. padding.",
+                [("", self.tokens_padded)],
+            )
+            counter(
+                "stage_seconds_total",
+                "Time spent in predict calls per stage.",
+                [
+                    (f'{{stage="{stage}"}}', self.seconds[stage])
+                    for stage in self.stages
+                ],
+            )
+
+            name = f"{prefix}_latency_seconds"
+            lines.append(f"# HELP {name} Latency of predict calls.")
+            lines.append(f"# TYPE {name} histogram")
+            for bucket, count in zip(self.latency_buckets, self.latency_bucket_counts):
+                lines.append(f'{name}_bucket{{le="{bucket}"}} {count}')
+            lines.append(f'{name}_bucket{{le="+Inf"}} {self.calls}')
+            lines.append(f"{name}_sum {sum(self.seconds.values())}")
+            lines.append(f"{name}_count {self.calls}")
+            return "\n".join(lines) + "\n"
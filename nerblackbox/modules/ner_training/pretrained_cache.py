@@ -0,0 +1,93 @@
+import os
+import copy
+from os.path import join
+from collections import OrderedDict
+from typing import Dict, Tuple, Any
+
+from transformers import AutoTokenizer, AutoModelForTokenClassification
+
+
+class PretrainedCache:
+    """
+    process-level cache of tokenizers & pristine pretrained models,
+    shared by all runs (and experiments, e.g. API calls w/ in_process = True) that are executed in the same process.
+
+    each run gets its own in-memory copy of the pretrained weights with a freshly initialized classification head,
+    i.e. the same as if the pretrained model were loaded from disk again.
+
+    at most max_models pretrained models are kept (least recently used ones are dropped), see also clear().
+    """
+
+    max_models: int = 1
+
+    pretrained_model_names: Dict[str, str] = dict()
+    tokenizers: Dict[str, Any] = dict()
+    models: "OrderedDict[Tuple[str, int], Any]" = OrderedDict()
+
+    @classmethod
+    def get_pretrained_model_name(cls, pretrained_model_name: str) -> str:
+        """
+        :param pretrained_model_name: [str] e.g. 'af-ai-center/bert-base-swedish-uncased' or local model name
+        :return: pretrained_model_name: [str] transformers model name or path to local model in DATA_DIR
+        """
+        if pretrained_model_name not in cls.pretrained_model_names.keys():
+            try:
+                # use transformers model
+                cls.get_tokenizer(pretrained_model_name)
+                cls.pretrained_model_names[
+                    pretrained_model_name
+                ] = pretrained_model_name
+            except ValueError:
+                # use local model
+                cls.pretrained_model_names[pretrained_model_name] = join(
+                    os.environ.get("DATA_DIR"),
+                    "pretrained_models",
+                    pretrained_model_name,
+                )
+        return cls.pretrained_model_names[pretrained_model_name]
+
+    @classmethod
+    def get_tokenizer(cls, pretrained_model_name: str):
+        """
+        :param pretrained_model_name: [str] transformers model name or path to local model
+        :return: tokenizer: [transformers AutoTokenizer]
+        """
+        if pretrained_model_name not in cls.tokenizers.keys():
+            cls.tokenizers[pretrained_model_name] = AutoTokenizer.from_pretrained(
+                pretrained_model_name, do_lower_case=False
+            )  # needs to be False !!
+        return cls.tokenizers[pretrained_model_name]
+
+    @classmethod
+    def get_model(cls, pretrained_model_name: str, num_labels: int):
+        """
+        :param pretrained_model_name: [str] transformers model name or path to local model
+        :param num_labels:            [int] number of tags
+        :return: model: [transformers AutoModelForTokenClassification] copy of the pretrained model (cpu)
+                                                                       w/ freshly initialized classification head
+        """
+        key = (pretrained_model_name, num_labels)
+        if key not in cls.models.keys():
+            while len(cls.models) >= max(cls.max_models, 1):
+                cls.models.popitem(last=False)
+            cls.models[key] = AutoModelForTokenClassification.from_pretrained(
+                pretrained_model_name, num_labels=num_labels
+            )
+        cls.models.move_to_end(key)
+
+        model = copy.deepcopy(cls.models[key])
+        for name, module in model.named_children():
+            if name != model.base_model_prefix:
+                module.apply(model._init_weights)
+        return model
+
+    @classmethod
+    def clear(cls) -> None:
+        """
+        drop all cached tokenizers & pretrained models, e.g. to free memory
+        -------------------------------------------------------------------
+        :return: -
+        """
+        cls.pretrained_model_names.clear()
+        cls.tokenizers.clear()
+        cls.models.clear()
@@ -0,0 +1,161 @@
+import json
+import sqlite3
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any
+
+from nerblackbox.modules.utils.env_variable import env_variable
+
+
+class ResultsIndex:
+    """
+    local sqlite index of mlflow runs (params, metrics) per experiment,
+    updated incrementally when a run finishes & queried instead of scanning the mlflow store
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        :param path: [str] path to sqlite database, default: env_variable('RESULTS_INDEX')
+        """
+        self.path = env_variable("RESULTS_INDEX") if path is None else path
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS experiments "
+                "(experiment_id TEXT PRIMARY KEY)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                "run_id TEXT PRIMARY KEY, "
+                "experiment_id TEXT NOT NULL, "
+                "run_name_nr TEXT, "
+                "start_time INTEGER, "
+                "params TEXT NOT NULL, "
+                "metrics TEXT NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS runs_experiment_id ON runs (experiment_id)"
+            )
+
+    ####################################################################################################################
+    # READ
+    ####################################################################################################################
+    def get_records(self, experiment_id: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        :param experiment_id: [str], e.g. '1'
+        :return: records: [list] of [dict] w/ keys = 'run_id', 'run_name_nr', 'start_time', 'params', 'metrics'
+                          ordered by start_time (descending) like mlflow's search_runs(),
+                          or None if experiment is not indexed
+        """
+        with self._connect() as connection:
+            indexed = connection.execute(
+                "SELECT 1 FROM experiments WHERE experiment_id = ?", (experiment_id,)
+            ).fetchone()
+            if indexed is None:
+                return None
+            rows = connection.execute(
+                "SELECT run_id, run_name_nr, start_time, params, metrics FROM runs "
+                "WHERE experiment_id = ? ORDER BY start_time DESC",
+                (experiment_id,),
+            ).fetchall()
+        return [
+            {
+                "run_id": run_id,
+                "run_name_nr": run_name_nr,
+                "start_time": start_time,
+                "params": json.loads(params),
+                "metrics": json.loads(metrics),
+            }
+            for run_id, run_name_nr, start_time, params, metrics in rows
+        ]
+
+    ####################################################################################################################
+    # WRITE
+    ####################################################################################################################
+    def set_records(self, experiment_id: str, records: List[Dict[str, Any]]) -> None:
+        """
+        replace all records of experiment & mark experiment as indexed
+        ---------------------------------------------------------------
+        :param experiment_id: [str], e.g. '1'
+        :param records:       [list] of [dict], see get_records()
+        :return: -
+        """
+        with self._connect() as connection:
+            connection.execute(
+                "DELETE FROM runs WHERE experiment_id = ?", (experiment_id,)
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?)",
+                [self._record_to_row(experiment_id, record) for record in records],
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO experiments VALUES (?)", (experiment_id,)
+            )
+
+    def update_run(self, run_id: str) -> None:
+        """
+        upsert record of a single (finished) mlflow run.
+        if its experiment is not indexed yet, all runs of the experiment are (re)indexed from mlflow.
+        ---------------------------------------------------------------------------------------------
+        :param run_id: [str] mlflow run_id
+        :return: -
+        """
+        from mlflow.tracking import MlflowClient
+
+        client = MlflowClient()
+        run = client.get_run(run_id)
+        experiment_id = run.info.experiment_id
+
+        try:
+            if self.get_records(experiment_id) is None:
+                records = [
+                    self.run_to_record(_run)
+                    for _run in client.search_runs(experiment_id)
+                ]
+                self.set_records(experiment_id, records)
+            else:
+                with self._connect() as connection:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?)",
+                        self._record_to_row(experiment_id, self.run_to_record(run)),
+                    )
+        except sqlite3.Error as e:
+            print(f"ATTENTION! results index {self.path} could not be updated: {e}")
+
+    ####################################################################################################################
+    # HELPER
+    ####################################################################################################################
+    @staticmethod
+    def run_to_record(run) -> Dict[str, Any]:
+        """
+        :param run: [mlflow.entities.Run]
+        :return: record: [dict], see get_records()
+        """
+        return {
+            "run_id": run.info.run_id,
+            "run_name_nr": run.data.tags.get("mlflow.runName"),
+            "start_time": run.info.start_time,
+            "params": dict(run.data.params),
+            "metrics": dict(run.data.metrics),
+        }
+
+    @staticmethod
+    def _record_to_row(experiment_id: str, record: Dict[str, Any]) -> tuple:
+        return (
+            record["run_id"],
+            experiment_id,
+            record["run_name_nr"],
+            record["start_time"],
+            json.dumps(record["params"]),
+            json.dumps(record["metrics"]),
+        )
+
+    @contextmanager
+    def _connect(self):
+        """
+        :return: connection: [sqlite3 Connection] that commits on success & is closed afterwards
+        """
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
@@ -1,7 +1,11 @@
+import os
 import argparse
+import multiprocessing
 import torch
 import mlflow
 import gc
+import shutil
+from os.path import join, basename
 
 import logging
 import warnings
@@ -9,6 +13,10 @@ import warnings
 import nerblackbox.modules.ner_training.bert_ner_single as bert_ner_single
 from nerblackbox.modules.utils.env_variable import env_variable
 from nerblackbox.modules.experiment_config.experiment_config import ExperimentConfig
+from nerblackbox.modules.results_index import ResultsIndex
+from nerblackbox.modules.ner_training.callbacks.successive_halving import (
+    SuccessiveHalvingEarlyStopping,
+)
 
 logging.basicConfig(
     level=logging.WARNING
@@ -18,10 +26,11 @@ warnings.filterwarnings("ignore")
 
 def main(params, log_dirs):
     """
-    :param params:   [argparse.Namespace] attr: experiment_name, run_name, device, fp16, experiment_run_name_nr
+    :param params:   [argparse.Namespace] attr: experiment_name, run_name, device, fp16, resume
     :param log_dirs: [argparse.Namespace] attr: mlflow, tensorboard
     :return: -
     """
+    resume = params.resume
     experiment_config = ExperimentConfig(
         experiment_name=params.experiment_name,
         run_name=params.run_name,
@@ -29,25 +38,248 @@ def main(params, log_dirs):
         fp16=params.fp16,
     )
     runs_name_nr, runs_params, runs_hparams = experiment_config.parse()
+    experiment_params = experiment_config.get_params_and_hparams(run_name_nr=None)
 
-    with mlflow.start_run(run_name=params.experiment_name):
-        for k, v in experiment_config.get_params_and_hparams(run_name_nr=None).items():
+    # hyperparameter search: runs of a new experiment are not compared to runs of a previous one
+    search_settings = experiment_config.get_search_settings()
+    if search_settings is not None and params.run_name is None and not resume:
+        shutil.rmtree(
+            SuccessiveHalvingEarlyStopping.get_rung_directory(params.experiment_name),
+            ignore_errors=True,
+        )
+
+    max_parallel_runs = get_max_parallel_runs(
+        experiment_params.get("max_parallel_runs", 1),
+        device=params.device,
+        nr_of_runs=len(runs_name_nr),
+    )
+    num_threads_per_run = get_num_threads_per_run(
+        experiment_params.get("num_threads_per_run", 0),
+        max_parallel_runs=max_parallel_runs,
+    )
+
+    with mlflow.start_run(run_name=params.experiment_name) as active_run:
+        for k, v in experiment_params.items():
             mlflow.log_param(k, v)
+        ResultsIndex().update_run(active_run.info.run_id)
+
+        # resume: skip finished runs, continue interrupted runs
+        if resume:
+            runs_finished, runs_interrupted = get_runs_to_resume(
+                active_run.info.experiment_id, runs_name_nr
+            )
+            runs_name_nr = [
+                run_name_nr
+                for run_name_nr in runs_name_nr
+                if run_name_nr not in runs_finished
+            ]
+            print(
+                f"> resume experiment: skip {len(runs_finished)} finished runs "
+                f"{runs_finished}, resume {len(runs_interrupted)} interrupted runs "
+                f"{list(runs_interrupted.keys())}"
+            )
+        else:
+            runs_interrupted = dict()
+
+        if max_parallel_runs == 1:
+            if num_threads_per_run > 0:
+                torch.set_num_threads(num_threads_per_run)
 
-        for run_name_nr in runs_name_nr:
-            # params & hparams: dict -> namespace
-            params = argparse.Namespace(**runs_params[run_name_nr])
-            hparams = argparse.Namespace(**runs_hparams[run_name_nr])
+            for run_name_nr in runs_name_nr:
+                # params & hparams: dict -> namespace
+                params = argparse.Namespace(**runs_params[run_name_nr])
+                hparams = argparse.Namespace(**runs_hparams[run_name_nr])
 
-            # bert_ner: single run
-            bert_ner_single.main(params, hparams, log_dirs, experiment=True)
+                # bert_ner: single run
+                bert_ner_single.main(
+                    params,
+                    hparams,
+                    log_dirs,
+                    experiment=True,
+                    resume_run_id=runs_interrupted.get(run_name_nr),
+                )
 
-            # clear gpu memory
-            clear_gpu_memory(
-                device=params.device, verbose=params.logging_level == "debug"
+                # clear gpu memory
+                clear_gpu_memory(
+                    device=params.device, verbose=params.logging_level == "debug"
+                )
+        else:
+            run_in_parallel(
+                [runs_params[run_name_nr] for run_name_nr in runs_name_nr],
+                [runs_hparams[run_name_nr] for run_name_nr in runs_name_nr],
+                [runs_interrupted.get(run_name_nr) for run_name_nr in runs_name_nr],
+                log_dirs,
+                parent_run_id=active_run.info.run_id,
+                max_parallel_runs=max_parallel_runs,
+                num_threads_per_run=num_threads_per_run,
             )
 
 
+########################################################################################################################
+# RESUME ###############################################################################################################
+########################################################################################################################
+def get_runs_to_resume(experiment_id, runs_name_nr):
+    """
+    find runs of previous executions of the experiment, using the mlflow tags of the runs.
+    for each run_name_nr, the latest run is
+    - finished    if its status is FINISHED and it has logged its final metrics (epoch_best)
+    - interrupted otherwise
+    --------------------------------------------------------------------------------------
+    :param experiment_id: [str] mlflow experiment_id, e.g. '1'
+    :param runs_name_nr:  [list] of [str], e.g. ['runA-1', 'runA-2']
+    :return: runs_finished:    [list] of [str] run_name_nr of finished runs, e.g. ['runA-1']
+    :return: runs_interrupted: [dict] w/ keys = run_name_nr [str] & values = mlflow run_id [str]
+    """
+    from mlflow.tracking import MlflowClient
+    from mlflow.utils.mlflow_tags import MLFLOW_PARENT_RUN_ID, MLFLOW_RUN_NAME
+
+    runs_latest = dict()
+    runs = MlflowClient().search_runs([experiment_id])  # latest runs first
+    for run in runs:
+        run_name_nr = run.data.tags.get(MLFLOW_RUN_NAME)
+        if (
+            MLFLOW_PARENT_RUN_ID in run.data.tags
+            and run_name_nr in runs_name_nr
+            and run_name_nr not in runs_latest.keys()
+        ):
+            runs_latest[run_name_nr] = run
+
+    runs_finished = list()
+    runs_interrupted = dict()
+    for run_name_nr, run in runs_latest.items():
+        if run.info.status == "FINISHED" and "epoch_best" in run.data.metrics:
+            runs_finished.append(run_name_nr)
+        else:
+            runs_interrupted[run_name_nr] = run.info.run_id
+    return runs_finished, runs_interrupted
+
+
+########################################################################################################################
+# PARALLEL RUNS #########################################################################################################
+########################################################################################################################
+def get_max_parallel_runs(max_parallel_runs, device, nr_of_runs):
+    """
+    :param max_parallel_runs: [int] setting from experiment config, e.g. 4
+    :param device:            [torch device]
+    :param nr_of_runs:        [int] number of runs in experiment, e.g. 12
+    :return: max_parallel_runs: [int] number of runs that are actually executed in parallel
+    """
+    if max_parallel_runs > 1 and device.type == "cuda":
+        print(
+            f"ATTENTION! max_parallel_runs = {max_parallel_runs} is only supported on cpu -> runs are executed in sequence"
+        )
+        return 1
+    return max(1, min(max_parallel_runs, nr_of_runs))
+
+
+def get_num_threads_per_run(num_threads_per_run, max_parallel_runs):
+    """
+    :param num_threads_per_run: [int] setting from experiment config, 0 = automatic
+    :param max_parallel_runs:   [int] number of runs that are executed in parallel
+    :return: num_threads_per_run: [int] cpu threads (torch) per run, 0 = torch default
+    """
+    if num_threads_per_run > 0 or max_parallel_runs == 1:
+        return num_threads_per_run
+    else:
+        return max(1, (os.cpu_count() or 1) // max_parallel_runs)
+
+
+def get_log_dirs_single_run(log_dirs, experiment_run_name_nr):
+    """
+    runs that are executed in parallel need their own log & mlflow artifact files
+    -------------------------------------------------------------------------------
+    :param log_dirs:               [argparse.Namespace] attr: mlflow, tensorboard, checkpoints, log_file, mlflow_file
+    :param experiment_run_name_nr: [str], e.g. 'exp0/runA-1'
+    :return: log_dirs_single_run:  [argparse.Namespace] w/ log_file & mlflow_file in a separate directory for the run
+    """
+    log_dir = join(env_variable("DIR_RESULTS"), "logs", experiment_run_name_nr)
+    os.makedirs(log_dir, exist_ok=True)
+
+    log_dirs_single_run = argparse.Namespace(**vars(log_dirs))
+    log_dirs_single_run.log_file = join(log_dir, basename(log_dirs.log_file))
+    log_dirs_single_run.mlflow_file = join(log_dir, basename(log_dirs.mlflow_file))
+    return log_dirs_single_run
+
+
+def run_in_parallel(
+    runs_params,
+    runs_hparams,
+    runs_resume_run_id,
+    log_dirs,
+    parent_run_id,
+    max_parallel_runs,
+    num_threads_per_run,
+):
+    """
+    execute runs in separate worker processes, at most max_parallel_runs at a time.
+    each worker process executes exactly one run and is replaced afterwards, so that memory is released.
+    ----------------------------------------------------------------------------------------------------
+    :param runs_params:         [list] of [dict] w/ params of each run
+    :param runs_hparams:        [list] of [dict] w/ hparams of each run
+    :param runs_resume_run_id:  [list] of [str or None] w/ mlflow run_id of each run to resume
+    :param log_dirs:            [argparse.Namespace] attr: mlflow, tensorboard, checkpoints, log_file, mlflow_file
+    :param parent_run_id:       [str] mlflow run_id of experiment run
+    :param max_parallel_runs:   [int]
+    :param num_threads_per_run: [int] cpu threads (torch) per run
+    :return: -
+    """
+    print(
+        f"> execute {len(runs_params)} runs with max_parallel_runs = {max_parallel_runs}, "
+        f"num_threads_per_run = {num_threads_per_run}"
+    )
+    tasks = [
+        (
+            run_params,
+            run_hparams,
+            vars(
+                get_log_dirs_single_run(log_dirs, run_params["experiment_run_name_nr"])
+            ),
+            parent_run_id,
+            resume_run_id,
+            mlflow.get_tracking_uri(),
+            num_threads_per_run,
+        )
+        for run_params, run_hparams, resume_run_id in zip(
+            runs_params, runs_hparams, runs_resume_run_id
+        )
+    ]
+
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(processes=max_parallel_runs, maxtasksperchild=1) as pool:
+        pool.starmap(_run_single_in_worker, tasks, chunksize=1)
+
+
+def _run_single_in_worker(
+    run_params,
+    run_hparams,
+    run_log_dirs,
+    parent_run_id,
+    resume_run_id,
+    tracking_uri,
+    num_threads,
+):
+    """
+    :param run_params:    [dict] w/ params of run
+    :param run_hparams:   [dict] w/ hparams of run
+    :param run_log_dirs:  [dict] w/ log_dirs of run
+    :param parent_run_id: [str] mlflow run_id of experiment run
+    :param resume_run_id: [str or None] mlflow run_id of interrupted run to resume
+    :param tracking_uri:  [str] mlflow tracking uri
+    :param num_threads:   [int] cpu threads (torch)
+    :return: -
+    """
+    torch.set_num_threads(num_threads)
+    mlflow.set_tracking_uri(tracking_uri)
+    bert_ner_single.main(
+        argparse.Namespace(**run_params),
+        argparse.Namespace(**run_hparams),
+        argparse.Namespace(**run_log_dirs),
+        experiment=True,
+        parent_run_id=parent_run_id,
+        resume_run_id=resume_run_id,
+    )
+
+
 def clear_gpu_memory(device, verbose: bool = False):
     """
     clear object from GPU memory
@@ -82,7 +314,7 @@ def _parse_args(_parser, _args):
     """
     :param _parser: [argparse ArgumentParser]
     :param _args:   [argparse arguments]
-    :return _params:   [argparse.Namespace] attr: experiment_name, run_name, device, fp16
+    :return _params:   [argparse.Namespace] attr: experiment_name, run_name, device, fp16, resume
     :return _log_dirs: [argparse.Namespace] attr: mlflow, tensorboard
     """
     # parsing
@@ -97,13 +329,12 @@ def _parse_args(_parser, _args):
                 if torch.cuda.is_available() and group_dict["device"] == "gpu"
                 else "cpu"
             )
-            group_dict["fp16"] = (
-                True
-                if group_dict["fp16"] and group_dict["device"].type == "cuda"
-                else False
-            )
+            group_dict["fp16"] = bool(
+                group_dict["fp16"]
+            )  # gpu: fp16 (pytorch lightning), cpu: bfloat16 autocast (NerModel)
             if len(group_dict["run_name"]) == 0:
                 group_dict["run_name"] = None
+            group_dict["resume"] = bool(group_dict["resume"])
             _params = argparse.Namespace(**group_dict)
 
     # log_dirs
@@ -119,7 +350,10 @@ def _parse_args(_parser, _args):
     return _params, _log_dirs
 
 
-if __name__ == "__main__":
+def get_parser():
+    """
+    :return: parser: [argparse ArgumentParser] for the arguments of the run_experiment entry point
+    """
     parser = argparse.ArgumentParser()
 
     # params
@@ -132,7 +366,13 @@ if __name__ == "__main__":
     )  # .. logging w/ mlflow & tensorboard
     args_general.add_argument("--device", type=str, required=True)  # .. device
     args_general.add_argument("--fp16", type=int, required=True)  # .. device
+    args_general.add_argument("--resume", type=int, default=0)  # .. resume
 
+    return parser
+
+
+if __name__ == "__main__":
+    parser = get_parser()
     args = parser.parse_args()
     _params, _log_dirs = _parse_args(parser, args)
     main(_params, _log_dirs)
@@ -22,7 +22,7 @@ def main(args):
         formatter.create_ner_tag_mapping_json(
             modify=args.modify
         )  # II: create ner tag mapping
-        formatter.format_data()  # III: format data
+        formatter.format_data(num_workers=args.num_workers)  # III: format data
         formatter.resplit_data(val_fraction=args.val_fraction)  # IV: resplit data
         formatter.analyze_data()  # V: analyze data
         formatter.plot_data()  # V: analyze data
@@ -36,6 +36,7 @@ if __name__ == "__main__":
     parser.add_argument("--modify", type=bool, default=True)
     parser.add_argument("--val_fraction", type=float, default=0.3)
     parser.add_argument("--verbose", type=bool, default=False)
+    parser.add_argument("--num_workers", type=int, default=1)
     _args = parser.parse_args()
 
     main(_args)
@@ -15,6 +15,7 @@ def env_variable(key: str) -> str:
         "DIR_MLFLOW": f"{data_dir}/results/mlruns",
         "LOG_FILE": f"{data_dir}/results/logs.log",
         "MLFLOW_FILE": f"{data_dir}/results/mlruns/mlflow_artifact.txt",
+        "RESULTS_INDEX": f"{data_dir}/results/mlruns/results_index.db",
     }
 
     return env_variable_dict[key]
@@ -1,5 +1,4 @@
 import os
-import numpy as np
 from os.path import join
 from argparse import Namespace
 import pkg_resources
@@ -56,8 +55,13 @@ def get_hardcoded_parameters(keys=False):
         "pretrained_model_name": "str",
         "uncased": "bool",
         "checkpoints": "bool",
+        "checkpoints_resume": "bool",
         "logging_level": "str",
         "multiple_runs": "int",
+        "max_parallel_runs": "int",
+        "num_threads_per_run": "int",
+        "report_epochs": "str",
+        "profiling_steps": "int",
     }
     _hparams = {
         "batch_size": "int",
@@ -71,6 +75,10 @@ def get_hardcoded_parameters(keys=False):
         "lr_schedule": "str",
         "lr_warmup_epochs": "int",
         "lr_num_cycles": "int",
+        "accumulate_grad_batches": "int",
+        "freeze_embeddings": "bool",
+        "freeze_layers": "int",
+        "gradient_checkpointing": "bool",
     }
     _log_dirs = {
         "mlflow": "str",
@@ -177,19 +185,3 @@ def get_run_name_nr(_run_name, _run_nr):
     :return: _run_name_nr: [str], e.g. 'runA-1'
     """
     return f"{_run_name}-{_run_nr}"
-
-
-def compute_mean_and_dmean(values):
-    """
-    compute mean and its error dmean = std deviation / sqrt(N)
-    ----------------------------------------------------------
-    :param values: [list / np array] of [float]
-    :return: mean  [float]
-    :return: dmean [float]
-    """
-    if len(values) == 1:
-        return values[0], None
-    elif len(values) > 1:
-        return np.mean(values), np.std(values) / np.sqrt(len(values))
-    else:
-        raise Exception(f"cannot compute mean and dmean of empty list!")
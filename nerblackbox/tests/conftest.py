@@ -0,0 +1,5 @@
+import os
+import tempfile
+
+# DefaultLogger needs BASE_DIR at import time (usually set by the nerbb workflow)
+os.environ.setdefault("BASE_DIR", tempfile.mkdtemp())
@@ -0,0 +1,82 @@
+import pytest
+from nerblackbox.modules.experiment_config.experiment_config import ExperimentConfig
+
+# DATA_DIR/default.ini as created by "nerbb init" before new settings & hyperparameters were added
+DEFAULT_INI_OLD = """
+[dataset]
+prune_ratio_train = 1.0
+prune_ratio_val = 1.0
+prune_ratio_test = 1.0
+
+[settings]
+checkpoints = True
+logging_level = info
+multiple_runs = 1
+
+[hparams]
+max_epochs = 20
+monitor = val_loss
+min_delta = 0.0
+patience = 2
+mode = min
+lr_warmup_epochs = 1
+lr_num_cycles = 4
+"""
+
+EXPERIMENT_INI = """
+[dataset]
+dataset_name = swedish_ner_corpus
+dataset_tags = plain
+
+[model]
+pretrained_model_name = af-ai-center/bert-base-swedish-uncased
+
+[hparams]
+patience = 1
+
+[runA]
+batch_size = 16
+max_seq_length = 64
+lr_max = 2e-5
+lr_schedule = constant
+"""
+
+
+class TestExperimentConfig:
+
+    defaults = {
+        "accumulate_grad_batches": 1,
+        "checkpoints_resume": False,
+        "freeze_embeddings": False,
+        "freeze_layers": 0,
+        "gradient_checkpointing": False,
+        "report_epochs": "all",
+        "profiling_steps": 0,
+    }
+
+    ####################################################################################################################
+    # TEST #############################################################################################################
+    ####################################################################################################################
+    @pytest.mark.parametrize("key", sorted(defaults.keys()))
+    def test_parse_w_old_default_ini(self, tmp_path, monkeypatch, key):
+        """
+        test that keys missing in an older DATA_DIR/default.ini fall back to the package's default.ini
+        ------------------------------------------------------------------------------------------------
+        :return: -
+        """
+        monkeypatch.setenv("DATA_DIR", str(tmp_path))
+        experiment_configs = tmp_path / "experiment_configs"
+        experiment_configs.mkdir()
+        (experiment_configs / "default.ini").write_text(DEFAULT_INI_OLD)
+        (experiment_configs / "exp.ini").write_text(EXPERIMENT_INI)
+
+        experiment_config = ExperimentConfig(
+            experiment_name="exp", run_name=None, device="cpu", fp16=False
+        )
+        runs_name_nr, runs_params, runs_hparams = experiment_config.parse()
+
+        assert runs_name_nr == ["runA-1"]
+        params_and_hparams = {**runs_params["runA-1"], **runs_hparams["runA-1"]}
+        assert params_and_hparams[key] == self.defaults[key]
+        assert params_and_hparams["patience"] == 1  # experiment config
+        assert params_and_hparams["max_epochs"] == 20  # DATA_DIR/default.ini
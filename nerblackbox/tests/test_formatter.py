@@ -0,0 +1,49 @@
+import json
+import pytest
+from nerblackbox.modules.datasets.formatter.conll2003_formatter import (
+    CoNLL2003Formatter,
+)
+
+ORIGINAL = (
+    "-DOCSTART- -X- O O\n"
+    "\n"
+    "EU NNP I-NP I-ORG\n"
+    "rejects VBZ I-VP O\n"
+    "German JJ I-NP I-MISC\n"
+    "\n"
+    "Peter NNP I-NP I-PER\n"
+    "Blackburn NNP I-NP I-PER\n"
+    "\n"
+    "BRUSSELS NNP I-NP I-LOC\n"  # last sentence, not followed by an empty line
+)
+
+FORMATTED = (
+    "I-ORG O I-MISC\tEU rejects German\n"
+    "I-PER I-PER\tPeter Blackburn\n"
+    "I-LOC\tBRUSSELS\n"
+)
+
+
+class TestFormatter:
+
+    ####################################################################################################################
+    # TEST #############################################################################################################
+    ####################################################################################################################
+    @pytest.mark.parametrize("num_workers", [1, 3])
+    def test_format_original_file(self, tmp_path, monkeypatch, num_workers):
+        """
+        test the formatted csv of a small original file, w/ and w/o sharding
+        ---------------------------------------------------------------------
+        :return: -
+        """
+        monkeypatch.setenv("DATA_DIR", str(tmp_path))
+        formatter = CoNLL2003Formatter()
+        dataset_path = tmp_path / "datasets" / "conll2003"
+        dataset_path.mkdir(parents=True)
+        (dataset_path / "eng.train").write_text(ORIGINAL, encoding="utf-8")
+        (dataset_path / "ner_tag_mapping.json").write_text(json.dumps(dict()))
+
+        formatter._format_original_file("train", num_workers=num_workers)
+
+        formatted = (dataset_path / "train_formatted.csv").read_text(encoding="utf-8")
+        assert formatted == FORMATTED
@@ -0,0 +1,34 @@
+import sys
+import subprocess
+import pytest
+
+
+class TestLazyImports:
+
+    heavy_modules = ["torch", "transformers", "pytorch_lightning", "mlflow"]
+
+    ####################################################################################################################
+    # TEST #############################################################################################################
+    ####################################################################################################################
+    @pytest.mark.parametrize(
+        "statement",
+        [
+            "import nerblackbox.cli",
+            "import nerblackbox",
+            "from nerblackbox.modules.main import NerBlackBoxMain",
+        ],
+    )
+    def test_no_heavy_imports(self, statement):
+        """
+        test that metadata-only entry points do not import the ML stack
+        ---------------------------------------------------------------
+        :return: -
+        """
+        code = (
+            f"import sys; {statement}; "
+            f"print(','.join(m for m in {self.heavy_modules} if m in sys.modules))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], check=True, stdout=subprocess.PIPE
+        ).stdout.decode()
+        assert output.strip() == "", f"{statement} imports {output.strip()}"
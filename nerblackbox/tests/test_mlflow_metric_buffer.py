@@ -0,0 +1,39 @@
+from mlflow.tracking import MlflowClient
+from nerblackbox.modules.ner_training.logging.mlflow_metric_buffer import (
+    MLflowMetricBuffer,
+)
+
+
+class TestMLflowMetricBuffer:
+
+    ####################################################################################################################
+    # TEST #############################################################################################################
+    ####################################################################################################################
+    def test_close(self, tmp_path, monkeypatch):
+        """
+        test that all buffered metrics are logged (in batches) once the buffer is closed
+        ---------------------------------------------------------------------------------
+        :return: -
+        """
+        tracking_uri = f"sqlite:///{tmp_path}/mlflow.db"
+        client = MlflowClient(tracking_uri=tracking_uri)
+        experiment_id = client.create_experiment("test")
+        run_id = client.create_run(experiment_id).info.run_id
+
+        monkeypatch.setattr(MLflowMetricBuffer, "max_metrics_per_batch", 3)
+        metric_buffer = MLflowMetricBuffer(
+            run_id, tracking_uri=tracking_uri, max_queued_batches=1
+        )
+        for epoch in range(4):
+            metric_buffer.add("epoch", epoch)
+            for i in range(5):
+                metric_buffer.add(f"metric_{i}", epoch + 0.1 * i)
+            metric_buffer.flush()
+        metric_buffer.add("epoch_best", 2)
+        metric_buffer.close()
+
+        metrics = client.get_run(run_id).data.metrics
+        assert metrics["epoch"] == 3
+        assert metrics["metric_4"] == 3.4
+        assert metrics["epoch_best"] == 2
+        assert len(client.get_metric_history(run_id, "metric_0")) == 4
@@ -3,6 +3,8 @@ import pandas as pd
 import pytest
 from pkg_resources import resource_filename
 from nerblackbox.modules.ner_training.metrics.ner_metrics import NerMetrics
+from nerblackbox.modules.ner_training.metrics.ner_metrics import ConfusionMatrix
+from nerblackbox.modules.ner_training.metrics.ner_metrics import ChunkCounts
 
 
 class TestNerMetrics:
@@ -39,6 +41,92 @@ class TestNerMetrics:
 
             assert set(tested_columns) == set(self.df.columns[2:])
 
+    def test_confusion_matrix(self):
+        """
+        test that metrics derived from a shared confusion matrix equal those of separate computations
+        ---------------------------------------------------------------------------------------------
+        :return: -
+        """
+        true = self._seq2array(self.df["sequence"].iloc[0])
+        for row in range(len(self.df)):
+            pred = self._seq2array(self.df["sequence"].iloc[row])
+            confusion_matrix = ConfusionMatrix.from_tags(true, pred)
+
+            tag_ids = {tag: i for i, tag in enumerate(confusion_matrix.labels)}
+            confusion_matrix_from_ids = ConfusionMatrix.from_ids(
+                [tag_ids[tag] for tag in true],
+                [tag_ids[tag] for tag in pred],
+                confusion_matrix.labels,
+            )
+            assert (confusion_matrix.counts == confusion_matrix_from_ids.counts).all()
+            assert confusion_matrix.counts.sum() == len(true)
+
+            # labels that occur neither in true nor in pred are ignored if tag_list is None
+            confusion_matrix_extended = ConfusionMatrix.from_ids(
+                [tag_ids[tag] for tag in true],
+                [tag_ids[tag] for tag in pred],
+                confusion_matrix.labels + ["[PAD]"],
+            )
+            for _confusion_matrix in [confusion_matrix, confusion_matrix_extended]:
+                ner_metrics = NerMetrics(
+                    true, pred, tag_list=None, confusion_matrix=_confusion_matrix
+                )
+                ner_metrics.compute(self.metrics)
+                assert ner_metrics.results_as_dict()[
+                    "precision_macro"
+                ] == self._pytest_approx(self.df["all-precision_macro"][row])
+
+            for tag_list in [None, ["A", "B"], ["A"], ["B"], ["C"]]:
+                results = dict()
+                for shared in [True, False]:
+                    ner_metrics = NerMetrics(
+                        true,
+                        pred,
+                        tag_list=tag_list,
+                        confusion_matrix=confusion_matrix if shared else None,
+                    )
+                    ner_metrics.compute(self.metrics)
+                    results[shared] = ner_metrics.results_as_dict()
+                assert results[True] == results[False], f"pred_{row}, {tag_list}"
+
+    @pytest.mark.parametrize(
+        "true, pred, plain_tags, tp, nr_pred, nr_true",
+        [
+            # plain tags: chunk = maximal sequence of equal tags, special tokens = 'O'
+            (
+                "[O, A, A, O, B, [SEP], B, B, A]",
+                "[O, A, A, O, B, B, B, B, O]",
+                True,
+                1,
+                2,
+                4,
+            ),
+            # bio tags: chunk starts w/ 'B-' or w/ 'I-' of a different type than the previous tag
+            (
+                "[B-A, I-A, I-B, O, I-B, B-B, B-B, I-A]",
+                "[B-A, I-A, B-B, O, B-B, B-B, I-B, I-A]",
+                False,
+                4,
+                5,
+                6,
+            ),
+        ],
+    )
+    def test_chunk_counts(self, true, pred, plain_tags, tp, nr_pred, nr_true):
+        """
+        test chunk extraction & matching
+        --------------------------------
+        :return: -
+        """
+        chunk_counts = ChunkCounts.from_tags(
+            self._seq2array(true), self._seq2array(pred), plain_tags=plain_tags
+        )
+        assert chunk_counts.tp.sum() == tp
+        assert chunk_counts.pred.sum() == nr_pred
+        assert chunk_counts.true.sum() == nr_true
+        assert chunk_counts.precision_micro() == self._pytest_approx(tp / nr_pred)
+        assert chunk_counts.recall_micro() == self._pytest_approx(tp / nr_true)
+
     def _single_row_and_label_category_test(self, true, pred, row, labels):
         """
         test true against pred values for single row in csv and specific labels
@@ -0,0 +1,40 @@
+from nerblackbox.modules.ner_training.predict_stats import PredictStats
+
+
+class TestPredictStats:
+
+    ####################################################################################################################
+    # TEST #############################################################################################################
+    ####################################################################################################################
+    def test_record(self):
+        """
+        test that predict calls are accumulated & exported in prometheus text format
+        -----------------------------------------------------------------------------
+        :return: -
+        """
+        calls = list()
+        predict_stats = PredictStats(callback=calls.append)
+        predict_stats.record(2, 30, 64, {"preprocessing": 0.001, "forward": 0.003})
+        predict_stats.record(1, 10, 32, {"preprocessing": 0.002, "forward": 0.5})
+
+        assert len(calls) == 2
+        assert calls[-1] == predict_stats.last
+        assert abs(predict_stats.last["latency"] - 0.502) < 1e-9
+
+        summary = predict_stats.as_dict()
+        assert summary["calls"] == 2
+        assert summary["examples"] == 3
+        assert abs(summary["padding_ratio"] - (1 - 40 / 96)) < 1e-9
+        assert abs(summary["seconds"]["forward"] - 0.503) < 1e-9
+        assert summary["seconds"]["tensorization"] == 0.0
+
+        lines = predict_stats.to_prometheus().splitlines()
+        assert "nerblackbox_predict_calls_total 2" in lines
+        assert "nerblackbox_predict_padded_tokens_total 96" in lines
+        assert 'nerblackbox_predict_latency_seconds_bucket{le="0.005"} 1' in lines
+        assert 'nerblackbox_predict_latency_seconds_bucket{le="0.25"} 1' in lines
+        assert 'nerblackbox_predict_latency_seconds_bucket{le="1.0"} 2' in lines
+        assert 'nerblackbox_predict_latency_seconds_bucket{le="+Inf"} 2' in lines
+
+        predict_stats.reset()
+        assert predict_stats.as_dict()["calls"] == 0
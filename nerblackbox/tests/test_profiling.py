@@ -0,0 +1,126 @@
+import pytest
+import torch
+from argparse import Namespace
+from nerblackbox.modules.ner_training.callbacks import profiling
+from nerblackbox.modules.ner_training.callbacks.profiling import ProfilingCallback
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def perf_counter(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class Recorder:
+    def __init__(self):
+        self.calls = list()
+
+    def __getattr__(self, name):
+        return lambda *args: self.calls.append((name, args))
+
+
+class TestProfiling:
+
+    batch_size = 4
+    seq_length = 8
+    tokens = 20  # per batch, w/o padding
+    seconds = {"data": 0.1, "forward": 0.2, "backward": 0.3, "optimizer": 0.1}
+    seconds_other = 0.05
+
+    ####################################################################################################################
+    # TEST #############################################################################################################
+    ####################################################################################################################
+    def test_profiling(self, monkeypatch):
+        """
+        test window averages, exclusion of validation time & summary, w/ a fake clock, trainer & module
+        ------------------------------------------------------------------------------------------------
+        :return: -
+        """
+        clock = Clock()
+        monkeypatch.setattr(profiling, "time", clock)
+        callback = ProfilingCallback(log_every_n_steps=2)
+        callback.synchronize = False
+        trainer = None
+        pl_module = Namespace(
+            logger=Recorder(),
+            mlflow_client=Recorder(),
+            default_logger=Recorder(),
+            global_step=0,
+        )
+
+        def batches(n):
+            for batch_idx in range(n):
+                clock.advance(self.seconds["data"])
+                attention_mask = torch.zeros(self.batch_size, self.seq_length)
+                attention_mask.view(-1)[: self.tokens] = 1
+                input_ids = torch.ones(self.batch_size, self.seq_length)
+                yield batch_idx, [input_ids, attention_mask]
+
+        def train(n):
+            for _ in callback.profile_iterable(batches(n), "get_train_batch"):
+                for action in ["model_forward", "model_backward", "optimizer_step"]:
+                    callback.start(action)
+                    clock.advance(self.seconds[callback.actions[action]])
+                    callback.stop(action)
+                clock.advance(self.seconds_other)
+                pl_module.global_step += 1
+                callback.on_batch_end(trainer, pl_module)
+
+        step_sec = sum(self.seconds.values()) + self.seconds_other
+
+        # 3 batches: 1 complete window (logged) + 1 incomplete window
+        callback.on_epoch_start(trainer, pl_module)
+        train(3)
+
+        assert len(pl_module.logger.calls) == 1
+        _, (metrics, step) = pl_module.logger.calls[0]
+        assert step == 2
+        assert metrics["profiling/step_sec"] == pytest.approx(step_sec)
+        assert metrics["profiling/samples_per_sec"] == pytest.approx(
+            self.batch_size / step_sec, rel=1e-3
+        )
+        assert metrics["profiling/tokens_per_sec"] == pytest.approx(
+            self.tokens / step_sec, rel=1e-3
+        )
+        assert metrics["profiling/padded_tokens_per_sec"] == pytest.approx(
+            self.batch_size * self.seq_length / step_sec, rel=1e-3
+        )
+        for action, seconds in self.seconds.items():
+            assert metrics[f"profiling/{action}_sec"] == pytest.approx(seconds)
+        assert metrics["profiling/other_sec"] == pytest.approx(self.seconds_other)
+        assert pl_module.mlflow_client.calls == [("log_step_metrics", (2, metrics))]
+
+        # validation is excluded
+        callback.on_validation_start(trainer, pl_module)
+        clock.advance(10.0)
+        callback.on_validation_end(trainer, pl_module)
+        train(1)
+        callback.on_train_end(trainer, pl_module)
+
+        summary = callback.summary
+        assert summary["batches"] == 4
+        assert summary["samples"] == 4 * self.batch_size
+        assert summary["time_sec"] == pytest.approx(4 * step_sec)
+        assert summary["data_fraction"] == pytest.approx(
+            self.seconds["data"] / step_sec, rel=1e-3
+        )
+        assert summary["bound"] == "compute"
+        assert set(summary.keys()) >= {
+            "samples_per_sec",
+            "tokens_per_sec",
+            "padded_tokens_per_sec",
+            "step_sec",
+            "forward_fraction",
+            "backward_fraction",
+            "optimizer_fraction",
+            "other_fraction",
+        }
+        assert pl_module.mlflow_client.calls[-1] == (
+            "log_profiling_summary",
+            (summary,),
+        )
@@ -0,0 +1,56 @@
+import pytest
+from nerblackbox.modules.experiment_config.search_space import SearchSpace
+
+
+class TestSearchSpace:
+
+    types = {
+        "batch_size": "int",
+        "lr_max": "float",
+        "lr_schedule": "str",
+        "lr_warmup_epochs": "int",
+    }
+    search_space = {
+        "batch_size": "choice(16, 32)",
+        "lr_max": "loguniform(1e-5, 1e-4)",
+        "lr_schedule": "constant",
+        "lr_warmup_epochs": "uniform(0, 2)",
+    }
+
+    ####################################################################################################################
+    # TEST #############################################################################################################
+    ####################################################################################################################
+    def test_sample(self):
+        """
+        test that trials are deterministic for a given seed and lie within the search space
+        ------------------------------------------------------------------------------------
+        :return: -
+        """
+        search_space = SearchSpace(self.search_space, self.types)
+        trials = search_space.sample(num_trials=20, seed=42)
+
+        assert trials == search_space.sample(num_trials=20, seed=42)
+        assert trials != search_space.sample(num_trials=20, seed=43)
+        for trial in trials:
+            assert trial["batch_size"] in ["16", "32"]
+            assert 1e-5 <= float(trial["lr_max"]) <= 1e-4
+            assert trial["lr_schedule"] == "constant"
+            assert trial["lr_warmup_epochs"] in ["0", "1", "2"]
+
+    @pytest.mark.parametrize(
+        "search_space",
+        [
+            {"unknown_parameter": "choice(1, 2)"},
+            {"lr_max": "normal(1e-5, 1e-4)"},
+            {"lr_max": "uniform(1e-5)"},
+            {"lr_max": "loguniform(0, 1e-4)"},
+        ],
+    )
+    def test_invalid(self, search_space):
+        """
+        test that invalid search spaces are rejected
+        --------------------------------------------
+        :return: -
+        """
+        with pytest.raises(Exception):
+            SearchSpace(search_space, self.types)